@@ -8,6 +8,7 @@
 import { NextResponse } from "next/server";
 import path from "path";
 import fs from "fs/promises";
+import { getArchivedDates } from "@/lib/daily-crossword/archive";
 import { getTodaysPuzzleDate } from "@/lib/daily-crossword/generate-daily";
 
 const PRE_GENERATED_DIR = path.join(process.cwd(), "content", "daily-crosswords");
@@ -43,10 +44,13 @@ export async function GET(request: Request) {
       return NextResponse.json({ dates: [] });
     }
 
-    // Extract dates from filenames, filter to past dates only, sort descending
-    const dates = files
+    // Dates in the season archive plus any files not yet packed into it,
+    // filtered to past dates only, sorted descending
+    const archived = await getArchivedDates(year, division);
+    const unpacked = files
       .filter((f) => f.startsWith("crossword-") && f.endsWith(".json"))
-      .map((f) => f.replace("crossword-", "").replace(".json", ""))
+      .map((f) => f.replace("crossword-", "").replace(".json", ""));
+    const dates = [...new Set([...archived, ...unpacked])]
       .filter((d) => d < todayDate)
       .sort((a, b) => b.localeCompare(a))
       .slice(0, limit);
@@ -1,7 +1,6 @@
 "use client";
 
 import React, { useState, useMemo, useEffect, useCallback } from "react";
-import Image from "next/image";
 import Link from "next/link";
 import { Button } from "@/components/ui/button";
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
@@ -21,9 +20,12 @@ import { Book, Question } from "@/types";
 import { QuestionHeatmapInline } from "@/components/QuestionHeatmapInline";
 import QuestionSubmissionForm from "@/components/QuestionSubmissionForm";
 import DownloadAgreementDialog from "@/components/DownloadAgreementDialog";
+import CoverImage from "@/components/CoverImage";
+import type { CoverEntry } from "@/lib/cover-images";
 
 interface BookPageProps {
   book: Book;
+  coverEntry: CoverEntry | null;
   questions: Question[];
   year: string;
   division: string;
@@ -31,6 +33,7 @@ interface BookPageProps {
 
 export default function BookDetailPage({
   book,
+  coverEntry,
   questions,
   year,
   division,
@@ -220,12 +223,13 @@ export default function BookDetailPage({
           <div className="flex flex-col md:flex-row gap-6">
             <div className="flex-shrink-0">
               <div className="relative w-32 h-48">
-                <Image
-                  src={book.cover}
+                <CoverImage
+                  cover={book.cover}
                   alt={book.title}
-                  fill
+                  entry={coverEntry}
                   className="object-cover rounded-md"
                   sizes="128px"
+                  priority
                 />
               </div>
             </div>
@@ -2,6 +2,8 @@ import React from "react";
 import { notFound } from "next/navigation";
 import { getBooksWithStats } from "@/lib/books";
 import { getAllQuestions } from "@/lib/questions";
+import { getCoverEntry } from "@/lib/cover-images";
+import { loadCoverManifest } from "@/lib/cover-images-server";
 import BookDetailPage from "./BookDetailPage";
 import type { Metadata } from "next";
 
@@ -169,11 +171,12 @@ export default async function Page({ params }: Props) {
     notFound();
   }
 
-  let booksStats, allQuestions;
+  let booksStats, allQuestions, coverManifest;
   try {
-    [booksStats, allQuestions] = await Promise.all([
+    [booksStats, allQuestions, coverManifest] = await Promise.all([
       getBooksWithStats(year, division),
       getAllQuestions(year, division),
+      loadCoverManifest(),
     ]);
   } catch (error) {
     console.error("Error loading data:", error);
@@ -253,6 +256,7 @@ export default async function Page({ params }: Props) {
       />
       <BookDetailPage
         book={bookStats.book}
+        coverEntry={getCoverEntry(coverManifest, bookStats.book.cover) ?? null}
         questions={bookQuestions}
         year={year}
         division={division}
@@ -1,7 +1,9 @@
 import React from "react";
-import Image from "next/image";
 import Link from "next/link";
 import { getBooksWithStats } from "@/lib/books";
+import { getCoverEntry } from "@/lib/cover-images";
+import { loadCoverManifest } from "@/lib/cover-images-server";
+import CoverImage from "@/components/CoverImage";
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
 import { Badge } from "@/components/ui/badge";
 import { Button } from "@/components/ui/button";
@@ -130,11 +132,12 @@ export default async function BooksPage({ params }: Props) {
     notFound();
   }
 
-  let booksStats, allQuestions;
+  let booksStats, allQuestions, coverManifest;
   try {
-    [booksStats, allQuestions] = await Promise.all([
+    [booksStats, allQuestions, coverManifest] = await Promise.all([
       getBooksWithStats(year, division),
       getAllQuestions(year, division),
+      loadCoverManifest(),
     ]);
   } catch (error) {
     console.error("Error loading data:", error);
@@ -343,10 +346,10 @@ export default async function BooksPage({ params }: Props) {
               <div className="flex flex-col md:flex-row gap-3 md:gap-4">
                 <div className="flex-shrink-0">
                   <div className="relative w-32 h-48">
-                    <Image
-                      src={book.cover}
+                    <CoverImage
+                      cover={book.cover}
                       alt={book.title}
-                      fill
+                      entry={getCoverEntry(coverManifest, book.cover) ?? null}
                       className="object-cover rounded-md"
                       sizes="128px"
                     />
@@ -4,6 +4,7 @@ import React, { Suspense } from "react";
 import { useParams, useRouter } from "next/navigation";
 import { useEffect, useState } from "react";
 import ZoomiesGame from "@/components/ZoomiesGame";
+import { prefetchCoverManifest } from "@/components/CoverImage";
 import { Loader2 } from "lucide-react";
 import type { Book } from "@/types";
 
@@ -27,6 +28,8 @@ function ZoomiesContent() {
 
     // Load books for this division
     const loadBooks = async () => {
+      // The covers' manifest loads alongside the books, rather than after they render
+      prefetchCoverManifest(year, division);
       try {
         const response = await fetch(`/obob/${year}/${division}/books.json`);
         const data = await response.json();
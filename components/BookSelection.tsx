@@ -4,7 +4,7 @@ import { useState, useEffect } from "react";
 import { Button } from "@/components/ui/button";
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
 import { ArrowRight, PawPrint } from "lucide-react";
-import Image from "next/image";
+import CoverImage, { prefetchCoverManifest } from "./CoverImage";
 import { Book, Books } from "../types";
 import { WavyUnderline } from "./WavyUnderline";
 import { ToggleGroup, ToggleGroupItem } from "@/components/ui/toggle-group";
@@ -52,6 +52,8 @@ export default function BookSelection({
 
   useEffect(() => {
     const loadBooks = async () => {
+      // The covers' manifest loads alongside the books, rather than after they render
+      prefetchCoverManifest(year, division);
       try {
         const response = await fetch(`/obob/${year}/${division}/books.json`);
         const data = await response.json();
@@ -151,14 +153,12 @@ export default function BookSelection({
                   }`}
                   onClick={() => handleToggleBook(key)}
                 >
-                  <Image
-                    src={book.cover}
+                  <CoverImage
+                    cover={book.cover}
                     alt={book.title}
-                    layout="fill"
-                    objectFit="cover"
-                    className="rounded-md shadow-sm"
-                    priority={true}
-                    loading="eager"
+                    className="object-cover rounded-md shadow-sm"
+                    sizes="80px"
+                    priority
                   />
                   {(!isMobile || !selectedBookKeys.includes(key)) && (
                     <div className="absolute inset-0 bg-black bg-opacity-50 flex items-center justify-center opacity-0 hover:opacity-100 transition-opacity duration-200">
@@ -0,0 +1,112 @@
+"use client";
+
+import { useEffect, useState } from "react";
+import Image from "next/image";
+import {
+  coverManifestUrl,
+  coverSrcSet,
+  divisionCoverManifestUrl,
+  getCoverEntry,
+  pickCoverVariant,
+  type CoverEntry,
+  type CoverManifest,
+} from "@/lib/cover-images";
+
+const manifestRequests = new Map<string, Promise<CoverManifest | null>>();
+const loadedManifests = new Map<string, CoverManifest | null>();
+
+function fetchCoverManifest(url: string): Promise<CoverManifest | null> {
+  let request = manifestRequests.get(url);
+  if (!request) {
+    request = fetch(url)
+      .then((response) => (response.ok ? (response.json() as Promise<CoverManifest>) : null))
+      .catch(() => null)
+      .then((manifest) => {
+        loadedManifests.set(url, manifest);
+        return manifest;
+      });
+    manifestRequests.set(url, request);
+  }
+  return request;
+}
+
+/**
+ * Start fetching a division's cover manifest, e.g. alongside its books.json,
+ * so it is usually loaded by the time the covers render
+ */
+export function prefetchCoverManifest(year: string, division: string): void {
+  fetchCoverManifest(divisionCoverManifestUrl(year, division));
+}
+
+/**
+ * The manifest holding a cover's entry, fetched once per page load.
+ * Undefined while loading, null if the variants haven't been built.
+ */
+export function useCoverManifest(cover: string, enabled = true): CoverManifest | null | undefined {
+  const url = coverManifestUrl(cover);
+  const [manifest, setManifest] = useState<CoverManifest | null | undefined>(() => loadedManifests.get(url));
+
+  useEffect(() => {
+    if (!enabled) return;
+    if (loadedManifests.has(url)) {
+      setManifest(loadedManifests.get(url));
+      return;
+    }
+    let active = true;
+    fetchCoverManifest(url).then((loaded) => {
+      if (active) setManifest(loaded);
+    });
+    return () => {
+      active = false;
+    };
+  }, [url, enabled]);
+
+  return manifest;
+}
+
+interface CoverImageProps {
+  cover: string; // The books.json `cover` path
+  alt: string;
+  sizes: string;
+  entry?: CoverEntry | null; // From server components (null: no variants); otherwise the manifest is fetched
+  className?: string;
+  priority?: boolean;
+}
+
+/**
+ * A book cover filling its (relatively positioned) parent, served as the
+ * smallest AVIF or WebP variant that fits `sizes`, over its blurred
+ * placeholder. Falls back to the original image when there are no variants.
+ */
+export default function CoverImage({ cover, alt, sizes, entry, className = "", priority = false }: CoverImageProps) {
+  const manifest = useCoverManifest(cover, entry === undefined);
+  const resolved = entry ?? getCoverEntry(manifest, cover);
+
+  if (!resolved) {
+    if (entry === undefined && manifest === undefined) {
+      // A placeholder while the division's manifest loads, rather than starting
+      // to download the full-size cover
+      return <div aria-label={alt} role="img" className={`absolute inset-0 animate-pulse bg-gray-200 ${className}`} />;
+    }
+    return <Image src={cover} alt={alt} fill sizes={sizes} className={className} priority={priority} />;
+  }
+
+  const fallback = pickCoverVariant(resolved, 256);
+  return (
+    <picture>
+      {resolved.variants.avif && <source type="image/avif" srcSet={coverSrcSet(resolved, "avif")} sizes={sizes} />}
+      <source type="image/webp" srcSet={coverSrcSet(resolved, "webp")} sizes={sizes} />
+      {/* eslint-disable-next-line @next/next/no-img-element -- the variants are already optimized */}
+      <img
+        src={fallback?.src ?? cover}
+        alt={alt}
+        width={resolved.width}
+        height={resolved.height}
+        loading={priority ? "eager" : "lazy"}
+        decoding="async"
+        className={`absolute inset-0 h-full w-full ${className}`}
+        style={{ backgroundImage: `url(${resolved.placeholder})`, backgroundSize: "cover" }}
+      />
+    </picture>
+  );
+}
@@ -4,7 +4,7 @@ import { useState, useEffect, useRef, useCallback } from "react";
 import { Button } from "@/components/ui/button";
 import { Card } from "@/components/ui/card";
 import type { Book, QuestionWithBook } from "@/types";
-import Image from "next/image";
+import CoverImage from "@/components/CoverImage";
 import {
   Trophy,
   Flame,
@@ -719,10 +719,9 @@ Can you catch me? https://obob.dog/zoomies/${year}/${division}?utm_source=share`
                       : "opacity-50 grayscale"
                   }`}
                 >
-                  <Image
-                    src={book.cover}
+                  <CoverImage
+                    cover={book.cover}
                     alt={book.title}
-                    fill
                     className="object-cover"
                     sizes="(max-width: 768px) 25vw, 150px"
                   />
@@ -1030,12 +1029,12 @@ Can you catch me? https://obob.dog/zoomies/${year}/${division}?utm_source=share`
                 }}
                 className="relative aspect-[3/4] rounded-lg overflow-hidden border-3 border-transparent hover:border-cyan-400 focus:border-transparent focus:outline-none transition-all transform hover:scale-105 active:scale-95 shadow-md"
               >
-                <Image
-                  src={book.cover}
+                <CoverImage
+                  cover={book.cover}
                   alt={book.title}
-                  fill
                   className="object-cover"
                   sizes="(max-width: 768px) 50vw, 200px"
+                  priority
                 />
               </button>
             ))}
@@ -0,0 +1,21 @@
+import path from "path";
+import fs from "fs/promises";
+import type { CoverManifest } from "./cover-images";
+
+const MANIFEST_PATH = path.join(process.cwd(), "public", "cover-variants", "manifest.json");
+
+let manifestCache: Promise<CoverManifest | null> | null = null;
+
+/**
+ * Load the cover manifest.
+ * Returns null if the variants haven't been built.
+ */
+export function loadCoverManifest(): Promise<CoverManifest | null> {
+  if (!manifestCache) {
+    manifestCache = fs
+      .readFile(MANIFEST_PATH, "utf8")
+      .then((data) => JSON.parse(data) as CoverManifest)
+      .catch(() => null);
+  }
+  return manifestCache;
+}
@@ -0,0 +1,67 @@
+/**
+ * Responsive variants of the book covers, written by
+ * `scripts/cover_images.py` to public/cover-variants/, with
+ * public/cover-variants/manifest.json keyed by each books.json `cover` path.
+ * Server code loads the manifest with `loadCoverManifest` from
+ * lib/cover-images-server.ts. Client components fetch only their
+ * division's part of it, public/cover-variants/{year}/{division}.json
+ * (see coverManifestUrl and components/CoverImage.tsx).
+ */
+export interface CoverVariant {
+  src: string;
+  width: number;
+  height: number;
+}
+
+export interface CoverEntry {
+  width: number; // Full-size cover
+  height: number;
+  placeholder: `data:image/${string}`; // Tiny blurred WebP, usable as next/image's placeholder
+  variants: Partial<Record<"avif" | "webp", CoverVariant[]>>; // Ascending width
+}
+
+export interface CoverManifest {
+  version: number;
+  covers: Record<string, CoverEntry>;
+}
+
+export const COVER_MANIFEST_URL = "/cover-variants/manifest.json";
+
+const DIVISION_COVER_PATTERN = /^\/covers\/([^/]+)\/([^/]+)\/[^/]+$/;
+
+/**
+ * The manifest holding a cover's entry: its division's manifest for a
+ * /covers/{year}/{division}/... path (as scripts/cover_images.py splits
+ * them), otherwise the full one
+ */
+export function coverManifestUrl(cover: string): string {
+  const match = DIVISION_COVER_PATTERN.exec(cover);
+  return match ? divisionCoverManifestUrl(match[1], match[2]) : COVER_MANIFEST_URL;
+}
+
+export function divisionCoverManifestUrl(year: string, division: string): string {
+  return `/cover-variants/${year}/${division}.json`;
+}
+
+export function getCoverEntry(manifest: CoverManifest | null | undefined, cover: string): CoverEntry | undefined {
+  return manifest?.covers[cover];
+}
+
+/**
+ * The smallest variant at least `width` pixels wide, or the largest there is
+ */
+export function pickCoverVariant(
+  entry: CoverEntry,
+  width: number,
+  format: "avif" | "webp" = "webp"
+): CoverVariant | undefined {
+  const variants = entry.variants[format] ?? [];
+  return variants.find((variant) => variant.width >= width) ?? variants[variants.length - 1];
+}
+
+/**
+ * A srcset attribute listing every variant of a format, e.g. for a <picture> <source>
+ */
+export function coverSrcSet(entry: CoverEntry, format: "avif" | "webp"): string {
+  return (entry.variants[format] ?? []).map((variant) => `${variant.src} ${variant.width}w`).join(", ");
+}
@@ -0,0 +1,185 @@
+import path from "path";
+import fs from "fs/promises";
+import { createHash } from "crypto";
+import type { CrosswordQuestion } from "./types";
+
+/**
+ * Precomputed crossword candidates for a division, written by
+ * `scripts/build_question_data.py` (the `crossword` sink) to
+ * public/crossword-candidates/{year}/{division}.json.
+ *
+ * Candidates are exactly what filterCrosswordQuestions returns for all of
+ * the division's books, in the same order, as long as the question files
+ * haven't changed since the build: the index records a hash of them, and
+ * is ignored when it no longer matches.
+ */
+export interface CrosswordCandidate {
+  id: number; // Question ID (position in getAllQuestions order)
+  answer: string; // Normalized uppercase answer
+  length: number;
+  letters: string; // Letter histogram: 26 digits, counts of A-Z
+  bookKey: string;
+  bookTitle: string;
+  text: string;
+  page?: number;
+}
+
+export interface CrosswordCandidateIndex {
+  version: number;
+  year: string;
+  division: string;
+  candidates: CrosswordCandidate[];
+  byLength: Record<string, number[]>; // Answer length -> candidate positions
+  byLetter: Record<string, number[]>; // "{position}{letter}" -> candidate positions
+  corpus: {
+    questions: number; // Questions in the division when the index was built
+    sha256: string; // Hash of books.json, sources.json and the question files, joined by NUL bytes
+  };
+}
+
+const INDEX_VERSION = 2;
+const CANDIDATES_DIR = path.join(process.cwd(), "public", "crossword-candidates");
+const OBOB_DIR = path.join(process.cwd(), "public", "obob");
+
+interface CachedIndex {
+  stamp: string; // Sizes and mtimes of the files the hash covers
+  index: CrosswordCandidateIndex | null;
+}
+
+const indexCache = new Map<string, CachedIndex>();
+
+/**
+ * The files a division's index is built from, in hash order:
+ * books.json, sources.json, then each source's questions file
+ */
+async function corpusFiles(year: string, division: string, obobDir = OBOB_DIR): Promise<string[]> {
+  const base = path.join(obobDir, year, division);
+  const sources = JSON.parse(await fs.readFile(path.join(base, "sources.json"), "utf8")) as {
+    sources?: { path: string }[];
+  };
+  return [
+    path.join(base, "books.json"),
+    path.join(base, "sources.json"),
+    ...(sources.sources ?? []).map((source) => path.join(base, source.path)),
+  ];
+}
+
+async function readOrEmpty(file: string): Promise<Buffer> {
+  try {
+    return await fs.readFile(file);
+  } catch {
+    return Buffer.alloc(0);
+  }
+}
+
+/**
+ * division_fingerprint from scripts/obob_corpus.py: SHA-256 of the files joined
+ * by NUL bytes, with a missing question file counting as empty
+ */
+export async function corpusFingerprint(year: string, division: string, obobDir = OBOB_DIR): Promise<string> {
+  const files = await corpusFiles(year, division, obobDir);
+  const parts = await Promise.all(files.map(readOrEmpty));
+  const hash = createHash("sha256");
+  parts.forEach((part, i) => {
+    if (i > 0) hash.update("\0");
+    hash.update(part);
+  });
+  return hash.digest("hex");
+}
+
+async function filesStamp(files: string[]): Promise<string> {
+  const stats = await Promise.all(
+    files.map((file) => fs.stat(file).then((s) => `${s.size}:${s.mtimeMs}`, () => "-"))
+  );
+  return stats.join("|");
+}
+
+/**
+ * Load the candidate index for a year/division.
+ * Returns null if it hasn't been built, or was built from question files
+ * that have since changed, so callers can fall back to filtering the
+ * questions themselves. The check is cached until one of the files' size
+ * or mtime changes.
+ */
+export async function loadCandidateIndex(
+  year: string,
+  division: string
+): Promise<CrosswordCandidateIndex | null> {
+  const cacheKey = `${year}:${division}`;
+  const indexPath = path.join(CANDIDATES_DIR, year, `${division}.json`);
+
+  let files: string[];
+  try {
+    files = [indexPath, ...(await corpusFiles(year, division))];
+  } catch {
+    return null;
+  }
+  const stamp = await filesStamp(files);
+  const cached = indexCache.get(cacheKey);
+  if (cached && cached.stamp === stamp) {
+    return cached.index;
+  }
+
+  let index: CrosswordCandidateIndex | null = null;
+  try {
+    index = JSON.parse(await fs.readFile(indexPath, "utf8")) as CrosswordCandidateIndex;
+  } catch {
+    index = null;
+  }
+  if (index && (index.version !== INDEX_VERSION || index.corpus?.sha256 !== (await corpusFingerprint(year, division)))) {
+    console.warn(
+      `Crossword candidates for ${year}/${division} are out of date (built from ${index.corpus?.questions ?? "?"} questions); ` +
+        "filtering the questions instead. Run `pnpm obob export --only crossword` to rebuild them."
+    );
+    index = null;
+  }
+  indexCache.set(cacheKey, { stamp, index });
+  return index;
+}
+
+/**
+ * Convert index candidates to the questions the crossword generator takes
+ */
+export function toCrosswordQuestions(
+  index: CrosswordCandidateIndex,
+  selectedBookKeys?: string[]
+): CrosswordQuestion[] {
+  const selected = selectedBookKeys ? new Set(selectedBookKeys) : null;
+  return index.candidates
+    .filter((c) => !selected || selected.has(c.bookKey))
+    .map((c) => ({
+      text: c.text,
+      answer: c.answer,
+      bookKey: c.bookKey,
+      bookTitle: c.bookTitle,
+      page: c.page,
+    }));
+}
+
+/**
+ * Find candidates fitting a pattern like "?A??E" ("?" matches any letter)
+ */
+export function findCandidatesByPattern(
+  index: CrosswordCandidateIndex,
+  pattern: string
+): CrosswordCandidate[] {
+  let positions = index.byLength[String(pattern.length)] || [];
+  const upper = pattern.toUpperCase();
+  for (let i = 0; i < upper.length; i++) {
+    if (upper[i] === "?") continue;
+    const withLetter = new Set(index.byLetter[`${i}${upper[i]}`] || []);
+    positions = positions.filter((p) => withLetter.has(p));
+  }
+  return positions.map((p) => index.candidates[p]);
+}
+
+/**
+ * Count candidates per book
+ */
+export function countCandidatesPerBook(index: CrosswordCandidateIndex): Map<string, number> {
+  const counts = new Map<string, number>();
+  for (const c of index.candidates) {
+    counts.set(c.bookKey, (counts.get(c.bookKey) || 0) + 1);
+  }
+  return counts;
+}
@@ -0,0 +1,210 @@
+import path from "path";
+import fs from "fs/promises";
+import type { CrosswordClue } from "@/lib/crossword/types";
+import type { DailyPuzzle } from "./types";
+
+/**
+ * Season archives of pre-generated daily crosswords, written by
+ * `scripts/crossword_archive.py` to
+ * content/daily-crosswords/{year}/{division}/season.pack.
+ *
+ * The archive ends with a JSON index (a string table shared by every
+ * puzzle, and each date's byte offset and length) followed by the index
+ * length and a magic string. The index is read once per division (and
+ * again when the packer replaces the file); each puzzle is then one
+ * positional read of a compact JSON array.
+ */
+export interface ArchiveIndex {
+  version: number;
+  year: string;
+  division: string;
+  strings: string[]; // Clue text, answers, book keys and titles, clue IDs, directions
+  dates: string[]; // Sorted ascending
+  offsets: number[];
+  lengths: number[];
+}
+
+// [generatedAt, clueCount, rows, cols, gridRows, [row, col, number, ...], clues]
+export type PackedPuzzle = [number, number, number, number, string[], number[], PackedClue[]];
+
+// [id, number, direction, text, answer, startRow, startCol, length, bookKey, bookTitle, page?];
+// id, direction, text, answer, bookKey and bookTitle are positions in the string table
+type PackedClue = number[];
+
+const ARCHIVE_DIR = path.join(process.cwd(), "content", "daily-crosswords");
+const ARCHIVE_NAME = "season.pack";
+const MAGIC = "OBXW0001";
+const TRAILER_SIZE = 12;
+// A replaced archive's handle is closed this long after, so reads already in flight finish
+const CLOSE_DELAY_MS = 60 * 1000;
+
+interface Archive {
+  handle: fs.FileHandle;
+  index: ArchiveIndex;
+  positions: Map<string, number>;
+  size: number;
+  mtimeMs: number;
+}
+
+const archiveCache = new Map<string, Promise<Archive | null>>();
+
+async function openArchive(filePath: string): Promise<Archive | null> {
+  let handle: fs.FileHandle;
+  try {
+    handle = await fs.open(filePath, "r");
+  } catch {
+    return null;
+  }
+  try {
+    const { size, mtimeMs } = await handle.stat();
+    const trailer = Buffer.alloc(TRAILER_SIZE);
+    await handle.read(trailer, 0, TRAILER_SIZE, size - TRAILER_SIZE);
+    if (trailer.toString("latin1", 4) !== MAGIC) {
+      throw new Error(`${filePath} is not a crossword archive`);
+    }
+    const length = trailer.readUInt32LE(0);
+    const data = Buffer.alloc(length);
+    await handle.read(data, 0, length, size - TRAILER_SIZE - length);
+    const index = JSON.parse(data.toString("utf8")) as ArchiveIndex;
+    const positions = new Map(index.dates.map((date, i) => [date, i]));
+    return { handle, index, positions, size, mtimeMs };
+  } catch (error) {
+    await handle.close();
+    console.error(`Failed to open crossword archive ${filePath}:`, error);
+    return null;
+  }
+}
+
+function retire(cacheKey: string, cached: Promise<Archive | null>) {
+  if (archiveCache.get(cacheKey) !== cached) return;
+  archiveCache.delete(cacheKey);
+  cached.then((archive) => {
+    if (archive) setTimeout(() => void archive.handle.close().catch(() => {}), CLOSE_DELAY_MS).unref();
+  });
+}
+
+/**
+ * Open a division's archive and keep it open while the file is unchanged.
+ * The packer replaces the file rather than rewriting it, so the cached
+ * index is only used while the file's size and mtime match; otherwise it
+ * is opened again. A missing archive isn't remembered, so one packed later
+ * is picked up. Resolves to null if there is no archive.
+ */
+async function loadArchive(year: string, division: string, archiveDir = ARCHIVE_DIR): Promise<Archive | null> {
+  const filePath = path.join(archiveDir, year, division, ARCHIVE_NAME);
+  const cacheKey = filePath;
+  const cached = archiveCache.get(cacheKey);
+
+  let stat: { size: number; mtimeMs: number };
+  try {
+    stat = await fs.stat(filePath);
+  } catch {
+    if (cached) retire(cacheKey, cached);
+    return null;
+  }
+
+  if (cached) {
+    const archive = await cached;
+    if (archive && archive.size === stat.size && archive.mtimeMs === stat.mtimeMs) {
+      return archive;
+    }
+    retire(cacheKey, cached);
+  }
+
+  let opening = archiveCache.get(cacheKey);
+  if (!opening) {
+    opening = openArchive(filePath);
+    archiveCache.set(cacheKey, opening);
+  }
+  const archive = await opening;
+  if (!archive && archiveCache.get(cacheKey) === opening) {
+    archiveCache.delete(cacheKey);
+  }
+  return archive;
+}
+
+/**
+ * Rebuild a daily puzzle from its packed array
+ */
+export function unpackPuzzle(packed: PackedPuzzle, index: ArchiveIndex, dateString: string): DailyPuzzle {
+  const [generatedAt, clueCount, rows, cols, gridRows, cellNumbers, clues] = packed;
+  const { strings, year, division } = index;
+
+  const numbers: Record<string, number> = {};
+  for (let i = 0; i < cellNumbers.length; i += 3) {
+    numbers[`${cellNumbers[i]},${cellNumbers[i + 1]}`] = cellNumbers[i + 2];
+  }
+
+  return {
+    id: `${year}:${division}:${dateString}`,
+    year,
+    division,
+    dateString,
+    puzzle: {
+      grid: gridRows.map((row) => Array.from(row, (cell) => (cell === "." ? null : cell))),
+      clues: clues.map((clue) => {
+        const unpacked = {
+          id: strings[clue[0]],
+          number: clue[1],
+          direction: strings[clue[2]],
+          text: strings[clue[3]],
+          answer: strings[clue[4]],
+          startRow: clue[5],
+          startCol: clue[6],
+          length: clue[7],
+          bookKey: strings[clue[8]],
+          bookTitle: strings[clue[9]],
+        } as CrosswordClue;
+        if (clue.length > 10) {
+          unpacked.page = clue[10];
+        }
+        return unpacked;
+      }),
+      rows,
+      cols,
+      cellNumbers: numbers,
+    },
+    generatedAt,
+    clueCount,
+  };
+}
+
+/**
+ * Read one day's puzzle from the division's archive.
+ * Returns null if there is no archive or the date isn't in it.
+ */
+export async function readArchivedPuzzle(
+  year: string,
+  division: string,
+  dateString: string,
+  archiveDir = ARCHIVE_DIR
+): Promise<DailyPuzzle | null> {
+  const archive = await loadArchive(year, division, archiveDir);
+  const position = archive?.positions.get(dateString);
+  if (!archive || position === undefined) {
+    return null;
+  }
+
+  const { index, handle } = archive;
+  const data = Buffer.alloc(index.lengths[position]);
+  await handle.read(data, 0, data.length, index.offsets[position]);
+  return unpackPuzzle(JSON.parse(data.toString("utf8")) as PackedPuzzle, index, dateString);
+}
+
+export async function hasArchivedPuzzle(
+  year: string,
+  division: string,
+  dateString: string,
+  archiveDir = ARCHIVE_DIR
+): Promise<boolean> {
+  const archive = await loadArchive(year, division, archiveDir);
+  return archive?.positions.has(dateString) ?? false;
+}
+
+/**
+ * Dates in the division's archive, ascending
+ */
+export async function getArchivedDates(year: string, division: string, archiveDir = ARCHIVE_DIR): Promise<string[]> {
+  const archive = await loadArchive(year, division, archiveDir);
+  return archive ? archive.index.dates : [];
+}
@@ -10,13 +10,16 @@ import fs from "fs/promises";
 import type { Book } from "@/types";
 import { getAllQuestions } from "@/lib/questions";
 import { filterCrosswordQuestions } from "@/lib/crossword/utils";
+import { loadCandidateIndex, toCrosswordQuestions } from "@/lib/crossword/candidate-index";
 import { generateCrossword, type GeneratorOptions } from "@/lib/crossword/generator";
-import type { CrosswordPuzzle } from "@/lib/crossword/types";
+import type { CrosswordPuzzle, CrosswordQuestion } from "@/lib/crossword/types";
+import { readArchivedPuzzle } from "./archive";
 import { createSeededRandom, seededSelectDistributed } from "./seeded-random";
 import type { DailyPuzzle, SerializedCrosswordPuzzle } from "./types";
 
 const PRE_GENERATED_DIR = path.join(process.cwd(), "content", "daily-crosswords");
 
+// Puzzles read from individual files that haven't been packed into the season archive yet
 const puzzleCache = new Map<string, DailyPuzzle>();
 
 async function getPreGeneratedPuzzle(
@@ -24,6 +27,12 @@ async function getPreGeneratedPuzzle(
   division: string,
   dateString: string
 ): Promise<DailyPuzzle | null> {
+  // Packed puzzles are a single positional read, so they aren't cached
+  const archived = await readArchivedPuzzle(year, division, dateString);
+  if (archived) {
+    return archived;
+  }
+
   const cacheKey = `${year}:${division}:${dateString}`;
   
   if (puzzleCache.has(cacheKey)) {
@@ -105,6 +114,21 @@ async function loadBooks(year: string, division: string): Promise<Book[]> {
   return Object.values(booksData.books) as Book[];
 }
 
+/**
+ * Load every valid crossword question for a year/division
+ */
+async function loadValidQuestions(year: string, division: string): Promise<CrosswordQuestion[]> {
+  const index = await loadCandidateIndex(year, division);
+  if (index) {
+    return toCrosswordQuestions(index);
+  }
+
+  const allBooks = await loadBooks(year, division);
+  const allBookKeys = allBooks.map((b) => b.book_key);
+  const allQuestions = await getAllQuestions(year, division);
+  return filterCrosswordQuestions(allQuestions, allBookKeys, allBooks);
+}
+
 /**
  * Convert a CrosswordPuzzle to serialized format for JSON storage
  */
@@ -137,7 +161,8 @@ const DAILY_OPTIONS: Omit<GeneratorOptions, "random"> = {
 /**
  * Get the daily puzzle for a year/division
  *
- * Only returns pre-generated puzzles from content/daily-crosswords.json.
+ * Only returns pre-generated puzzles from content/daily-crosswords (the season
+ * archive, or a crossword-<date>.json file not yet packed into it).
  * Returns null if no puzzle exists for the given date.
  */
 export async function getOrGenerateDailyPuzzle(
@@ -168,19 +193,9 @@ export async function generateDailyPuzzle(
   const seed = `${year}:${division}:${dateString}`;
   const random = createSeededRandom(seed);
 
-  // Load all books for this division
-  const allBooks = await loadBooks(year, division);
-  const allBookKeys = allBooks.map((b) => b.book_key);
-
-  // Load all questions
-  const allQuestions = await getAllQuestions(year, division);
-
-  // Filter to valid crossword questions from ALL books
-  const validQuestions = filterCrosswordQuestions(
-    allQuestions,
-    allBookKeys,
-    allBooks
-  );
+  // Valid crossword questions from ALL books: use the prebuilt candidate
+  // index if there is one, otherwise filter the whole division
+  const validQuestions = await loadValidQuestions(year, division);
 
   if (validQuestions.length < DAILY_OPTIONS.minWords) {
     throw new Error(
@@ -0,0 +1,97 @@
+import path from "path";
+import fs from "fs/promises";
+
+/**
+ * Question IDs by book, type and page, written by
+ * `scripts/build_question_data.py` (the `pages` sink) to
+ * public/page-index/{year}/{division}.json.
+ *
+ * Question IDs are positions in getAllQuestions(year, division).
+ */
+export interface PageIndexEntry {
+  ids: number[]; // Question IDs sorted by page
+  pages: number[]; // Distinct pages, ascending
+  ends: number[]; // ends[i] = number of ids with page <= pages[i]
+  unpaged: number[]; // Question IDs without a page
+}
+
+export interface PageIndex {
+  version: number;
+  year: string;
+  division: string;
+  books: Record<string, Partial<Record<"in-which-book" | "content", PageIndexEntry>>>;
+}
+
+const PAGE_INDEX_DIR = path.join(process.cwd(), "public", "page-index");
+
+const indexCache = new Map<string, PageIndex | null>();
+
+/**
+ * Load the page index for a year/division.
+ * Returns null if it hasn't been built.
+ */
+export async function loadPageIndex(year: string, division: string): Promise<PageIndex | null> {
+  const cacheKey = `${year}:${division}`;
+  if (indexCache.has(cacheKey)) {
+    return indexCache.get(cacheKey)!;
+  }
+
+  let index: PageIndex | null = null;
+  try {
+    const data = await fs.readFile(path.join(PAGE_INDEX_DIR, year, `${division}.json`), "utf8");
+    index = JSON.parse(data) as PageIndex;
+  } catch {
+    index = null;
+  }
+  indexCache.set(cacheKey, index);
+  return index;
+}
+
+/**
+ * Number of values in a sorted array that are <= max
+ */
+function countUpTo(sorted: number[], max: number): number {
+  let low = 0;
+  let high = sorted.length;
+  while (low < high) {
+    const mid = (low + high) >> 1;
+    if (sorted[mid] <= max) {
+      low = mid + 1;
+    } else {
+      high = mid;
+    }
+  }
+  return low;
+}
+
+/**
+ * Question IDs from pages <= maxPage of the given books.
+ * Questions without a page are left out unless includeUnpaged is set.
+ */
+export function questionIdsUpToPage(
+  index: PageIndex,
+  bookKeys: string[],
+  maxPage: number,
+  type: "in-which-book" | "content" | "both" = "both",
+  includeUnpaged = false
+): number[] {
+  const types = type === "both" ? (["in-which-book", "content"] as const) : [type];
+  const ids: number[] = [];
+
+  for (const bookKey of bookKeys) {
+    for (const t of types) {
+      const entry = index.books[bookKey]?.[t];
+      if (!entry) continue;
+
+      const count = countUpTo(entry.pages, maxPage);
+      if (count > 0) {
+        ids.push(...entry.ids.slice(0, entry.ends[count - 1]));
+      }
+      if (includeUnpaged) {
+        ids.push(...entry.unpaged);
+      }
+    }
+  }
+
+  return ids;
+}
@@ -1,5 +1,12 @@
 import json
 import re
+import sys
+
+# Run through `obob ingest`, which puts scripts/ on the path
+try:
+    from canonical import display_form
+except ModuleNotFoundError:
+    sys.exit("Run this parser with `pnpm obob ingest 2024-2025/3-5/lake_oswego`, which puts scripts/ on the path")
 
 def load_books():
     with open('../books.json', 'r') as f:
@@ -46,7 +53,7 @@ def parse_questions(input_text, title_to_key):
                         if book_title in title_to_key:
                             questions.append({
                                 "type": "in-which-book",
-                                "text": question,
+                                "text": display_form(question),
                                 "book_key": title_to_key[book_title],
                                 "page": int(page)
                             })
@@ -79,9 +86,9 @@ def parse_questions(input_text, title_to_key):
                         if book_title in title_to_key:
                             questions.append({
                                 "type": "content",
-                                "text": question,
+                                "text": display_form(question),
                                 "book_key": title_to_key[book_title],
-                                "answer": answer,
+                                "answer": display_form(answer),
                                 "page": int(page)
                             })
                         else:
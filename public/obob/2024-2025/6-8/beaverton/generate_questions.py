@@ -1,6 +1,13 @@
 import os
 import json
 import re
+import sys
+
+# Run through `obob ingest`, which puts scripts/ on the path
+try:
+    from canonical import display_form
+except ModuleNotFoundError:
+    sys.exit("Run this parser with `pnpm obob ingest 2024-2025/6-8/beaverton`, which puts scripts/ on the path")
 
 def extract_book_key(filename):
     return os.path.splitext(filename)[0]
@@ -37,11 +44,11 @@ def parse_txt_file(filepath):
                 # Remove "In which book" prefix if it's an in-which-book question
                 if current_section == 'in-which-book' and question_text.lower().startswith('in which book'):
                     question_text = re.sub(r'^in which book\s+', '', question_text, flags=re.IGNORECASE)
-                current_question['text'] = question_text
+                current_question['text'] = display_form(question_text)
                 
         elif line.startswith('ANSWER:'):
             if current_question and current_question['type'] == 'content':
-                answer = line.replace('ANSWER:', '').strip()
+                answer = display_form(line.replace('ANSWER:', ''))
                 current_question['answer'] = answer
                 # Check if it's a two-part answer
                 if ' and ' in answer:
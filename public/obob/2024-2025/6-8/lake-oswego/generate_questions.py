@@ -2,6 +2,17 @@ import csv
 import json
 import os
 import re
+import sys
+
+# Run through `obob ingest`, which puts scripts/ on the path
+try:
+    from book_references import build_scanner, remove_book_references, strip_book_reference
+    from canonical import display_form
+except ModuleNotFoundError:
+    sys.exit("Run this parser with `pnpm obob ingest 2024-2025/6-8/lake-oswego`, which puts scripts/ on the path")
+
+# This division's titles and authors, for stripping "<title> by <author>" from content questions and answers
+BOOK_SCANNER = build_scanner([('2024-2025', '6-8')], short_names=True)
 
 def extract_page_number(answer):
     # Extract page number from the answer text
@@ -18,8 +29,7 @@ def determine_question_type(question):
 
 def clean_answer(answer, book_key):
     # Remove book reference and page numbers for content questions
-    book_pattern = rf'{books[book_key]["title"]} by {books[book_key]["author"]}'
-    cleaned = re.sub(book_pattern, '', answer)
+    cleaned = remove_book_references(answer, BOOK_SCANNER, '2024-2025', '6-8', book_key)
     # Remove any page references
     cleaned = re.sub(r'\s*\(p\.\s*\d+[^)]*\)', '', cleaned)
     # Clean up any leftover parentheses and extra spaces
@@ -28,35 +38,29 @@ def clean_answer(answer, book_key):
 
 def clean_question_text(question, question_type, book_key):
     if question_type == 'in-which-book':
-        # Remove "In which book" prefix and clean up
-        cleaned = re.sub(r'^in which book\s+', '', question.lower())
-        return cleaned
+        # Remove "In which book" prefix, keeping the rest as written
+        return re.sub(r'^in which book\s+', '', question, flags=re.IGNORECASE)
     elif question_type == 'content':
         # Remove book reference prefix for content questions
-        book_prefix = f"In {books[book_key]['title']} by {books[book_key]['author']}, "
-        if question.startswith(book_prefix):
-            return question[len(book_prefix):]
+        stripped, named_book = strip_book_reference(question, BOOK_SCANNER, '2024-2025', '6-8')
+        if named_book:
+            return stripped
     return question
 
-# Load books data
-with open('../books.json', 'r') as f:
-    books_data = json.load(f)
-    books = books_data['books']
-
 questions = []
 
 # Process each CSV file in current directory
-for filename in os.listdir('.'):
+for filename in sorted(os.listdir('.')):
     if not filename.endswith('.csv'):
         continue
         
-    book_key = filename[:-4]  # Remove .csv extension
+    book_key = filename[:-4].lower()  # Remove .csv extension (Freewater.csv is freewater)
     
     with open(filename, 'r') as f:
         reader = csv.DictReader(f)
         for row in reader:
-            question = row['Question']
-            answer = row['Answer']
+            question = display_form(row['Question'])
+            answer = display_form(row['Answer'])
             
             question_type = determine_question_type(question)
             page = extract_page_number(answer)
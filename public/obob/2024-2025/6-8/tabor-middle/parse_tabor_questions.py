@@ -1,8 +1,21 @@
-import csv
 import json
 import os
+import sys
 from pathlib import Path
 
+# Run through `obob ingest`, which puts scripts/ on the path
+try:
+    from book_references import build_scanner, strip_book_reference
+    from canonical import display_form
+    from source_csv import first_page, page_reference, read_question_csv
+except ModuleNotFoundError:
+    sys.exit("Run this parser with `pnpm obob ingest 2024-2025/6-8/tabor-middle`, which puts scripts/ on the path")
+
+# The division's titles and authors, for stripping "In <title> by <author>," from content questions
+DIVISION_DIR = Path(__file__).resolve().parent.parent
+YEAR, DIVISION = DIVISION_DIR.parent.name, DIVISION_DIR.name
+BOOK_SCANNER = build_scanner([(YEAR, DIVISION)], short_names=True)
+
 def _check_if_two_part(text):
     """Helper function to check if a question is two-part and clean the text.
     Returns (cleaned_text, is_two_part)"""
@@ -51,8 +64,6 @@ def _check_if_two_part(text):
 
 def clean_iwb_question(text, book_title):
     """Clean 'In which book' type questions."""
-    had_question_mark = text.strip().endswith('?')
-    
     # First remove any two-part indicators
     text, is_two_part = _check_if_two_part(text)
     
@@ -69,51 +80,28 @@ def clean_iwb_question(text, book_title):
         text = text.lstrip('.')
         text = text.strip()
 
-    # Only add question mark if original text had one
-    text = text.strip('?').strip()
-    if had_question_mark:
-        text += "?"
-    
-    return text, is_two_part
+    # Tidies spacing and doubled question marks left by the prefix removal
+    return display_form(text), is_two_part
 
 def clean_content_question(text, book_title):
     """Clean content questions that might start with book references."""
-    had_question_mark = text.strip().endswith('?')
-    
     # First remove any two-part indicators
     text, is_two_part = _check_if_two_part(text)
     
     text = text.strip()
-    text_lower = text.lower()
     
-    # Handle "In BookTitle, ..." pattern
-    if text_lower.startswith('in'):
-        book_title_lower = book_title.lower()
-        possible_starts = [
-            f"in the book, {book_title_lower}",
-            f"in the book {book_title_lower}",
-            f"in {book_title_lower}",
-        ]            
-        
-        for start in possible_starts:
-            if text.lower().startswith(start):
-                rest = text[len(start):].strip()
-                if rest.startswith(','):
-                    text = rest[1:].strip()
-                else:
-                    text = rest
-                break
+    # Handle "In BookTitle, ..." and "In the book BookTitle by Author, ..." patterns
+    if text.lower().startswith('in'):
+        stripped, named_book = strip_book_reference(text, BOOK_SCANNER, YEAR, DIVISION)
+        if named_book:
+            text = stripped
         else:
-            print(f"No start found for {text.lower()} - {book_title_lower}\n")
+            print(f"No start found for {text.lower()} - {book_title.lower()}\n")
     else:
         print(f"Content q doesn't start with In: {text}")
     
-    # Only add question mark if original text had one
-    text = text.strip('?').strip()
-    if had_question_mark:
-        text += "?"
-    
-    return text, is_two_part
+    # Tidies spacing and doubled question marks left by the prefix removal
+    return display_form(text), is_two_part
 
 def get_book_title(book_key, books_data):
     try:
@@ -129,50 +117,45 @@ def parse_csv_file(file_path, question_type, book_key):
     book_title = get_book_title(book_key, None)
     
     try:
-        with open(file_path, 'r', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                # Skip empty rows or rows without questions
-                if not row or all(not value for value in row.values()):
-                    continue
-                
-                if question_type == "content":
-                    # Get the first key which should be the question column
-                    question_key = next(key for key in row.keys() if 'Question' in key)
-                    question = row[question_key]
-                    page = row.get('Page #', '').strip().split(',')[0]  # Take first page if multiple
-                    answer = row.get('Answer', '')
-                    
-                    if question and answer:  # Only add if both question and answer exist
-                        cleaned_text, is_two_part = clean_content_question(question, book_title)
-                        question_obj = {
-                            "type": "content",
-                            "text": cleaned_text,
-                            "book_key": book_key,
-                            "answer": answer.strip(),
-                            "page": int(page) if page.isdigit() else 0
-                        }
-                        if is_two_part:
-                            question_obj["two_part"] = True
-                        questions.append(question_obj)
-                        
-                elif question_type == "in-which-book":
-                    # Get the first key which should be the question column
-                    question_key = next(key for key in row.keys() if 'Question' in key)
-                    question = row[question_key]
-                    page = row.get('Page #', '').strip().split(',')[0]  # Take first page if multiple
+        # Columns are resolved once from the header; pages keep every page cited
+        columns = read_question_csv(file_path)
+        if columns is None:
+            print(f"No question column in {file_path}")
+            return questions
+        
+        rows = zip(columns['question'], columns['page_text'], columns['pages'], columns['answer'])
+        for question, page_text, pages, answer in rows:
+            reference = page_reference(pages)
+            if question_type == "content":
+                if question and answer:  # Only add if both question and answer exist
+                    cleaned_text, is_two_part = clean_content_question(question, book_title)
+                    question_obj = {
+                        "type": "content",
+                        "text": cleaned_text,
+                        "book_key": book_key,
+                        "answer": display_form(answer),
+                        "page": first_page(pages)
+                    }
+                    if reference:
+                        question_obj["pages"] = reference
+                    if is_two_part:
+                        question_obj["two_part"] = True
+                    questions.append(question_obj)
                     
-                    if question and page:  # Only add if both question and page exist
-                        cleaned_text, is_two_part = clean_iwb_question(question, book_title)
-                        question_obj = {
-                            "type": "in-which-book",
-                            "text": cleaned_text,
-                            "book_key": book_key,
-                            "page": int(page) if page.isdigit() else 0
-                        }
-                        if is_two_part:
-                            question_obj["two_part"] = True
-                        questions.append(question_obj)
+            elif question_type == "in-which-book":
+                if question and page_text:  # Only add if both question and page exist
+                    cleaned_text, is_two_part = clean_iwb_question(question, book_title)
+                    question_obj = {
+                        "type": "in-which-book",
+                        "text": cleaned_text,
+                        "book_key": book_key,
+                        "page": first_page(pages)
+                    }
+                    if reference:
+                        question_obj["pages"] = reference
+                    if is_two_part:
+                        question_obj["two_part"] = True
+                    questions.append(question_obj)
                         
     except FileNotFoundError:
         print(f"File not found: {file_path}")
@@ -186,7 +169,7 @@ def main():
     all_questions = []
     
     # Iterate through all subdirectories
-    for folder in base_dir.iterdir():
+    for folder in sorted(base_dir.iterdir()):
         if folder.is_dir():
             book_key = folder.name
             
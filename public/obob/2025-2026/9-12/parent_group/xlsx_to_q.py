@@ -3,8 +3,15 @@
 import json
 import pandas as pd
 import os
+import sys
 from pathlib import Path
 
+# Run through `obob ingest`, which puts scripts/ on the path
+try:
+    from canonical import display_form
+except ModuleNotFoundError:
+    sys.exit("Run this parser with `pnpm obob ingest 2025-2026/9-12/parent_group`, which puts scripts/ on the path")
+
 def main():
     # Get the directory where this script is located
     script_dir = Path(__file__).parent
@@ -37,13 +44,9 @@ def main():
                 df_iwb = pd.read_excel(xlsx_path, sheet_name="In Which Book")
                 
                 for index, row in df_iwb.iterrows():
-                    # Skip empty rows
-                    if pd.isna(row.get('Unnamed: 1')):
-                        continue
+                    question_text = display_form(row.get('Unnamed: 1'))
                     
-                    question_text = str(row['Unnamed: 1']).strip()
-                    
-                    # Skip if question is empty
+                    # Skip empty rows
                     if not question_text:
                         continue
                     
@@ -68,13 +71,9 @@ def main():
                 df_content = pd.read_excel(xlsx_path, sheet_name="Content")
                 
                 for index, row in df_content.iterrows():
-                    # Skip empty rows
-                    if pd.isna(row.get('Unnamed: 1')):
-                        continue
+                    question_text = display_form(row.get('Unnamed: 1'))
                     
-                    question_text = str(row['Unnamed: 1']).strip()
-                    
-                    # Skip if question is empty
+                    # Skip empty rows
                     if not question_text:
                         continue
                     
@@ -86,8 +85,9 @@ def main():
                     }
                     
                     # Add answer if available
-                    if 'Answer' in row and not pd.isna(row['Answer']):
-                        question["answer"] = str(row['Answer']).strip()
+                    answer = display_form(row.get('Answer'))
+                    if answer:
+                        question["answer"] = answer
                     
                     # Add page number if available
                     if 'Page #' in row and not pd.isna(row['Page #']):
@@ -1,11 +1,20 @@
 #!/usr/bin/env python3
 
+import csv
 import json
 import sys
 import os
+import subprocess
 from pathlib import Path
 from collections import defaultdict, Counter
-import glob
+
+from obob_cache import ResultCache
+from obob_corpus import OBOB_DIR, REPO_ROOT
+
+# tests/ holds the fixture corpus, which isn't part of the question data
+SKIP_DIRS = {'node_modules', '.git', '.next', '.obob-cache', '.wrangler', 'tests'}
+# Bump when compute_question_stats changes, so cached stats are recomputed
+STATS_VERSION = 1
 
 def find_questions_files(start_dir=None):
     """Find all questions.json files in the repository."""
@@ -14,38 +23,24 @@ def find_questions_files(start_dir=None):
     else:
         start_dir = Path(start_dir)
     
-    # Look for questions.json files recursively
-    questions_files = list(start_dir.rglob("questions.json"))
-    
-    # Filter out any that might be in node_modules or other irrelevant directories
-    filtered_files = []
-    for file in questions_files:
-        path_parts = file.parts
-        if 'node_modules' not in path_parts and '.git' not in path_parts:
-            filtered_files.append(file)
+    # Walk the tree ourselves so node_modules, .git and build output are
+    # pruned instead of being traversed and filtered afterwards
+    questions_files = []
+    for dirpath, dirnames, filenames in os.walk(start_dir):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS)
+        if 'questions.json' in filenames:
+            questions_files.append(Path(dirpath) / 'questions.json')
     
-    return filtered_files
+    return questions_files
 
-def analyze_questions(questions_file):
-    """Analyze questions.json file and provide detailed statistics."""
-    
-    questions_path = Path(questions_file)
-    
-    # Read the questions file
-    try:
-        with open(questions_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-    except FileNotFoundError:
-        print(f"Error: File '{questions_file}' not found.")
-        return None
-    except json.JSONDecodeError as e:
-        print(f"Error: Invalid JSON in '{questions_file}': {e}")
-        return None
-    
+def compute_question_stats(data):
+    """Compute the statistics for a parsed questions.json document.
+
+    Returns a JSON-serializable dict, or None if there are no questions.
+    """
     questions = data.get('questions', [])
     
     if not questions:
-        print("No questions found in the file.")
         return None
     
     # Initialize counters
@@ -71,6 +66,68 @@ def analyze_questions(questions_file):
         if 'page' in question and question['page']:
             questions_with_pages += 1
     
+    num_books = len(questions_by_book)
+    avg_questions = total_questions / num_books if num_books > 0 else 0
+    
+    return {
+        'total_questions': total_questions,
+        'questions_by_type': dict(questions_by_type),
+        'questions_by_book': dict(questions_by_book),
+        'questions_by_book_and_type': {book: dict(types) for book, types in questions_by_book_and_type.items()},
+        'num_books': num_books,
+        'avg_questions_per_book': avg_questions,
+        'questions_with_answers': questions_with_answers,
+        'questions_with_pages': questions_with_pages
+    }
+
+def load_question_stats(questions_file, cache=None):
+    """Return the statistics for a questions.json file, using the cache if given."""
+    
+    questions_path = Path(questions_file)
+    
+    def compute(raw):
+        return compute_question_stats(json.loads(raw))
+    
+    # Read the questions file
+    try:
+        if cache is not None:
+            stats = cache.get_file(questions_path, compute)
+        else:
+            stats = compute(questions_path.read_bytes())
+    except FileNotFoundError:
+        print(f"Error: File '{questions_file}' not found.")
+        return None
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        print(f"Error: Invalid JSON in '{questions_file}': {e}")
+        return None
+    
+    if stats is None:
+        print("No questions found in the file.")
+        return None
+    
+    return dict(stats, file_path=str(questions_path))
+
+def analyze_questions(questions_file, cache=None):
+    """Analyze questions.json file and provide detailed statistics."""
+    
+    stats = load_question_stats(questions_file, cache)
+    if stats is not None:
+        print_question_stats(stats)
+    return stats
+
+def print_question_stats(stats):
+    """Print the detailed report for one file's statistics."""
+    
+    questions_path = Path(stats['file_path'])
+    total_questions = stats['total_questions']
+    questions_by_type = Counter(stats['questions_by_type'])
+    questions_by_book = Counter(stats['questions_by_book'])
+    questions_by_book_and_type = stats['questions_by_book_and_type']
+    questions_with_answers = stats['questions_with_answers']
+    questions_with_pages = stats['questions_with_pages']
+    num_books = stats['num_books']
+    avg_questions = stats['avg_questions_per_book']
+    
     # Extract division and year from path for display
     path_parts = questions_path.parts
     division_info = ""
@@ -105,8 +162,6 @@ def analyze_questions(questions_file):
         print(f"  {book_key}: {count:,} ({percentage:.1f}%)")
     
     # Average questions per book
-    num_books = len(questions_by_book)
-    avg_questions = total_questions / num_books if num_books > 0 else 0
     print(f"\nAverage questions per book: {avg_questions:.1f}")
     
     # Detailed breakdown by book and type
@@ -115,8 +170,8 @@ def analyze_questions(questions_file):
     print("-" * 85)
     
     for book_key in sorted(questions_by_book_and_type.keys()):
-        content_count = questions_by_book_and_type[book_key]['content']
-        iwb_count = questions_by_book_and_type[book_key]['in-which-book']
+        content_count = questions_by_book_and_type[book_key].get('content', 0)
+        iwb_count = questions_by_book_and_type[book_key].get('in-which-book', 0)
         other_count = questions_by_book[book_key] - content_count - iwb_count
         total_count = questions_by_book[book_key]
         
@@ -130,8 +185,8 @@ def analyze_questions(questions_file):
     unusual_books = []
     
     for book_key, counts in questions_by_book_and_type.items():
-        content_count = counts['content']
-        iwb_count = counts['in-which-book']
+        content_count = counts.get('content', 0)
+        iwb_count = counts.get('in-which-book', 0)
         total_count = content_count + iwb_count
         
         # Flag books with very few questions or unusual ratios
@@ -159,20 +214,8 @@ def analyze_questions(questions_file):
         print(f"Min questions per book: {min(questions_by_book.values())}")
         print(f"Max questions per book: {max(questions_by_book.values())}")
         print(f"Median questions per book: {sorted(questions_by_book.values())[num_books//2]}")
-    
-    return {
-        'file_path': str(questions_path),
-        'total_questions': total_questions,
-        'questions_by_type': dict(questions_by_type),
-        'questions_by_book': dict(questions_by_book),
-        'questions_by_book_and_type': dict(questions_by_book_and_type),
-        'num_books': num_books,
-        'avg_questions_per_book': avg_questions,
-        'questions_with_answers': questions_with_answers,
-        'questions_with_pages': questions_with_pages
-    }
 
-def analyze_multiple_files(questions_files):
+def analyze_multiple_files(questions_files, cache=None):
     """Analyze multiple questions.json files and provide a summary."""
     
     all_results = []
@@ -180,7 +223,7 @@ def analyze_multiple_files(questions_files):
     
     for questions_file in questions_files:
         print() # Add spacing between files
-        result = analyze_questions(questions_file)
+        result = analyze_questions(questions_file, cache)
         if result:
             all_results.append(result)
             total_across_all += result['total_questions']
@@ -211,13 +254,134 @@ def analyze_multiple_files(questions_files):
             percentage = result['total_questions'] / total_across_all * 100
             print(f"  {file_name}{division_info}: {result['total_questions']:,} ({percentage:.1f}%)")
 
+def git_history(pathspec):
+    """Yield (commit, date, changes) for each first-parent commit touching pathspec, oldest first.
+
+    changes is a list of (path, blob) pairs, with blob None for a deleted file.
+    """
+    log = subprocess.run(
+        ['git', '-C', str(REPO_ROOT), 'log', '--first-parent', '-m', '--raw', '--no-renames', '--no-abbrev',
+         '--reverse', '--format=commit %H %cI', '--', pathspec],
+        check=True, capture_output=True, text=True).stdout
+    commit = None
+    for line in log.splitlines():
+        if line.startswith('commit '):
+            if commit:
+                yield commit
+            _, sha, date = line.split(' ')
+            commit = (sha, date, [])
+        elif line.startswith(':') and commit:
+            meta, path = line.split('\t', 1)
+            _, _, _, blob, status = meta.split(' ')
+            commit[2].append((path, None if status == 'D' else blob))
+    if commit:
+        yield commit
+
+class BlobReader:
+    """Reads blobs through one long-lived `git cat-file --batch` process."""
+
+    def __init__(self):
+        self.process = subprocess.Popen(['git', '-C', str(REPO_ROOT), 'cat-file', '--batch'],
+                                        stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+
+    def read(self, blob):
+        self.process.stdin.write(blob.encode('ascii') + b'\n')
+        self.process.stdin.flush()
+        header = self.process.stdout.readline().split()
+        if len(header) < 3 or header[1] != b'blob':
+            return None
+        data = self.process.stdout.read(int(header[2]))
+        self.process.stdout.read(1)  # trailing newline
+        return data
+
+    def close(self):
+        self.process.stdin.close()
+        self.process.wait()
+
+def analyze_history(csv_path=None):
+    """Question counts per source, book and type at every commit that changed a questions.json.
+
+    Stats are computed once per blob and cached by blob hash in
+    .obob-cache/analyze_history.json, so later runs only read blobs from
+    new commits.
+    """
+    obob_path = OBOB_DIR.relative_to(REPO_ROOT).as_posix()
+    cache = ResultCache('analyze_history', STATS_VERSION, max_entries=100000, max_bytes=256 * 1024 * 1024)
+    reader = None
+    files = {}  # path -> blob at the current commit
+    rows = []
+    
+    try:
+        for sha, date, changes in git_history(f':(glob){obob_path}/**/questions.json'):
+            for path, blob in changes:
+                if blob is None:
+                    files.pop(path, None)
+                else:
+                    files[path] = blob
+            
+            totals = Counter()
+            for path, blob in sorted(files.items()):
+                stats = cache.get(blob)
+                if stats is None:
+                    reader = reader or BlobReader()
+                    try:
+                        stats = compute_question_stats(json.loads(reader.read(blob) or b'{}'))
+                    except (json.JSONDecodeError, UnicodeDecodeError):
+                        stats = None
+                    # Unreadable and empty files are cached as empty so they aren't read again
+                    stats = stats or {'questions_by_book_and_type': {}}
+                    cache.put(blob, stats)
+                year, division, source = (path[len(obob_path) + 1:].rsplit('/', 1)[0].split('/', 2) + ['', ''])[:3]
+                for book_key, types in stats['questions_by_book_and_type'].items():
+                    for q_type, count in types.items():
+                        rows.append((date, sha, year, division, source, book_key, q_type, count))
+                        totals[f'{year}/{division}'] += count
+            
+            print(f"{date[:10]}  {sha[:8]}  {sum(totals.values()):>7,}  " +
+                  '  '.join(f"{division}: {count:,}" for division, count in sorted(totals.items())))
+    finally:
+        if reader is not None:
+            reader.close()
+        cache.save()
+    
+    print(f"\nBlob stats: {cache.hits:,} cached, {cache.misses:,} computed")
+    
+    if csv_path:
+        with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['date', 'commit', 'year', 'division', 'source', 'book_key', 'type', 'questions'])
+            writer.writerows(rows)
+        print(f"Wrote {len(rows):,} rows to {csv_path}")
+
 def main():
     """Main function to run the analysis."""
     
-    if len(sys.argv) > 1:
+    args = sys.argv[1:]
+    if "--history" in args:
+        args.remove("--history")
+        csv_path = None
+        if "--csv" in args:
+            index = args.index("--csv")
+            csv_path = args[index + 1] if index + 1 < len(args) else None
+        print(f"📈 QUESTIONS OVER TIME (date, commit, total, per division)")
+        analyze_history(csv_path)
+        return
+    
+    cache = ResultCache('analyze_questions', STATS_VERSION)
+    if "--no-cache" in args:
+        args.remove("--no-cache")
+        cache = None
+    if "--clear-cache" in args:
+        args.remove("--clear-cache")
+        ResultCache('analyze_questions').clear()
+        if not args:
+            print("Cleared the analysis cache.")
+            return
+    
+    if args:
         # Specific file(s) provided
         questions_files = []
-        for arg in sys.argv[1:]:
+        for arg in args:
             if arg == "--all":
                 # Find all questions.json files
                 found_files = find_questions_files()
@@ -228,6 +392,9 @@ def main():
                 print(f"  python3 {sys.argv[0]} file.json          # Analyze specific file")
                 print(f"  python3 {sys.argv[0]} --all              # Analyze all questions.json files in repo")
                 print(f"  python3 {sys.argv[0]} file1 file2        # Analyze multiple specific files")
+                print(f"  python3 {sys.argv[0]} --all --no-cache   # Recompute every file instead of using the cache")
+                print(f"  python3 {sys.argv[0]} --clear-cache      # Delete the cached results")
+                print(f"  python3 {sys.argv[0]} --history [--csv out.csv]  # Question counts at every commit")
                 return
             else:
                 questions_files.append(Path(arg))
@@ -265,11 +432,15 @@ def main():
         print("No valid questions.json files to analyze.")
         return
     
-    # Analyze the files
+    # Analyze the files. Per-file stats are cached by content hash under
+    # .obob-cache/, so only files that changed since the last run are re-read.
     if len(valid_files) == 1:
-        analyze_questions(valid_files[0])
+        analyze_questions(valid_files[0], cache)
     else:
-        analyze_multiple_files(valid_files)
+        analyze_multiple_files(valid_files, cache)
+    
+    if cache is not None:
+        cache.save()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+
+"""Precomputed answer keys for judging spoken content answers.
+
+For each content answer the build stores the forms a spoken reply may take,
+so judging is a set lookup rather than a fuzzy string comparison:
+
+- t:    text keys: accent-folded, lowercased tokens with the spaces removed
+        (so "bush plane" matches "Bushplane"), for the whole answer, the
+        answer without parentheticals, each "or" / "/" alternative, with
+        and without a leading article or preposition, and with numbers
+        both as digits and as words ("10 minutes" / "ten minutes"). A
+        parenthetical is never a key on its own (see alternatives())
+- p:    phonetic keys: the Double Metaphone code of each token, joined by
+        spaces, so "Skippie" still matches "Skippy"
+- parts/need: for two-part questions, keys for each listed item and how
+        many of them a reply has to name
+
+The `answers` sink of build_question_data.py writes one lookup file per
+division to public/answer-keys/<year>/<division>.json, keyed by question
+ID (the same IDs as the search index). judge() shows how a reply is
+checked against a question's keys: every run of consecutive words in the
+reply is looked up in the key sets. A text key may match anywhere in the
+reply, but a phonetic key only counts when its code is long enough to be
+distinctive and the matched words make up most of what was said, so a
+short sound inside a longer reply ("I think it was at the store" for
+"Ed") isn't taken as the answer. A reply that offers several guesses
+("the red one or the blue one") is only accepted if it is an answer as a
+whole.
+"""
+
+import argparse
+import json
+import re
+import sys
+from functools import lru_cache
+
+from double_metaphone import double_metaphone
+from obob_corpus import REPO_ROOT, load_corpus
+from search_questions import tokenize
+
+KEYS_VERSION = 2
+ANSWER_KEYS_DIR = REPO_ROOT / 'public' / 'answer-keys'
+
+# Replies are matched on runs of at most this many words
+MAX_SPAN = 12
+
+PARENTHETICAL_PATTERN = re.compile(r'\(([^()]*)\)')
+OR_PREFIX_PATTERN = re.compile(r'^or\b:?\s*', re.IGNORECASE)
+ALTERNATIVE_PATTERN = re.compile(r'\s+or\s+|\s*/\s*', re.IGNORECASE)
+LIST_PATTERN = re.compile(r'\s*(?:,|;|&|\band\b|\bor\b)\s*', re.IGNORECASE)
+LIST_PREFIX_PATTERN = re.compile(r'^\s*\(?\s*(?:any|possible answers|answers?)\b[^:)]*[:)]\s*', re.IGNORECASE)
+LEADING_WORDS = {'a', 'an', 'the', 'in', 'at', 'on', 'to', 'by', 'with', 'from', 'his', 'her', 'their'}
+# Phonetic codes shorter than this (letters, ignoring spaces) match too many words
+MIN_PHONETIC_CODE = 3
+# Words that don't count towards how much of a reply a match covers
+FILLER_WORDS = {'a', 'an', 'the', 'and', 'i', 'im', 'think', 'it', 'its', 'was', 'is', 'um', 'uh', 'er', 'like',
+                'maybe', 'guess', 'answer', 'that', 'so', 'oh', 'well'} | LEADING_WORDS
+
+UNITS = ['zero', 'one', 'two', 'three', 'four', 'five', 'six', 'seven', 'eight', 'nine', 'ten', 'eleven',
+         'twelve', 'thirteen', 'fourteen', 'fifteen', 'sixteen', 'seventeen', 'eighteen', 'nineteen']
+TENS = ['', '', 'twenty', 'thirty', 'forty', 'fifty', 'sixty', 'seventy', 'eighty', 'ninety']
+ORDINAL_WORDS = {'one': 'first', 'two': 'second', 'three': 'third', 'five': 'fifth', 'eight': 'eighth',
+                 'nine': 'ninth', 'twelve': 'twelfth'}
+ORDINAL_PATTERN = re.compile(r'^(\d+)(st|nd|rd|th)$')
+
+WORD_VALUES = {word: value for value, word in enumerate(UNITS)}
+WORD_VALUES.update({word: value * 10 for value, word in enumerate(TENS) if word})
+SCALE_VALUES = {'hundred': 100, 'thousand': 1000}
+ORDINAL_VALUES = {}
+for _word, _value in list(WORD_VALUES.items()):
+    _ordinal = ORDINAL_WORDS.get(_word) or (_word[:-1] + 'ieth' if _word.endswith('y') else _word + 'th')
+    ORDINAL_VALUES[_ordinal] = _value
+
+
+# --- Numbers -------------------------------------------------------------------
+
+def number_words(n):
+    """Spell out 0 <= n < 1,000,000 as a list of words."""
+    if n < 20:
+        return [UNITS[n]]
+    if n < 100:
+        return [TENS[n // 10]] + (number_words(n % 10) if n % 10 else [])
+    if n < 1000:
+        return number_words(n // 100) + ['hundred'] + (number_words(n % 100) if n % 100 else [])
+    return number_words(n // 1000) + ['thousand'] + (number_words(n % 1000) if n % 1000 else [])
+
+
+def ordinal_words(n):
+    words = number_words(n)
+    last = words[-1]
+    words[-1] = ORDINAL_WORDS.get(last) or (last[:-1] + 'ieth' if last.endswith('y') else last + 'th')
+    return words
+
+
+def ordinal_suffix(n):
+    if 10 <= n % 100 <= 20:
+        return 'th'
+    return {1: 'st', 2: 'nd', 3: 'rd'}.get(n % 10, 'th')
+
+
+def spell_numbers(tokens):
+    """Replace digit and ordinal tokens with their words."""
+    spelled = []
+    for token in tokens:
+        ordinal = ORDINAL_PATTERN.match(token)
+        if token.isdigit() and len(token) < 7:
+            spelled.extend(number_words(int(token)))
+        elif ordinal and len(ordinal.group(1)) < 7:
+            spelled.extend(ordinal_words(int(ordinal.group(1))))
+        else:
+            spelled.append(token)
+    return spelled
+
+
+def digit_numbers(tokens):
+    """Replace runs of number words with digits ("twenty five" -> "25")."""
+    result = []
+    i = 0
+    while i < len(tokens):
+        total = current = 0
+        j = i
+        ordinal = False
+        while j < len(tokens) and not ordinal:
+            token = tokens[j]
+            if token in WORD_VALUES:
+                current += WORD_VALUES[token]
+            elif token in ORDINAL_VALUES:
+                current += ORDINAL_VALUES[token]
+                ordinal = True
+            elif token in SCALE_VALUES and j > i:
+                current = max(current, 1) * SCALE_VALUES[token]
+                if token == 'thousand':
+                    total += current
+                    current = 0
+            elif token == 'and' and j > i and j + 1 < len(tokens) and tokens[j + 1] in WORD_VALUES:
+                pass
+            else:
+                break
+            j += 1
+        if j == i:
+            result.append(tokens[i])
+            i += 1
+            continue
+        value = total + current
+        result.append(f'{value}{ordinal_suffix(value)}' if ordinal else str(value))
+        i = j
+    return result
+
+
+# --- Keys ------------------------------------------------------------------------
+
+def text_key(tokens):
+    return ''.join(tokens)
+
+
+@lru_cache(maxsize=None)
+def token_codes(token):
+    # Answers and replies reuse a small vocabulary, so encode each word once
+    return double_metaphone(token)
+
+
+def phonetic_keys(tokens):
+    """Primary and alternate phonetic keys for a token list."""
+    spelled = spell_numbers(tokens)
+    primary = []
+    secondary = []
+    for token in spelled:
+        first, second = token_codes(token)
+        if first or second:
+            primary.append(first or second)
+            secondary.append(second or first)
+    return {' '.join(primary), ' '.join(secondary)} - {''}
+
+
+def token_forms(tokens):
+    """The token lists a reply may use for one alternative of an answer."""
+    forms = [tokens]
+    stripped = tokens
+    while len(stripped) > 1 and stripped[0] in LEADING_WORDS:
+        stripped = stripped[1:]
+        forms.append(stripped)
+    for form in list(forms):
+        forms.append(spell_numbers(form))
+        forms.append(digit_numbers(form))
+    return [form for form in forms if form]
+
+
+def alternatives(answer):
+    """Split an answer into the alternative phrasings it accepts.
+
+    A parenthetical is kept or dropped, but not accepted by itself: in the
+    corpus it is mostly a qualifier or the rest of a name ("Treasury
+    (room)", "Red (hair)", "Sequoia (Middle School)"), where "room" or
+    "hair" alone is not the answer. So "Cessna 406" is rejected for
+    "Bushplane (Cessna 406)"; an answer that accepts either name writes
+    "Bushplane (or Cessna 406)".
+    """
+    options = []
+
+    def optional(match):
+        inner = match.group(1).strip()
+        # "(or The Free Danes)" names an alternative; other parentheticals are optional
+        if OR_PREFIX_PATTERN.match(inner):
+            options.append(OR_PREFIX_PATTERN.sub('', inner))
+            return ' '
+        return ' ' + inner + ' '
+
+    answer = answer.replace('&', ' and ')
+    with_inner = PARENTHETICAL_PATTERN.sub(optional, answer)
+    without = PARENTHETICAL_PATTERN.sub(' ', answer)
+    texts = [with_inner, without] + options
+    return texts + [part for text in texts for part in ALTERNATIVE_PATTERN.split(text)]
+
+
+def keys_for(texts):
+    text_keys = set()
+    phonetic = set()
+    forms = set()
+    for text in texts:
+        forms.update(tuple(form) for form in token_forms(tokenize(text)))
+    for form in forms:
+        text_keys.add(text_key(form))
+        phonetic |= phonetic_keys(form)
+    return {'t': sorted(text_keys), 'p': sorted(phonetic)}
+
+
+def answer_keys(answer, two_part=False):
+    """Build the lookup keys for one content answer."""
+    keys = keys_for(alternatives(answer))
+    if two_part:
+        listed = LIST_PREFIX_PATTERN.sub('', PARENTHETICAL_PATTERN.sub(' ', answer))
+        items = [item for item in LIST_PATTERN.split(listed) if tokenize(item)]
+        if len(items) >= 2:
+            keys['parts'] = [keys_for(alternatives(item)) for item in items]
+            keys['need'] = 2
+    return keys
+
+
+def build_answer_keys(entry):
+    """The per-division lookup: question ID -> keys, for content questions."""
+    answers = {}
+    for doc_id, q in enumerate(entry['questions']):
+        if q.get('type') != 'content' or not isinstance(q.get('answer'), str):
+            continue
+        answers[str(doc_id)] = answer_keys(q['answer'], bool(q.get('two_part')))
+    return {
+        'version': KEYS_VERSION,
+        'year': entry['year'],
+        'division': entry['division'],
+        'maxSpan': MAX_SPAN,
+        'answers': answers,
+    }
+
+
+def answer_keys_path(year, division, keys_dir=ANSWER_KEYS_DIR):
+    return keys_dir / year / f'{division}.json'
+
+
+# --- Judging --------------------------------------------------------------------
+
+def content_length(tokens):
+    return sum(1 for token in tokens if token not in FILLER_WORDS)
+
+
+def reply_keys(reply, max_span=MAX_SPAN):
+    """Keys for every run of up to max_span words in a reply.
+
+    Returns the reply's tokens, its text keys, and its phonetic keys mapped
+    to the most non-filler words any span with that key covers.
+    """
+    tokens = tokenize(reply)
+    text_keys = set()
+    phonetic = {}
+    for start in range(len(tokens)):
+        for end in range(start + 1, min(len(tokens), start + max_span) + 1):
+            span = tokens[start:end]
+            text_keys.add(text_key(span))
+            text_keys.add(text_key(digit_numbers(span)))
+            words = content_length(span)
+            for code in phonetic_keys(span):
+                if len(code.replace(' ', '')) >= MIN_PHONETIC_CODE and words > phonetic.get(code, 0):
+                    phonetic[code] = words
+    return tokens, text_keys, phonetic
+
+
+def _matches(keys, text_keys, phonetic, said):
+    """'exact', 'phonetic' or None, where said is how many words of the reply this answer stands for."""
+    if text_keys.intersection(keys['t']):
+        return 'exact'
+    covered = max((phonetic[code] for code in keys['p'] if code in phonetic), default=0)
+    # The matched words must be most of the reply, and a lone word only counts when it is the reply
+    if covered and covered * 2 > said and (covered > 1 or said <= 1):
+        return 'phonetic'
+    return None
+
+
+def judge(keys, reply, max_span=MAX_SPAN):
+    """Return 'exact', 'phonetic' or None for a spoken reply."""
+    tokens, text_keys, phonetic = reply_keys(reply, max_span)
+    if 'or' in tokens:
+        # Several guesses: only an answer that itself has an "or" in it
+        whole = {text_key(tokens), text_key(digit_numbers(tokens))}
+        return 'exact' if whole.intersection(keys['t']) else None
+    said = max(content_length(tokens), 1)
+    if 'parts' in keys:
+        share = said / keys['need']
+        matched = [_matches(part, text_keys, phonetic, share) for part in keys['parts']]
+        heard = [m for m in matched if m]
+        if len(heard) >= keys['need']:
+            return 'exact' if all(m == 'exact' for m in heard) else 'phonetic'
+    return _matches(keys, text_keys, phonetic, said)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check a spoken reply against a content answer's keys.")
+    parser.add_argument('reply', help="what the player said")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument('--answer', help="the expected answer text")
+    group.add_argument('--question', metavar='YEAR/DIVISION#ID', help="a question ID from the search index")
+    parser.add_argument('--two-part', action='store_true', help="with --answer: treat it as a two-part answer")
+    parser.add_argument('--show-keys', action='store_true', help="print the answer's keys")
+    args = parser.parse_args()
+
+    if args.answer:
+        answer = args.answer
+        keys = answer_keys(answer, args.two_part)
+    else:
+        match = re.match(r'^([^/]+)/([^#]+)#(\d+)$', args.question)
+        if not match:
+            print("--question must look like 2025-2026/3-5#123")
+            sys.exit(2)
+        year, division, doc_id = match.groups()
+        entry = load_corpus(year_divisions=[(year, division)])[0]
+        questions = entry['questions']
+        if int(doc_id) >= len(questions) or questions[int(doc_id)].get('type') != 'content':
+            print(f"No content question {doc_id} in {year}/{division}")
+            sys.exit(1)
+        q = questions[int(doc_id)]
+        answer = q['answer']
+        path = answer_keys_path(year, division)
+        if path.exists():
+            with open(path, 'r', encoding='utf-8') as f:
+                keys = json.load(f)['answers'][doc_id]
+        else:
+            keys = answer_keys(answer, bool(q.get('two_part')))
+        print(f"Q: {q['text']}")
+
+    print(f"Answer: {answer}")
+    if args.show_keys:
+        print(json.dumps(keys, indent=2))
+    verdict = judge(keys, args.reply)
+    print(f"Reply: {args.reply}")
+    print(f"{'✅' if verdict else '❌'} {verdict or 'no match'}")
+    sys.exit(0 if verdict else 1)
+
+
+if __name__ == "__main__":
+    main()
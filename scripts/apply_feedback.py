@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+
+"""Apply reviewed question feedback from a local export in one batch.
+
+The offline counterpart of process-feedback.ts. It reads a CSV or JSONL
+export of the feedback sheet and takes the rows that have a reviewer and
+aren't fixed yet. Each row is matched to its question by source, book,
+page and text (by match key, so curly quotes, spacing and case don't
+matter) and the correction applied with the same rules as
+applyFeedbackToQuestion. Corrected text and answers are stored in display
+form, like the rest of the corpus.
+
+Rather than reloading the source files for every row, all rows are
+resolved through one hashed lookup index. The index holds a key per
+question, cached in .obob-cache/ by file content, so only files that
+changed since the last run are read to build it. Each file with fixes is
+rewritten once, atomically. Each changed question gets a revisionHistory
+entry with its previous values, as already used in the question files.
+
+--report writes a JSON report of the applied and unmatched rows, so the
+sheet can be updated and the rest reviewed by hand.
+"""
+
+import argparse
+import json
+import os
+import re
+from bisect import insort
+from datetime import date
+from pathlib import Path
+
+from canonical import display_form, match_key
+from obob_cache import ResultCache, content_hash
+from obob_corpus import OBOB_DIR, division_dir, load_sources
+from port_helpers import js_parse_int, js_trim, read_rows
+
+# Bump when lookup_key changes, so cached keys are recomputed
+LOOKUP_VERSION = 2
+
+PAGE_PATTERN = re.compile(r'(?:page|pg|p\.?)\s*(?:is|should be|:)?\s*(\d+)', re.IGNORECASE | re.ASCII)
+ANSWER_PATTERN = re.compile(r'(?:answer|correct answer|should be)(?:\s+is)?:\s*["\']?(.+?)["\']?\Z', re.IGNORECASE)
+TEXT_PATTERN = re.compile(r'(?:question|text)(?:\s+should be)?:\s*["\']?(.+?)["\']?\Z', re.IGNORECASE)
+BOOK_PATTERN = re.compile(r'(?:book|book_key)(?:\s+is|\s+should be)?:\s*["\']?(.+?)["\']?\Z', re.IGNORECASE)
+CHANGE_WORDS_PATTERN = re.compile(r'\b(wrong|incorrect|error|typo|mistake|fix|change|update)\b', re.IGNORECASE | re.ASCII)
+
+
+def lookup_key(book_key, page, text):
+    """The lookup key for a question: book, page and the text's match key.
+
+    findMatchingQuestion compares trimmed, lowercased text; the match key
+    also folds punctuation variants, so sheet rows copied before the corpus
+    was canonicalized still find their question.
+
+    None when the page isn't a number or there's no text: findMatchingQuestion
+    never matches a NaN page, so such rows and questions match nothing.
+    """
+    if not isinstance(page, int) or isinstance(page, bool) or not isinstance(text, str):
+        return None
+    return content_hash(f'{book_key}\0{page}\0{match_key(text)}'.encode('utf-8'))[:16]
+
+
+def question_key(q):
+    return lookup_key(q.get('book_key'), q.get('page'), q.get('text'))
+
+
+def file_keys(data):
+    """Lookup keys for every question in a questions.json file's bytes, in file order."""
+    try:
+        return [question_key(q) for q in json.loads(data)['questions']]
+    except (json.JSONDecodeError, KeyError, TypeError):
+        return None
+
+
+class QuestionLookup:
+    """Question lookup across the source files, loaded lazily per file."""
+
+    def __init__(self, cache, obob_dir=OBOB_DIR):
+        self.cache = cache
+        self.obob_dir = obob_dir
+        self.sources = {}  # (year, division) -> sources
+        self.keys = {}  # path -> {key: [question indexes]}
+        self.files = {}  # path -> parsed file, once a question in it is changed
+
+    def source_path(self, year, division, source_name):
+        if (year, division) not in self.sources:
+            try:
+                self.sources[(year, division)] = load_sources(year, division, self.obob_dir)
+            except (FileNotFoundError, json.JSONDecodeError):
+                self.sources[(year, division)] = []
+        if not self.sources[(year, division)]:
+            return None, f'No sources found for {year}/{division}'
+        source = next((s for s in self.sources[(year, division)] if s['name'] == source_name), None)
+        if source is None:
+            return None, f'Source "{source_name}" not found in sources.json'
+        return division_dir(year, division, self.obob_dir) / source['path'], None
+
+    def _index(self, path):
+        if path not in self.keys:
+            keys = self.cache.get_file(path, file_keys) if path.exists() else None
+            if keys is None:
+                return None
+            index = {}
+            for position, key in enumerate(keys):
+                if key is not None:
+                    index.setdefault(key, []).append(position)
+            self.keys[path] = index
+        return self.keys[path]
+
+    def find(self, path, book_key, page, text):
+        """(index, question) of the first matching question, or None."""
+        index = self._index(path)
+        if index is None:
+            raise OSError(f'Failed to read questions file: {path}')
+        key = lookup_key(book_key, page, text)
+        positions = index.get(key) if key is not None else None
+        if not positions:
+            return None
+        if path not in self.files:
+            with open(path, 'r', encoding='utf-8') as f:
+                self.files[path] = json.load(f)
+        return positions[0], self.files[path]['questions'][positions[0]]
+
+    def rekey(self, path, position, old_key, new_key):
+        """Move a changed question to its new key, so later rows match what it now says."""
+        index = self.keys[path]
+        if old_key in index:
+            index[old_key].remove(position)
+            if not index[old_key]:
+                del index[old_key]
+        if new_key is not None:
+            insort(index.setdefault(new_key, []), position)
+
+
+def apply_feedback_to_question(question, feedback, corrected_text, corrected_answer, corrected_page):
+    """applyFeedbackToQuestion: returns (updated, changes, previous values of changed fields)."""
+    changes = []
+    previous = {}
+
+    def change(field, value, description):
+        previous.setdefault(field, question.get(field))
+        changes.append(description)
+        question[field] = value
+
+    if corrected_text and js_trim(corrected_text) != '':
+        new_text = display_form(corrected_text)
+        if new_text != question['text']:
+            change('text', new_text, f'Text: "{question["text"][:50]}..." → "{new_text[:50]}..."')
+
+    if corrected_answer and js_trim(corrected_answer) != '' and question['type'] == 'content':
+        new_answer = display_form(corrected_answer)
+        if new_answer != question.get('answer'):
+            change('answer', new_answer, f'Answer: "{question.get("answer")}" → "{new_answer}"')
+
+    if corrected_page and js_trim(corrected_page) != '':
+        new_page = js_parse_int(js_trim(corrected_page))
+        if new_page is not None and new_page != question.get('page'):
+            change('page', new_page, f'Page: {question.get("page")} → {new_page}')
+
+    if not corrected_text and not corrected_answer and not corrected_page:
+        feedback_lower = js_trim(feedback.lower())
+
+        page_match = PAGE_PATTERN.search(feedback_lower)
+        if page_match:
+            new_page = int(page_match.group(1))
+            if new_page != question.get('page'):
+                change('page', new_page, f'Page: {question.get("page")} → {new_page}')
+
+        answer_match = ANSWER_PATTERN.search(feedback)
+        if answer_match and question['type'] == 'content':
+            new_answer = display_form(answer_match.group(1))
+            if new_answer != question.get('answer'):
+                change('answer', new_answer, f'Answer: "{question.get("answer")}" → "{new_answer}"')
+
+        text_match = TEXT_PATTERN.search(feedback)
+        if text_match:
+            new_text = display_form(text_match.group(1))
+            if new_text != question['text']:
+                change('text', new_text, f'Text: "{question["text"][:50]}..." → "{new_text[:50]}..."')
+
+        book_match = BOOK_PATTERN.search(feedback)
+        if book_match:
+            new_book_key = js_trim(book_match.group(1))
+            if new_book_key != question['book_key']:
+                change('book_key', new_book_key, f'Book: {question["book_key"]} → {new_book_key}')
+
+        if not previous and CHANGE_WORDS_PATTERN.search(feedback_lower):
+            changes.append(f'Manual review needed: {feedback}')
+
+    return bool(previous), '; '.join(changes) if changes else 'No changes applied', previous
+
+
+def process_rows(rows, lookup, record_history=True, revision_date=None):
+    """Resolve and apply every row; returns (applied, unmatched) result lists."""
+    revision_date = revision_date or date.today().isoformat()
+    applied = []
+    unmatched = []
+    for row in rows:
+        result = {
+            'rowIndex': row['rowIndex'],
+            'feedback': row.get('feedback', ''),
+            'questionText': row.get('questionText', ''),
+            'sourceName': row.get('sourceName', ''),
+        }
+        try:
+            path, error = lookup.source_path(row.get('year', ''), row.get('division', ''), row.get('sourceName', ''))
+            found = None
+            if path is not None:
+                found = lookup.find(path, row.get('bookKey', ''), js_parse_int(row.get('page', '')),
+                                    row.get('questionText', ''))
+                if found is None:
+                    error = 'Question not found in questions.json (text/book/page mismatch)'
+        except OSError as e:
+            error, found = str(e), None
+        if found is None:
+            unmatched.append(dict(result, error=error))
+            continue
+
+        position, question = found
+        old_key = question_key(question)
+        updated, changes, previous = apply_feedback_to_question(
+            question, row.get('feedback', ''), row.get('correctedQuestionText', ''),
+            row.get('correctedAnswer', ''), row.get('correctedPage', ''))
+        if not updated:
+            unmatched.append(dict(result, error='Could not interpret feedback - manual review needed',
+                                  changes=changes))
+            continue
+
+        lookup.rekey(path, position, old_key, question_key(question))
+        if record_history:
+            entry = {field: value for field, value in previous.items() if value is not None}
+            question.setdefault('revisionHistory', []).append(dict(entry, revisionDate=revision_date))
+        applied.append(dict(result, file=str(path), changes=changes))
+    return applied, unmatched
+
+
+def write_questions_file(path, data):
+    """Rewrite a questions.json file atomically, formatted as JSON.stringify(data, null, 2)."""
+    content = (json.dumps(data, indent=2, ensure_ascii=False) + '\n').encode('utf-8')
+    tmp_path = Path(path).with_suffix(f'.{os.getpid()}.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return content
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply reviewed question feedback from a CSV or JSONL export.")
+    parser.add_argument('export', help="the exported feedback sheet (.csv with a header row, or .jsonl)")
+    parser.add_argument('--report', help="write a JSON report of applied and unmatched rows to this path")
+    parser.add_argument('--no-history', action='store_true', help="don't add revisionHistory entries")
+    parser.add_argument('--dry-run', action='store_true', help="match and apply in memory, but don't write files")
+    args = parser.parse_args()
+
+    rows = read_rows(args.export)
+    first_line = 1 if args.export.lower().endswith('.jsonl') else 2
+    for line, row in enumerate(rows, first_line):
+        # The sheet's row number, when the export kept it
+        row['rowIndex'] = int(row['rowIndex']) if str(row.get('rowIndex', '')).isdigit() else line
+    reviewed = [row for row in rows
+                if js_trim(row.get('reviewedBy') or '') != '' and (row.get('status') or '').lower() != 'fixed']
+    print(f"📊 Found {len(rows)} feedback rows, {len(reviewed)} reviewed and not yet fixed")
+
+    cache = ResultCache('feedback_lookup', LOOKUP_VERSION)
+    lookup = QuestionLookup(cache)
+    applied, unmatched = process_rows(reviewed, lookup, record_history=not args.no_history)
+
+    changed_files = sorted({result['file'] for result in applied})
+    if not args.dry_run:
+        for path in changed_files:
+            data = lookup.files[Path(path)]
+            content = write_questions_file(path, data)
+            cache.put_file(path, content, [question_key(q) for q in data['questions']])
+    cache.save()
+
+    print(f"\n✅ Applied {len(applied)} fixes to {len(changed_files)} files")
+    for result in applied:
+        print(f"   Row {result['rowIndex']}: {result['sourceName']}: {result['changes']}")
+    if unmatched:
+        print(f"\n❌ {len(unmatched)} rows need manual review:")
+        for result in unmatched:
+            print(f"   Row {result['rowIndex']}: {result['sourceName']}: {result['error']}")
+
+    if args.report:
+        today = date.today().isoformat()
+        report = {
+            'applied': [dict(result, status='fixed', fixedDate=today) for result in applied],
+            'unmatched': unmatched,
+        }
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+        print(f"\n📝 Report written to {args.report}")
+    if args.dry_run:
+        print("\n(dry run: nothing written)")
+
+
+if __name__ == "__main__":
+    main()
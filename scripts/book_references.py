@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+
+"""Find book titles and author names inside question text and answers.
+
+Every title and author in every books.json, plus common variants (without
+a leading "The"/"A"/"An", without a subtitle, "&" for "and" and back), is
+compiled into one Aho-Corasick automaton. A single left-to-right pass over
+a string finds every name it contains, whole words only, so scanning the
+corpus costs the same however many books there are.
+
+The scanner is used to:
+
+- strip a leading book reference like "In Lo and Behold by Wendy Mass &
+  Gabi Mendez, " from a content question (strip_book_reference), as the
+  Glencoe, Tabor and Lake Oswego 6-8 parsers do, or a "<title> by
+  <author>" anywhere in an answer (remove_book_references)
+- flag leaks: in-which-book questions that name a book or author from
+  their division, which gives the answer away or points at the wrong
+  book, and content answers that are a book's title or author
+"""
+
+import argparse
+import re
+from collections import deque
+
+from canonical import FOLD_TABLE as CANONICAL_FOLD_TABLE, display_form
+from obob_corpus import find_year_divisions, load_books, load_division
+from validate_questions import parse_year_division
+
+LEADING_ARTICLE_PATTERN = re.compile(r'^(?:the|a|an)\s+', re.IGNORECASE)
+REFERENCE_PREFIX_PATTERN = re.compile(r'^\s*in\s+(?:the\s+book\s*,?\s*)?', re.IGNORECASE)
+BY_PATTERN = re.compile(r'\s*by\s+', re.IGNORECASE)
+SEPARATOR_PATTERN = re.compile(r'\s*[,:;-]?\s*')
+
+# canonical.py's one-for-one folds (not the deletions), so match offsets line up
+# with the original text; em dashes fold too, as title separators
+FOLD_TABLE = {**{ch: to for ch, to in CANONICAL_FOLD_TABLE.items() if to is not None}, ord('\u2014'): '-'}
+
+
+def fold(text):
+    folded = text.translate(FOLD_TABLE).lower()
+    if len(folded) != len(text):
+        # A few characters change length when lowercased; keep those as they are
+        folded = ''.join(ch if len(ch.lower()) != 1 else ch.lower() for ch in text.translate(FOLD_TABLE))
+    return folded
+
+
+class Automaton:
+    """An Aho-Corasick automaton over lowercase patterns, each carrying a payload."""
+
+    def __init__(self):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]  # node -> [(length, payload)]
+        self.built = False
+
+    def add(self, pattern, payload):
+        pattern = fold(pattern)
+        node = 0
+        for ch in pattern:
+            next_node = self.goto[node].get(ch)
+            if next_node is None:
+                next_node = len(self.goto)
+                self.goto[node][ch] = next_node
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+            node = next_node
+        self.output[node].append((len(pattern), payload))
+        self.built = False
+
+    def build(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self.goto[node].items():
+                queue.append(child)
+                fallback = self.fail[node]
+                while fallback and ch not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(ch, 0)
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+        self.built = True
+
+    def scan(self, text):
+        """Yield (start, end, payload) for every whole-word match in text."""
+        if not self.built:
+            self.build()
+        folded = fold(text)
+        goto, fail, output = self.goto, self.fail, self.output
+        node = 0
+        for i, ch in enumerate(folded):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for length, payload in output[node]:
+                start = i + 1 - length
+                if (start == 0 or not folded[start - 1].isalnum()) and (
+                        i + 1 == len(folded) or not folded[i + 1].isalnum()):
+                    yield start, i + 1, payload
+
+
+def name_variants(name, short_names=False):
+    """A title or author name and its common variants.
+
+    Single short words ("It", "Twins") are left out unless short_names is
+    set, since they match too much ordinary text.
+    """
+    name = display_form(name).translate(FOLD_TABLE)
+    variants = {name}
+    if ':' in name:
+        variants.add(name.split(':', 1)[0].strip())
+    for variant in list(variants):
+        variants.add(LEADING_ARTICLE_PATTERN.sub('', variant))
+    for variant in list(variants):
+        if ' and ' in variant:
+            variants.add(variant.replace(' and ', ' & '))
+        if ' & ' in variant:
+            variants.add(variant.replace(' & ', ' and '))
+    for variant in list(variants):
+        if '-' in variant:
+            # "McKay-Heidicker" is often written "McKay Heidicker"
+            variants.add(variant.replace('-', ' '))
+    if short_names:
+        return {v for v in variants if v}
+    return {v for v in variants if len(v) >= 4 and (' ' in v or len(v) >= 6)}
+
+
+def build_scanner(year_divisions=None, short_names=False):
+    """One automaton over the titles and authors of every division's books.
+
+    Payloads are (year, division, book_key, 'title' | 'author'). Parsers
+    that only strip leading references can pass short_names, since the
+    "In <title>," context makes even a one-word title safe to match.
+    """
+    if year_divisions is None:
+        year_divisions = find_year_divisions()
+    automaton = Automaton()
+    for year, division in year_divisions:
+        try:
+            books = load_books(year, division)
+        except FileNotFoundError:
+            continue
+        for book_key, book in books.items():
+            for kind in ('title', 'author'):
+                for variant in name_variants(book.get(kind), short_names):
+                    automaton.add(variant, (year, division, book_key, kind))
+    automaton.build()
+    return automaton
+
+
+def strip_book_reference(text, automaton, year=None, division=None):
+    """Strip a leading "In <title> (by <author>)," from a question.
+
+    Returns (text, book_key); book_key is None and the text unchanged if
+    the question doesn't start with a reference to a known book.
+    """
+    prefix = REFERENCE_PREFIX_PATTERN.match(text)
+    if not prefix:
+        return text, None
+
+    def same_division(payload):
+        return year is None or (payload[0], payload[1]) == (year, division)
+
+    matches = [(start, end, payload) for start, end, payload in automaton.scan(text) if same_division(payload)]
+    titles = [(end, payload) for start, end, payload in matches if start == prefix.end() and payload[3] == 'title']
+    if not titles:
+        return text, None
+    end, (_, _, book_key, _) = max(titles, key=lambda match: match[0])
+
+    by = BY_PATTERN.match(text, end)
+    if by:
+        authors = [match_end for start, match_end, payload in matches
+                   if start == by.end() and payload[2] == book_key and payload[3] == 'author']
+        if not authors:
+            # "by" someone the books.json doesn't name: not a reference this can strip cleanly
+            return text, None
+        end = max(authors)
+    rest = text[SEPARATOR_PATTERN.match(text, end).end():]
+    if not rest:
+        return text, None
+    return rest, book_key
+
+
+def remove_book_references(text, automaton, year=None, division=None, book_key=None):
+    """Remove each "<title> by <author>" naming a known book from anywhere in text.
+
+    Only references to book_key count, if it is given. A title without its
+    author is left alone, since it may be the answer itself. The caller
+    tidies the spaces and punctuation left behind.
+    """
+    matches = [(start, end, payload) for start, end, payload in automaton.scan(text)
+               if year is None or (payload[0], payload[1]) == (year, division)]
+    author_ends = {}
+    for start, end, payload in matches:
+        if payload[3] == 'author':
+            author_ends[start, payload[2]] = max(end, author_ends.get((start, payload[2]), end))
+    spans = []
+    for start, end, payload in matches:
+        if payload[3] != 'title' or book_key not in (None, payload[2]):
+            continue
+        by = BY_PATTERN.match(text, end)
+        if by and (by.end(), payload[2]) in author_ends:
+            spans.append((start, author_ends[by.end(), payload[2]]))
+
+    parts = []
+    position = 0
+    for start, end in sorted(spans, key=lambda span: (span[0], -span[1])):
+        if start >= position:
+            parts.append(text[position:start])
+            position = end
+    parts.append(text[position:])
+    return ''.join(parts)
+
+
+def find_leaks(question, automaton, year, division):
+    """(field, book_key, kind, matched text) for each book name in a question that gives something away."""
+    leaks = []
+    if question.get('type') == 'in-which-book':
+        fields = [('text', question.get('text'))]
+    else:
+        fields = [('answer', question.get('answer'))]
+    for field, value in fields:
+        if not isinstance(value, str):
+            continue
+        seen = set()
+        for start, end, (y, d, book_key, kind) in automaton.scan(value):
+            if (y, d) != (year, division) or (book_key, kind) in seen:
+                continue
+            if field == 'answer' and (start, end) != (0, len(value.rstrip(' .!?'))):
+                # A content answer is only a leak if it is the name itself
+                continue
+            seen.add((book_key, kind))
+            leaks.append((field, book_key, kind, value[start:end]))
+    return leaks
+
+
+def scan_corpus(year_divisions=None):
+    """Leading references and leaks across the corpus, in one pass per question."""
+    if year_divisions is None:
+        year_divisions = find_year_divisions()
+    automaton = build_scanner(find_year_divisions())
+    references = []
+    leaks = []
+    for year, division in year_divisions:
+        _, _, questions_by_source = load_division(year, division)
+        for source, questions in questions_by_source:
+            for index, q in enumerate(questions):
+                location = (f'{year}/{division}', source['path'], index, q)
+                text = q.get('text')
+                if q.get('type') == 'content' and isinstance(text, str):
+                    stripped, book_key = strip_book_reference(text, automaton, year, division)
+                    if book_key:
+                        references.append(location + (stripped, book_key))
+                for leak in find_leaks(q, automaton, year, division):
+                    leaks.append(location + leak)
+    return references, leaks
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find book references and title/author leaks in question text.")
+    parser.add_argument('divisions', nargs='*', type=parse_year_division, metavar='YEAR/DIVISION',
+                        help="limit to these divisions (default: all)")
+    parser.add_argument('--limit', type=int, default=20, help="examples to show of each kind (default: 20)")
+    args = parser.parse_args()
+
+    references, leaks = scan_corpus(args.divisions or None)
+
+    print(f"📖 {len(references)} content questions start with a book reference")
+    for division, path, index, q, stripped, book_key in references[:args.limit]:
+        wrong = '' if book_key == q.get('book_key') else f" (names {book_key}, filed under {q.get('book_key')})"
+        print(f"  {division} {path}[{index}]{wrong}")
+        print(f"    {q['text'][:90]}")
+        print(f"    → {stripped[:90]}")
+
+    own = [leak for leak in leaks if leak[5] == leak[3].get('book_key')]
+    other = [leak for leak in leaks if leak[5] != leak[3].get('book_key')]
+    for title, found in (("name their own book or author", own), ("name another book or author in the division", other)):
+        print(f"\n⚠️  {len(found)} questions {title}")
+        for division, path, index, q, field, book_key, kind, matched in found[:args.limit]:
+            print(f"  {division} {path}[{index}] {field} has {kind} of {book_key}: \"{matched}\"")
+            print(f"    {str(q.get(field))[:90]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+
+"""Build the derived question files the app serves from a single pass over the corpus.
+
+Every division's books.json, sources.json and questions.json files are
+loaded once, and each output sink writes its files from that in-memory
+copy:
+
+- counts:    lib/question-counts.json (was scripts/generate-question-counts.ts)
+- exports:   public/exports/<year>/<division>/*.csv (was scripts/generate-question-exports.ts)
+- search:    public/search/<year>/<division>.json inverted indexes (see search_questions.py)
+- answers:   public/answer-keys/<year>/<division>.json spoken-answer keys (see answer_keys.py)
+- crossword: public/crossword-candidates/<year>/<division>.json clue candidates
+             (see crossword_candidates.py)
+- pages:     public/page-index/<year>/<division>.json question IDs by page (see page_index.py)
+
+The counts and exports output is byte-identical to the TS scripts.
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+from answer_keys import answer_keys_path, build_answer_keys
+from crossword_candidates import build_candidate_index, candidate_index_path
+from js_sort import MISSING, js_sort, js_subtract, locale_compare
+from obob_corpus import OBOB_DIR, REPO_ROOT, load_corpus
+from page_index import build_page_index, page_index_path
+from search_questions import build_index, index_path
+
+EXPORT_HEADERS = ['book_key', 'question_type', 'page', 'text', 'answer', 'author_name', 'book_title', 'source_name']
+
+
+def write_if_changed(path, content):
+    """Write a text file, skipping the write when the content is unchanged."""
+    path = Path(path)
+    data = content.encode('utf-8')
+    try:
+        if path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return True
+
+
+def js_string(value):
+    """String(value) for the JSON scalars that appear in question data."""
+    if value is True:
+        return 'true'
+    if value is False:
+        return 'false'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def escape_csv(value):
+    if value is None or value is MISSING:
+        return ''
+    string_value = js_string(value)
+    # If the value contains commas, quotes, or newlines, wrap it in quotes and escape any quotes
+    if ',' in string_value or '"' in string_value or '\n' in string_value:
+        return '"' + string_value.replace('"', '""') + '"'
+    return string_value
+
+
+def compare_export_order(a, b):
+    """Sort by book_key, question_type, and page_number, as the TS exporter does."""
+    if a['book_key'] != b['book_key']:
+        return locale_compare(a['book_key'], b['book_key'])
+    if a['type'] != b['type']:
+        return locale_compare(a['type'], b['type'])
+    return js_subtract(a.get('page', MISSING), b.get('page', MISSING))
+
+
+def export_csv(questions, books):
+    rows = [','.join(EXPORT_HEADERS)]
+    for q in questions:
+        book = books.get(q['book_key'], {})
+        answer = q.get('answer', MISSING) if q['type'] == 'content' else ''
+        rows.append(','.join([
+            escape_csv(q['book_key']),
+            escape_csv(q['type']),
+            escape_csv(q.get('page', MISSING)),
+            escape_csv(q['text']),
+            escape_csv(answer),
+            escape_csv(book.get('author') or ''),
+            escape_csv(book.get('title') or ''),
+            escape_csv(q['source'].get('name') or ''),
+        ]))
+    return '\n'.join(rows)
+
+
+def build_question_counts(corpus, repo_root=REPO_ROOT):
+    """Sink: lib/question-counts.json with the question total per year/division."""
+    counts = {}
+    for entry in corpus:
+        counts.setdefault(entry['year'], {})[entry['division']] = len(entry['questions'])
+
+    output_path = Path(repo_root) / 'lib' / 'question-counts.json'
+    write_if_changed(output_path, json.dumps(counts, indent=2, ensure_ascii=False))
+
+    print("📊 Question counts:")
+    for year, divisions in counts.items():
+        for division, count in divisions.items():
+            print(f"  {year}/{division}: {count:,} questions")
+    return [output_path]
+
+
+def build_question_exports(corpus, repo_root=REPO_ROOT):
+    """Sink: per-book and all-questions CSV downloads under public/exports."""
+    written = []
+    for entry in corpus:
+        year, division, books = entry['year'], entry['division'], entry['books']
+        if not books:
+            print(f"No books found for {year}/{division}")
+            continue
+
+        output_dir = Path(repo_root) / 'public' / 'exports' / year / division
+        questions_by_book = {}
+        for q in entry['questions']:
+            questions_by_book.setdefault(q['book_key'], []).append(q)
+
+        for book in books.values():
+            book_questions = questions_by_book.get(book['book_key'])
+            if not book_questions:
+                print(f"Skipping {book['book_key']} - no questions")
+                continue
+            js_sort(book_questions, compare_export_order)
+            path = output_dir / f"{book['book_key']}-{year}-{division}.csv"
+            write_if_changed(path, export_csv(book_questions, {book['book_key']: book}))
+            written.append(path)
+
+        if entry['questions']:
+            sorted_questions = js_sort(list(entry['questions']), compare_export_order)
+            path = output_dir / f"obob-{year}-{division}-all-questions.csv"
+            write_if_changed(path, export_csv(sorted_questions, books))
+            written.append(path)
+
+        print(f"📁 {year}/{division}: exported {len(entry['questions']):,} questions for {len(books)} books")
+    return written
+
+
+def build_search_indexes(corpus, repo_root=REPO_ROOT):
+    """Sink: public/search/<year>/<division>.json full-text indexes."""
+    written = []
+    for entry in corpus:
+        index = build_index(entry)
+        path = index_path(entry['year'], entry['division'], Path(repo_root) / 'public' / 'search')
+        write_if_changed(path, json.dumps(index, separators=(',', ':'), ensure_ascii=False))
+        written.append(path)
+        print(f"🔎 {entry['year']}/{entry['division']}: indexed {len(index['docs']['book']):,} questions, "
+              f"{len(index['terms']):,} terms")
+    return written
+
+
+def build_answer_key_files(corpus, repo_root=REPO_ROOT):
+    """Sink: public/answer-keys/<year>/<division>.json content answer keys."""
+    written = []
+    for entry in corpus:
+        keys = build_answer_keys(entry)
+        path = answer_keys_path(entry['year'], entry['division'], Path(repo_root) / 'public' / 'answer-keys')
+        write_if_changed(path, json.dumps(keys, separators=(',', ':'), ensure_ascii=False))
+        written.append(path)
+        print(f"🗣️  {entry['year']}/{entry['division']}: keys for {len(keys['answers']):,} answers")
+    return written
+
+
+def build_crossword_candidates(corpus, repo_root=REPO_ROOT):
+    """Sink: public/crossword-candidates/<year>/<division>.json clue candidates."""
+    written = []
+    for entry in corpus:
+        index = build_candidate_index(entry, Path(repo_root) / 'public' / 'obob')
+        path = candidate_index_path(entry['year'], entry['division'],
+                                    Path(repo_root) / 'public' / 'crossword-candidates')
+        write_if_changed(path, json.dumps(index, separators=(',', ':'), ensure_ascii=False))
+        written.append(path)
+        print(f"🧩 {entry['year']}/{entry['division']}: {len(index['candidates']):,} crossword candidates")
+    return written
+
+
+def build_page_indexes(corpus, repo_root=REPO_ROOT):
+    """Sink: public/page-index/<year>/<division>.json question IDs by book, type and page."""
+    written = []
+    for entry in corpus:
+        index = build_page_index(entry)
+        path = page_index_path(entry['year'], entry['division'], Path(repo_root) / 'public' / 'page-index')
+        write_if_changed(path, json.dumps(index, separators=(',', ':'), ensure_ascii=False))
+        written.append(path)
+        print(f"📖 {entry['year']}/{entry['division']}: page index for {len(index['books'])} books")
+    return written
+
+
+SINKS = {
+    'counts': build_question_counts,
+    'exports': build_question_exports,
+    'search': build_search_indexes,
+    'answers': build_answer_key_files,
+    'crossword': build_crossword_candidates,
+    'pages': build_page_indexes,
+}
+
+
+def build(sinks=None, obob_dir=OBOB_DIR, repo_root=REPO_ROOT):
+    """Load the corpus once and run each requested sink over it."""
+    start_time = time.perf_counter()
+    corpus = load_corpus(obob_dir)
+    total = sum(len(entry['questions']) for entry in corpus)
+    print(f"Loaded {total:,} questions from {len(corpus)} divisions")
+
+    written = []
+    for name in sinks or SINKS:
+        written.extend(SINKS[name](corpus, repo_root))
+
+    elapsed = time.perf_counter() - start_time
+    print(f"\n✅ Built {len(written)} files in {elapsed * 1000:.0f} ms")
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the derived question files (counts, exports, indexes) from the OBOB question data.")
+    parser.add_argument('--only', action='append', choices=sorted(SINKS), metavar='SINK',
+                        help=f"only run these sinks ({', '.join(SINKS)}); may be repeated")
+    args = parser.parse_args()
+    build(args.only)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+
+"""Rebuild the writer output the TS tests read from tests/fixtures/corpus.
+
+The fixture is a small copy of the repository layout: one division's
+books.json, sources.json, question files and covers under public/, and
+two daily crosswords under content/daily-crosswords. This runs the same
+writers as the build over it, builds the cover variants and their
+division manifest, and packs the crosswords into a season archive, so
+the tests check the TS readers against what the Python actually writes.
+Rerun it after changing one of these formats and check in the result.
+"""
+
+import argparse
+
+import cover_images
+from build_question_data import build
+from crossword_archive import ARCHIVE_NAME, pack_division
+from obob_cache import content_hash
+from obob_corpus import REPO_ROOT, load_books
+
+FIXTURE_ROOT = REPO_ROOT / 'tests' / 'fixtures' / 'corpus'
+
+# build_question_data.py sinks whose output the tests read
+SINKS = ['search', 'crossword', 'pages', 'answers']
+
+
+def build_cover_manifest(public_dir):
+    """Variants of the fixture covers, WebP only, and their division manifest."""
+    manifest = {'version': cover_images.MANIFEST_VERSION, 'covers': {}}
+    for book in load_books('2025-2026', '3-5', public_dir / 'obob').values():
+        cover = book['cover']
+        data = (public_dir / cover.lstrip('/')).read_bytes()
+        job = (cover, data, content_hash(data), ['webp'], str(public_dir))
+        manifest['covers'][cover] = cover_images.build_cover(job)
+    manifest['covers'] = dict(sorted(manifest['covers'].items()))
+    return cover_images.write_division_manifests(manifest, public_dir / 'cover-variants')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild the checked-in writer output under tests/fixtures/corpus.")
+    parser.parse_args()
+    build(SINKS, FIXTURE_ROOT / 'public' / 'obob', FIXTURE_ROOT)
+
+    # Packed from scratch, since packing only appends to an existing archive
+    division_dir = FIXTURE_ROOT / 'content' / 'daily-crosswords' / '2025-2026' / '3-5'
+    (division_dir / ARCHIVE_NAME).unlink(missing_ok=True)
+    added, _ = pack_division(division_dir, '2025-2026', '3-5')
+    print(f"📦 2025-2026/3-5: packed {len(added)} crosswords")
+
+    if cover_images.Image is None:
+        print("⚠️  Pillow is not installed (`pip install pillow`); leaving the cover manifest as it is")
+        return
+    for path in build_cover_manifest(FIXTURE_ROOT / 'public'):
+        print(f"🖼️  {path.relative_to(FIXTURE_ROOT)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Canonical forms of question text, shared by the question tools.
+
+Source text comes in with curly quotes, non-breaking spaces and hyphens,
+doubled spaces, "nan" or "Unnamed: 1" cells from spreadsheets, and "?"
+with a space before it or repeated. canonicalize() turns a raw string
+into two forms:
+
+- display: the text to store and show. NFC-normalized, with curly quotes
+  and look-alike hyphens folded to ASCII, whitespace collapsed, and the
+  terminal punctuation tidied. A question mark is never added or removed.
+- key: the text to match on. The display form with accents stripped,
+  casefolded, apostrophes dropped, and every other run of punctuation or
+  whitespace reduced to one space. Duplicate checks, cross-season
+  matching and snapshot diffs compare these keys instead of normalizing
+  text their own way.
+
+Results are memoized on the raw string. The corpus repeats most strings
+across sources and snapshots, so each distinct string is processed once.
+"""
+
+import re
+import string
+import unicodedata
+from collections import namedtuple
+from functools import lru_cache
+
+Canonical = namedtuple('Canonical', 'display key')
+
+EMPTY = Canonical('', '')
+
+# Spreadsheet cells that mean "no value" ("None" is a real answer; None itself is handled below)
+EMPTY_CELL_PATTERN = re.compile(r'^(?:nan|null|unnamed: \d+)$', re.IGNORECASE)
+
+FOLD_TABLE = str.maketrans({
+    # Curly and prime quotes
+    '\u2018': "'", '\u2019': "'", '\u201a': "'", '\u201b': "'", '\u2032': "'",
+    '\u201c': '"', '\u201d': '"', '\u201e': '"', '\u201f': '"', '\u2033': '"',
+    # Hyphens, figure and en dashes, minus (em dashes are kept)
+    '\u2010': '-', '\u2011': '-', '\u2012': '-', '\u2013': '-', '\u2212': '-',
+    # Non-breaking spaces
+    '\u00a0': ' ', '\u2007': ' ', '\u202f': ' ',
+    # Zero-width characters and soft hyphens
+    '\u200b': None, '\u200c': None, '\u200d': None, '\ufeff': None, '\u00ad': None,
+})
+
+SPACE_BEFORE_PUNCTUATION_PATTERN = re.compile(r' ([?!.,;:])')
+TERMINAL_QUESTION_PATTERN = re.compile(r'\?[?.]*$')
+KEY_SEPARATOR_PATTERN = re.compile(r'[\W_]+')
+
+# ASCII punctuation to spaces (apostrophes dropped), for the key's fast path
+ASCII_KEY_TABLE = bytes.maketrans(string.punctuation.encode('ascii'), b' ' * len(string.punctuation))
+
+
+@lru_cache(maxsize=None)
+def _canonicalize(raw):
+    ascii_only = raw.isascii()
+    display = raw if ascii_only else unicodedata.normalize('NFC', raw).translate(FOLD_TABLE)
+    display = ' '.join(display.split())
+    if len(display) < 12 and EMPTY_CELL_PATTERN.match(display):
+        return EMPTY
+    if ' ' in display:
+        display = SPACE_BEFORE_PUNCTUATION_PATTERN.sub(r'\1', display)
+    if display.endswith(('??', '?.')):
+        display = TERMINAL_QUESTION_PATTERN.sub('?', display)
+
+    if display.isascii():
+        key = ' '.join(display.encode('ascii').lower().translate(ASCII_KEY_TABLE, b"'").decode('ascii').split())
+    else:
+        key = ''.join(ch for ch in unicodedata.normalize('NFKD', display) if not unicodedata.combining(ch))
+        key = KEY_SEPARATOR_PATTERN.sub(' ', key.casefold().replace("'", '')).strip()
+    return Canonical(display, key)
+
+
+def canonicalize(raw):
+    """The (display, key) pair for a raw string; None and non-strings give empty forms."""
+    if raw is None or raw != raw:  # None or NaN
+        return EMPTY
+    return _canonicalize(raw if isinstance(raw, str) else str(raw))
+
+
+def display_form(raw):
+    return canonicalize(raw).display
+
+
+def match_key(raw):
+    return canonicalize(raw).key
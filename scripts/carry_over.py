@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+
+"""Carry questions over from earlier seasons for books that come back.
+
+Books recur across seasons and divisions, but each season's question bank
+starts empty. This indexes every books.json under public/obob by the match
+keys (see canonical.py) of the title and author, so "The City of Ember" by
+"Jeanne DuPrau" and "City of Ember" by "Jeanne Duprau" are the same book
+whatever their book_key. For a target season, every book that appeared in
+an earlier one is joined against that season's questions. Questions are
+matched by a hash of their text's match key, so questions the target
+already has are left out, as are repeats between earlier seasons.
+
+The candidates for each target division are written to
+carry-over/<year>/<division>/questions.json, in the questions.json format
+with book_key mapped to the target season's key and a carriedFrom field
+naming where each came from. Page numbers are kept as they were and may
+need checking if the edition changed. A reuse report lists the recurring
+books, how many of their earlier questions the target already has and how
+many are new candidates.
+"""
+
+import argparse
+import json
+import re
+from pathlib import Path
+
+from canonical import match_key
+from obob_cache import content_hash
+from obob_corpus import OBOB_DIR, REPO_ROOT, find_year_divisions, load_books, load_division
+
+CARRY_OVER_DIR = REPO_ROOT / 'carry-over'
+
+LEADING_ARTICLE_PATTERN = re.compile(r'^(?:the|a|an)\s+')
+
+
+def book_identity(book):
+    """Normalized title + author, the key a book keeps across seasons."""
+    title = LEADING_ARTICLE_PATTERN.sub('', match_key(book.get('title')))
+    return f"{title}|{match_key(book.get('author'))}"
+
+
+def text_hash(question):
+    """Hash of a question's type and text match key."""
+    return content_hash(f"{question.get('type')}\0{match_key(question.get('text'))}".encode('utf-8'))[:16]
+
+
+def build_book_index(year_divisions, obob_dir=OBOB_DIR):
+    """Map each book identity to the (year, division, book_key) entries it appears as."""
+    index = {}
+    for year, division in year_divisions:
+        for book_key, book in load_books(year, division, obob_dir).items():
+            index.setdefault(book_identity(book), []).append((year, division, book_key))
+    return index
+
+
+def carry_over(target_year, year_divisions, obob_dir=OBOB_DIR, divisions=None):
+    """Candidate questions and a reuse report for each of the target season's divisions.
+
+    Returns {division: {'candidates': [...], 'books': [...]}}.
+    """
+    index = build_book_index(year_divisions, obob_dir)
+    earlier = [(y, d) for y, d in year_divisions if y < target_year]
+    targets = [d for y, d in year_divisions if y == target_year and (divisions is None or d in divisions)]
+
+    # Which earlier books each target division needs, by (year, division)
+    wanted = {}
+    plans = {}
+    for division in targets:
+        books = load_books(target_year, division, obob_dir)
+        plan = plans[division] = {}
+        for book_key, book in books.items():
+            previous = [(y, d, k) for y, d, k in index.get(book_identity(book), []) if y < target_year]
+            if previous:
+                plan[book_key] = {'title': book.get('title'), 'previous': previous}
+                for y, d, k in previous:
+                    wanted.setdefault((y, d), {}).setdefault(k, []).append((division, book_key))
+    if not wanted:
+        return {division: {'candidates': [], 'books': []} for division in targets}
+
+    # One pass over each earlier division that has a recurring book, newest first
+    found = {division: {} for division in targets}  # division -> book_key -> [(hash, question)]
+    for year, division in sorted(earlier, reverse=True):
+        books_wanted = wanted.get((year, division))
+        if not books_wanted:
+            continue
+        _, _, questions_by_source = load_division(year, division, obob_dir)
+        for source, questions in questions_by_source:
+            origin = f"{year}/{division}/{Path(source['path']).parent.as_posix()}"
+            for q in questions:
+                for target_division, book_key in books_wanted.get(q.get('book_key'), ()):
+                    carried = dict(q, book_key=book_key, carriedFrom=origin)
+                    carried.pop('revisionHistory', None)
+                    found[target_division].setdefault(book_key, []).append((text_hash(q), carried))
+
+    results = {}
+    for division in targets:
+        _, _, questions_by_source = load_division(target_year, division, obob_dir)
+        existing = {}
+        for _, questions in questions_by_source:
+            for q in questions:
+                existing.setdefault(q.get('book_key'), set()).add(text_hash(q))
+
+        candidates = []
+        books = []
+        for book_key, plan in plans[division].items():
+            have = existing.get(book_key, set())
+            seen = set()
+            reused = new = 0
+            for key, q in found[division].get(book_key, ()):
+                if key in seen:
+                    continue
+                seen.add(key)
+                if key in have:
+                    reused += 1
+                    continue
+                new += 1
+                candidates.append(q)
+            books.append({
+                'book_key': book_key,
+                'title': plan['title'],
+                'previous': [f'{y}/{d}/{k}' for y, d, k in plan['previous']],
+                'earlierQuestions': len(seen),
+                'alreadyInTarget': reused,
+                'candidates': new,
+            })
+        results[division] = {'candidates': candidates, 'books': books}
+    return results
+
+
+def write_candidates(path, candidates):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps({'questions': candidates}, indent=2, ensure_ascii=False) + '\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find questions to carry over from earlier seasons for recurring books.")
+    parser.add_argument('year', nargs='?', help="the target season, e.g. 2026-2027 (default: the latest)")
+    parser.add_argument('--division', action='append', help="only this division (can be repeated)")
+    parser.add_argument('--output-dir', default=str(CARRY_OVER_DIR), help="where to write the candidate files")
+    parser.add_argument('--report', help="also write the reuse report as JSON to this path")
+    parser.add_argument('--dry-run', action='store_true', help="print the report without writing candidate files")
+    args = parser.parse_args()
+
+    year_divisions = find_year_divisions()
+    years = sorted({year for year, _ in year_divisions})
+    target_year = args.year or (years[-1] if years else None)
+    if target_year not in years:
+        parser.error(f"no books.json found for season {target_year}")
+
+    earlier = [year for year in years if year < target_year]
+    print(f"🔁 Carry-over candidates for {target_year} (earlier seasons: {', '.join(earlier) or 'none'})\n")
+    results = carry_over(target_year, year_divisions, divisions=args.division)
+
+    for division, result in results.items():
+        print(f"📚 {target_year}/{division}: {len(result['books'])} recurring books, "
+              f"{len(result['candidates'])} candidate questions")
+        for book in result['books']:
+            print(f"   {book['title']} (from {', '.join(book['previous'])}): "
+                  f"{book['candidates']} new, {book['alreadyInTarget']} already in {target_year}")
+        if result['candidates'] and not args.dry_run:
+            path = Path(args.output_dir) / target_year / division / 'questions.json'
+            write_candidates(path, result['candidates'])
+            print(f"   → {path}")
+
+    if args.report:
+        report = {'year': target_year,
+                  'divisions': {division: result['books'] for division, result in results.items()}}
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+        print(f"\n📝 Report written to {args.report}")
+    if args.dry_run:
+        print("\n(dry run: nothing written)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 import path from 'path';
 import fs from 'fs/promises';
 import { isSingleWordAnswer, isContentQuestion } from '../lib/crossword/utils';
+import { loadCandidateIndex, countCandidatesPerBook } from '../lib/crossword/candidate-index';
 import type { Question, Book } from '../types';
 
 const YEARS_DIVISIONS = [
@@ -37,15 +38,20 @@ async function main() {
       console.log(`\n=== ${year} / ${division} ===`);
       
       const books = await getBooks(year, division);
-      const questions = await getAllQuestions(year, division);
+
+      // Use the prebuilt candidate index when available
+      const index = await loadCandidateIndex(year, division);
+      const indexCounts = index ? countCandidatesPerBook(index) : null;
+      const questions = indexCounts ? [] : await getAllQuestions(year, division);
       
       let divisionTotal = 0;
       
       for (const book of books) {
-        const bookQuestions = questions.filter(q => q.book_key === book.book_key);
-        const validCount = bookQuestions.filter(q => 
-          isContentQuestion(q) && isSingleWordAnswer((q as any).answer)
-        ).length;
+        const validCount = indexCounts
+          ? indexCounts.get(book.book_key) || 0
+          : questions.filter(q =>
+              q.book_key === book.book_key && isContentQuestion(q) && isSingleWordAnswer((q as any).answer)
+            ).length;
         
         divisionTotal += validCount;
         console.log(`  ${book.title}: ${validCount} clue candidates`);
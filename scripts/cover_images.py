@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+
+"""Build responsive variants of the book cover images.
+
+Every cover referenced by a books.json `cover` field is decoded once and
+written to public/cover-variants/ as WebP and AVIF at a few widths (never
+wider than the original), named with a prefix of the source image's
+content hash so they can be cached forever. Each cover also gets a tiny
+blurred WebP placeholder, inlined as a data URI.
+
+public/cover-variants/manifest.json maps each `cover` path to its
+dimensions, placeholder and variants, for lib/cover-images.ts:
+
+    {"version": 1, "covers": {"/covers/2025-2026/3-5/hatchet.jpg": {
+        "width": 1000, "height": 1500, "placeholder": "data:image/webp;base64,...",
+        "variants": {"avif": [{"src": "/cover-variants/...-128.avif", "width": 128, "height": 192}, ...],
+                     "webp": [...]}}}}
+
+The same entries are split into public/cover-variants/<year>/<division>.json
+by the cover's directory (/covers/<year>/<division>/...), so a client page
+only fetches its own division's covers.
+
+Covers are processed in a process pool. Results are cached by content hash
+in .obob-cache/cover_images.json, so unchanged covers whose variants are
+still on disk are skipped without being decoded. Variant files no longer
+in the manifest are removed.
+
+Needs Pillow (`pip install pillow`); AVIF needs Pillow 11.2+ built with
+libavif, and is skipped with a warning otherwise. Without Pillow it warns
+and exits successfully, so the build goes on and components/CoverImage.tsx
+serves the original covers through next/image.
+"""
+
+import argparse
+import base64
+import io
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+try:
+    from PIL import Image, ImageFilter, ImageOps, features
+except ImportError:
+    Image = None
+
+from obob_cache import ResultCache, content_hash
+from obob_corpus import REPO_ROOT, find_year_divisions, load_books
+
+PUBLIC_DIR = REPO_ROOT / 'public'
+OUTPUT_DIR = PUBLIC_DIR / 'cover-variants'
+MANIFEST_VERSION = 1
+# Bump when build_cover's output changes, so cached entries are rebuilt
+PIPELINE_VERSION = 2
+
+# Covers are shown 128px wide (up to 3x on high-density screens) and larger on book pages
+WIDTHS = (128, 256, 384, 640)
+QUALITY = {'webp': 75, 'avif': 50}
+# Encoder effort: these are ~4x faster than the defaults for files a few percent larger
+WEBP_METHOD = 4
+AVIF_SPEED = 8
+PLACEHOLDER_WIDTH = 16
+
+# EXIF orientations that swap width and height (transposed or rotated 90°)
+ORIENTATION_TAG = 0x0112
+ROTATED_ORIENTATIONS = {5, 6, 7, 8}
+
+
+def settings(formats):
+    """What the cached results depend on besides the image itself."""
+    return {'widths': list(WIDTHS), 'quality': {f: QUALITY[f] for f in formats},
+            'effort': [WEBP_METHOD, AVIF_SPEED], 'placeholder': PLACEHOLDER_WIDTH}
+
+
+def find_covers(year_divisions=None):
+    """Sorted cover paths (as in books.json) that exist under public/."""
+    covers = set()
+    for year, division in year_divisions or find_year_divisions():
+        try:
+            books = load_books(year, division)
+        except FileNotFoundError:
+            continue
+        for book in books.values():
+            cover = book.get('cover')
+            if isinstance(cover, str) and cover.startswith('/'):
+                if (PUBLIC_DIR / cover.lstrip('/')).is_file():
+                    covers.add(cover)
+                else:
+                    print(f"⚠️  {year}/{division} {book.get('book_key')}: cover {cover} not found")
+    return sorted(covers)
+
+
+def variant_name(cover, digest, width, fmt):
+    """/cover-variants/<cover dir>/<stem>-<hash>-<width>.<fmt>"""
+    cover_path = Path(cover.lstrip('/'))
+    parent = cover_path.parent.relative_to('covers') if cover_path.parts[0] == 'covers' else cover_path.parent
+    return f"/cover-variants/{(parent / f'{cover_path.stem}-{digest[:10]}-{width}.{fmt}').as_posix()}"
+
+
+def encode(image, fmt):
+    buffer = io.BytesIO()
+    if fmt == 'webp':
+        image.save(buffer, 'WEBP', quality=QUALITY['webp'], method=WEBP_METHOD)
+    else:
+        image.save(buffer, 'AVIF', quality=QUALITY['avif'], speed=AVIF_SPEED)
+    return buffer.getvalue()
+
+
+def build_cover(job):
+    """Decode one cover and write its variants; returns its manifest entry."""
+    cover, data, digest, formats, output_root = job
+    image = Image.open(io.BytesIO(data))
+    # Dimensions of the full-size cover as displayed, for the aspect ratio
+    width, height = image.size
+    if image.getexif().get(ORIENTATION_TAG) in ROTATED_ORIENTATIONS:
+        width, height = height, width
+    scale = min(max(WIDTHS), width) / width
+    # Let the JPEG decoder scale down by a power of two while staying above the largest width
+    image.draft('RGB', (round(image.width * scale), round(image.height * scale)))
+    image = ImageOps.exif_transpose(image).convert('RGB')
+
+    variants = {fmt: [] for fmt in formats}
+    for target in sorted({min(w, width) for w in WIDTHS}):
+        size = (target, max(1, round(height * target / width)))
+        resized = image.resize(size, Image.LANCZOS) if size != image.size else image
+        for fmt in formats:
+            src = variant_name(cover, digest, target, fmt)
+            path = Path(output_root) / src.lstrip('/')
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(encode(resized, fmt))
+            variants[fmt].append({'src': src, 'width': size[0], 'height': size[1]})
+
+    tiny = image.resize((PLACEHOLDER_WIDTH, max(1, round(height * PLACEHOLDER_WIDTH / width))), Image.BILINEAR)
+    buffer = io.BytesIO()
+    tiny.filter(ImageFilter.GaussianBlur(1)).save(buffer, 'WEBP', quality=40)
+    placeholder = 'data:image/webp;base64,' + base64.b64encode(buffer.getvalue()).decode('ascii')
+    return {'width': width, 'height': height, 'placeholder': placeholder, 'variants': variants}
+
+
+def variants_exist(entry, output_root):
+    return all((Path(output_root) / v['src'].lstrip('/')).is_file()
+               for variants in entry['variants'].values() for v in variants)
+
+
+def division_manifest_path(cover, output_dir=OUTPUT_DIR):
+    """<output_dir>/<year>/<division>.json for a /covers/<year>/<division>/... path, or None."""
+    parts = Path(cover.lstrip('/')).parts
+    if len(parts) != 4 or parts[0] != 'covers':
+        return None
+    return Path(output_dir) / parts[1] / f'{parts[2]}.json'
+
+
+def write_division_manifests(manifest, output_dir=OUTPUT_DIR):
+    """Split the manifest by division, like lib/cover-images.ts coverManifestUrl expects; returns the paths."""
+    by_path = {}
+    for cover, entry in manifest['covers'].items():
+        path = division_manifest_path(cover, output_dir)
+        if path:
+            by_path.setdefault(path, {})[cover] = entry
+    for path, covers in by_path.items():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'version': manifest['version'], 'covers': covers}, f, separators=(',', ':'))
+    return sorted(by_path)
+
+
+def remove_stale_variants(manifest, output_dir):
+    """Delete variant files that the manifest no longer references; returns how many."""
+    live = {v['src'] for entry in manifest['covers'].values()
+            for variants in entry['variants'].values() for v in variants}
+    output_root = Path(output_dir).parent
+    removed = 0
+    for path in Path(output_dir).rglob('*'):
+        if path.is_file() and path.suffix in ('.webp', '.avif'):
+            if '/' + path.relative_to(output_root).as_posix() not in live:
+                path.unlink()
+                removed += 1
+    return removed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build responsive WebP/AVIF variants of the book covers.")
+    parser.add_argument('divisions', nargs='*', metavar='YEAR/DIVISION', help="limit to these divisions (default: all)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="worker processes (default: one per CPU)")
+    parser.add_argument('--no-avif', action='store_true', help="only write WebP variants")
+    parser.add_argument('--force', action='store_true', help="rebuild every cover, ignoring the cache")
+    args = parser.parse_args()
+
+    if Image is None:
+        print("⚠️  Pillow is not installed (`pip install pillow`); skipping the cover variants, "
+              "so the original covers will be served")
+        return
+
+    formats = ['avif', 'webp']
+    if args.no_avif:
+        formats = ['webp']
+    elif not features.check('avif'):
+        print("⚠️  This Pillow can't write AVIF (needs 11.2+ with libavif); writing WebP only")
+        formats = ['webp']
+
+    year_divisions = [tuple(d.split('/', 1)) for d in args.divisions] or None
+    covers = find_covers(year_divisions)
+    cache = ResultCache('cover_images', PIPELINE_VERSION, max_entries=4096)
+    signature = settings(formats)
+    output_root = OUTPUT_DIR.parent
+
+    started = time.perf_counter()
+    entries = {}
+    jobs = []
+    for cover in covers:
+        path = PUBLIC_DIR / cover.lstrip('/')
+        cached = None if args.force else cache.get_file(path, lambda data: None)
+        if cached and cached['settings'] == signature and variants_exist(cached['entry'], output_root):
+            entries[cover] = cached['entry']
+            continue
+        data = path.read_bytes()
+        jobs.append((cover, data, content_hash(data), formats, str(output_root)))
+
+    if jobs:
+        with ProcessPoolExecutor(max_workers=min(args.workers, len(jobs))) as pool:
+            for job, entry in zip(jobs, pool.map(build_cover, jobs)):
+                cover, data = job[0], job[1]
+                entries[cover] = entry
+                cache.put_file(PUBLIC_DIR / cover.lstrip('/'), data, {'settings': signature, 'entry': entry})
+    cache.save()
+
+    manifest_path = OUTPUT_DIR / 'manifest.json'
+    manifest = {'version': MANIFEST_VERSION, 'covers': {}}
+    if year_divisions and manifest_path.exists():
+        # Keep the other divisions' covers when only some were rebuilt
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+        if previous.get('version') == MANIFEST_VERSION:
+            manifest['covers'].update(previous['covers'])
+    manifest['covers'].update(entries)
+    manifest['covers'] = dict(sorted(manifest['covers'].items()))
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+        f.write('\n')
+    division_manifests = write_division_manifests(manifest)
+    removed = remove_stale_variants(manifest, OUTPUT_DIR)
+
+    original = sum((PUBLIC_DIR / cover.lstrip('/')).stat().st_size for cover in covers)
+    smallest = {}
+    for cover in covers:
+        for fmt, variants in entries[cover]['variants'].items():
+            smallest[fmt] = smallest.get(fmt, 0) + (output_root / variants[0]['src'].lstrip('/')).stat().st_size
+    elapsed = time.perf_counter() - started
+    print(f"🖼️  {len(covers)} covers: {len(jobs)} built, {len(covers) - len(jobs)} unchanged, "
+          f"{removed} stale variants removed in {elapsed:.1f}s")
+    print(f"  Originals: {original / 1024 / 1024:.1f} MB")
+    for fmt, size in sorted(smallest.items()):
+        print(f"  {WIDTHS[0]}px {fmt}: {size / 1024:.0f} KB")
+    print(f"Output: {OUTPUT_DIR} (manifest.json and {len(division_manifests)} division manifests)")
+
+
+if __name__ == "__main__":
+    main()
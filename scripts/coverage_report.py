@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+
+"""Question coverage by division, book, source, type and page range.
+
+Counts every question into one NumPy array indexed by
+
+    [division, book, source, type, page bucket]
+
+where a book's pages are split into ten equal buckets (deciles) of its
+length, plus an eleventh bucket for questions without a page. A book's
+length is taken as the highest page any question cites, as in
+analyze-community-coverage.ts, since books.json has no page counts. Books
+and sources are numbered within their division, so the array is padded to
+the largest division.
+
+From the array it reports gaps, such as page ranges of a book with no
+in-which-book questions, books a source hasn't written for, and books with
+no questions of a type. It also writes a long-format CSV with one row per
+cell for heatmaps. Building it is one pass over the question files, so it
+can be rerun after every import.
+"""
+
+import argparse
+import csv
+
+import numpy as np
+
+from obob_corpus import QUESTION_TYPES, find_year_divisions, load_division
+
+PAGE_BUCKETS = 10
+NO_PAGE = PAGE_BUCKETS
+
+TYPE_LABELS = {'in-which-book': 'IWB', 'content': 'content'}
+
+
+def build_coverage(year_divisions):
+    """Load the divisions and count their questions into the coverage array."""
+    divisions = []
+    book_keys = []
+    source_names = []
+    codes = []  # (division, book, source, type, page) per question
+    unknown_books = 0
+
+    for d, (year, division) in enumerate(year_divisions):
+        books, sources, questions_by_source = load_division(year, division)
+        book_index = {key: b for b, key in enumerate(books)}
+        divisions.append((year, division, books))
+        book_keys.append(list(books))
+        source_names.append([source['name'] for source, _ in questions_by_source])
+        for s, (_, questions) in enumerate(questions_by_source):
+            for q in questions:
+                b = book_index.get(q.get('book_key'))
+                t = QUESTION_TYPES.index(q['type']) if q.get('type') in QUESTION_TYPES else None
+                if b is None or t is None:
+                    unknown_books += 1
+                    continue
+                page = q.get('page')
+                codes.append((d, b, s, t, page if isinstance(page, int) and page > 0 else 0))
+
+    shape_books = max((len(keys) for keys in book_keys), default=0)
+    shape_sources = max((len(names) for names in source_names), default=0)
+    codes = np.array(codes, dtype=np.int64).reshape(-1, 5)
+    d, b, s, t, page = codes.T
+
+    # Book length: the highest page cited for the book in any source
+    max_pages = np.zeros((len(divisions), shape_books), dtype=np.int64)
+    np.maximum.at(max_pages, (d, b), page)
+    length = np.maximum(max_pages[d, b], 1)
+    bucket = np.where(page > 0, np.minimum((page - 1) * PAGE_BUCKETS // length, PAGE_BUCKETS - 1), NO_PAGE)
+
+    counts = np.zeros((len(divisions), shape_books, shape_sources, len(QUESTION_TYPES), PAGE_BUCKETS + 1),
+                      dtype=np.int32)
+    np.add.at(counts, (d, b, s, t, bucket), 1)
+
+    return {
+        'divisions': divisions,
+        'book_keys': book_keys,
+        'sources': source_names,
+        'max_pages': max_pages,
+        'counts': counts,
+        'skipped': unknown_books,
+    }
+
+
+def bucket_pages(bucket, max_page):
+    """The (first, last) pages of a bucket, or None if the book is too short for it."""
+    first = -(-bucket * max_page // PAGE_BUCKETS) + 1
+    last = -(-(bucket + 1) * max_page // PAGE_BUCKETS)
+    return (first, last) if first <= last else None
+
+
+def page_gaps(book_counts, max_page, minimum=1):
+    """Merge runs of page buckets with fewer than `minimum` questions into page ranges."""
+    gaps = []
+    for bucket in range(PAGE_BUCKETS):
+        pages = bucket_pages(bucket, max_page)
+        if pages is None or book_counts[bucket] >= minimum:
+            continue
+        if gaps and gaps[-1][1] == pages[0] - 1:
+            gaps[-1] = (gaps[-1][0], pages[1])
+        else:
+            gaps.append(pages)
+    return gaps
+
+
+def source_mask(coverage, d, names):
+    """Which of a division's sources to count (all of them if no names are given)."""
+    sources = coverage['sources'][d]
+    mask = np.zeros(coverage['counts'].shape[2], dtype=bool)
+    for s, name in enumerate(sources):
+        mask[s] = not names or any(n.lower() in name.lower() for n in names)
+    return mask
+
+
+def gap_report(coverage, types, source_names=(), minimum=1):
+    """Gap lines per division: thin page ranges, missing types, uncovered sources.
+
+    Divisions with none of the named sources are left out, rather than
+    reported as having no questions at all.
+    """
+    counts = coverage['counts']
+    report = []
+    for d, (year, division, books) in enumerate(coverage['divisions']):
+        mask = source_mask(coverage, d, source_names)
+        if not mask.any():
+            continue
+        selected = counts[d][:, mask]  # book, source, type, bucket
+        lines = []
+        for b, key in enumerate(coverage['book_keys'][d]):
+            title = books[key].get('title', key)
+            max_page = int(coverage['max_pages'][d, b])
+            for t in types:
+                label = TYPE_LABELS[QUESTION_TYPES[t]]
+                by_bucket = selected[b, :, t].sum(axis=0)
+                if by_bucket.sum() == 0:
+                    lines.append(f"No {label} questions for {title}")
+                    continue
+                for first, last in page_gaps(by_bucket, max_page, minimum):
+                    what = f"No {label} questions" if minimum == 1 else f"Fewer than {minimum} {label} questions"
+                    lines.append(f"{what} from pages {first}–{last} of {title}")
+        for s in np.flatnonzero(mask):
+            name = coverage['sources'][d][s]
+            per_book = counts[d, :len(books), s][:, types].sum(axis=(1, 2))
+            missing = [books[key].get('title', key) for key, n in zip(coverage['book_keys'][d], per_book) if n == 0]
+            if missing and len(missing) < len(books):
+                lines.append(f"{name} has no questions for {len(missing)} book(s): {', '.join(missing)}")
+        report.append(((year, division), lines))
+    return report
+
+
+def write_heatmap_csv(coverage, path):
+    """One row per (division, book, source, type, page bucket) cell, zeros included."""
+    counts = coverage['counts']
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['year', 'division', 'book_key', 'title', 'source', 'type', 'bucket',
+                         'first_page', 'last_page', 'questions'])
+        for d, (year, division, books) in enumerate(coverage['divisions']):
+            for b, key in enumerate(coverage['book_keys'][d]):
+                max_page = int(coverage['max_pages'][d, b])
+                for s, source in enumerate(coverage['sources'][d]):
+                    for t, question_type in enumerate(QUESTION_TYPES):
+                        for bucket in range(PAGE_BUCKETS + 1):
+                            if bucket == NO_PAGE:
+                                label, pages = 'none', ('', '')
+                            else:
+                                pages = bucket_pages(bucket, max_page)
+                                if pages is None:
+                                    continue
+                                label = str(bucket + 1)
+                            writer.writerow([year, division, key, books[key].get('title', key), source,
+                                             question_type, label, pages[0], pages[1],
+                                             int(counts[d, b, s, t, bucket])])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report where questions are thin, by book, source, type and page range.")
+    parser.add_argument('divisions', nargs='*', metavar='YEAR/DIVISION',
+                        help="divisions to report, e.g. 2025-2026/3-5 (default: all)")
+    parser.add_argument('--type', choices=QUESTION_TYPES, help="only report gaps for one question type")
+    parser.add_argument('--source', action='append', default=[],
+                        help="only count sources whose name contains this (repeatable)")
+    parser.add_argument('--min', type=int, default=1, dest='minimum',
+                        help="report page ranges with fewer than this many questions (default: 1)")
+    parser.add_argument('--csv', help="write the heatmap CSV to this path")
+    args = parser.parse_args()
+
+    year_divisions = [tuple(d.split('/', 1)) for d in args.divisions] or find_year_divisions()
+    coverage = build_coverage(year_divisions)
+    types = [QUESTION_TYPES.index(args.type)] if args.type else list(range(len(QUESTION_TYPES)))
+
+    for name in args.source:
+        if not any(name.lower() in source.lower() for names in coverage['sources'] for source in names):
+            available = sorted({source for names in coverage['sources'] for source in names})
+            parser.error(f"--source {name!r} matches no source; the sources are: {', '.join(available)}")
+
+    total_gaps = 0
+    report = gap_report(coverage, types, args.source, args.minimum)
+    for (year, division), lines in report:
+        d = [(y, dv) for y, dv, _ in coverage['divisions']].index((year, division))
+        mask = source_mask(coverage, d, args.source)
+        total = int(coverage['counts'][d][:, mask].sum())
+        scope = f" from {mask.sum()} of {len(coverage['sources'][d])} sources" if args.source else ''
+        print(f"\n📚 {year} / {division}: {total:,} questions{scope}, {len(lines)} gaps")
+        print("─" * 60)
+        for line in lines:
+            print(f"  {line}")
+        total_gaps += len(lines)
+
+    if coverage['skipped']:
+        print(f"\n⚠️  Skipped {coverage['skipped']} questions with an unknown book or type")
+    print(f"\n📊 {total_gaps} gaps across {len(report)} divisions")
+
+    if args.csv:
+        write_heatmap_csv(coverage, args.csv)
+        print(f"✅ Heatmap CSV written to {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+
+"""Pack a season's daily crosswords into one archive per division.
+
+content/daily-crosswords/<year>/<division>/season.pack replaces the
+division's crossword-<date>.json files:
+
+    "OBXW0001"                  magic
+    puzzle, puzzle, ...         one compact JSON array per date
+    index                       JSON: shared string table, dates, offsets, lengths
+    index length                uint32, little-endian
+    "OBXW0001"                  magic
+
+Clue text, answers, book keys and titles, clue IDs and directions repeat
+from day to day, so each is stored once in the index's string table and
+the puzzles refer to them by position. A grid row is stored as one string
+with "." for an empty cell, and the year, division, date and puzzle ID
+come from the archive and the index. lib/daily-crossword/archive.ts reads
+the index once and then each puzzle with a single positional read.
+
+Packing appends: dates already in the archive are kept as they are, new
+strings go at the end of the table (so stored puzzles stay valid), and the
+old index is replaced by the new puzzles and a new index. The archive is
+written to a temporary file and swapped in with os.replace, so a reader or
+an interrupted run never sees a truncated one. Every puzzle is unpacked
+again and compared with its JSON before it is written.
+"""
+
+import argparse
+import json
+import os
+import struct
+from pathlib import Path
+
+from obob_corpus import REPO_ROOT
+
+CROSSWORD_DIR = REPO_ROOT / 'content' / 'daily-crosswords'
+ARCHIVE_NAME = 'season.pack'
+
+MAGIC = b'OBXW0001'
+TRAILER = struct.Struct('<I8s')
+ARCHIVE_VERSION = 1
+
+CLUE_FIELDS = ('id', 'number', 'direction', 'text', 'answer', 'startRow', 'startCol', 'length', 'bookKey', 'bookTitle')
+CLUE_STRINGS = {'id', 'direction', 'text', 'answer', 'bookKey', 'bookTitle'}
+PUZZLE_KEYS = ['id', 'year', 'division', 'dateString', 'puzzle', 'generatedAt', 'clueCount']
+GRID_KEYS = ['grid', 'clues', 'rows', 'cols', 'cellNumbers']
+
+
+class StringTable:
+    """Strings stored once, referred to by position."""
+
+    def __init__(self, strings=()):
+        self.strings = list(strings)
+        self.positions = {s: i for i, s in enumerate(self.strings)}
+
+    def add(self, value):
+        position = self.positions.get(value)
+        if position is None:
+            position = self.positions[value] = len(self.strings)
+            self.strings.append(value)
+        return position
+
+
+def pack_puzzle(daily, table):
+    """A daily puzzle as a compact JSON array, its strings added to table.
+
+    [generatedAt, clueCount, rows, cols, [grid rows], [row, col, number, ...],
+     [[id, number, direction, text, answer, startRow, startCol, length, bookKey, bookTitle(, page)], ...]]
+    """
+    if list(daily) != PUZZLE_KEYS or list(daily['puzzle']) != GRID_KEYS:
+        raise ValueError(f"{daily.get('id')}: unexpected puzzle fields")
+    puzzle = daily['puzzle']
+    grid = []
+    for row in puzzle['grid']:
+        if any(cell is not None and (not isinstance(cell, str) or len(cell) != 1 or cell == '.') for cell in row):
+            raise ValueError(f"{daily['id']}: grid cells must be single letters or null")
+        grid.append(''.join(cell or '.' for cell in row))
+    cell_numbers = []
+    for cell, number in puzzle['cellNumbers'].items():
+        row, col = cell.split(',')
+        cell_numbers += [int(row), int(col), number]
+    clues = []
+    for clue in puzzle['clues']:
+        fields = list(clue)
+        if fields not in (list(CLUE_FIELDS), list(CLUE_FIELDS) + ['page']):
+            raise ValueError(f"{daily['id']}: unexpected clue fields {fields}")
+        clues.append([table.add(value) if field in CLUE_STRINGS else value for field, value in clue.items()])
+    return [daily['generatedAt'], daily['clueCount'], puzzle['rows'], puzzle['cols'], grid, cell_numbers, clues]
+
+
+def unpack_puzzle(packed, strings, year, division, date_string):
+    """The daily puzzle dict for a packed array."""
+    generated_at, clue_count, rows, cols, grid, cell_numbers, clues = packed
+    return {
+        'id': f'{year}:{division}:{date_string}',
+        'year': year,
+        'division': division,
+        'dateString': date_string,
+        'puzzle': {
+            'grid': [[None if cell == '.' else cell for cell in row] for row in grid],
+            'clues': [{field: strings[value] if field in CLUE_STRINGS else value
+                       for field, value in zip(CLUE_FIELDS + ('page',), clue)} for clue in clues],
+            'rows': rows,
+            'cols': cols,
+            'cellNumbers': {f'{cell_numbers[i]},{cell_numbers[i + 1]}': cell_numbers[i + 2]
+                            for i in range(0, len(cell_numbers), 3)},
+        },
+        'generatedAt': generated_at,
+        'clueCount': clue_count,
+    }
+
+
+def read_index(path):
+    """(index, offset where the index starts) for an archive, or (None, None) if it doesn't exist."""
+    try:
+        f = open(path, 'rb')
+    except FileNotFoundError:
+        return None, None
+    with f:
+        size = f.seek(0, 2)
+        if size < len(MAGIC) + TRAILER.size:
+            raise ValueError(f"{path}: not a crossword archive")
+        f.seek(size - TRAILER.size)
+        length, magic = TRAILER.unpack(f.read(TRAILER.size))
+        f.seek(0)
+        if magic != MAGIC or f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path}: not a crossword archive")
+        start = size - TRAILER.size - length
+        f.seek(start)
+        index = json.loads(f.read(length))
+    if index.get('version') != ARCHIVE_VERSION:
+        raise ValueError(f"{path}: archive version {index.get('version')} is not supported")
+    return index, start
+
+
+def read_puzzle(path, date_string):
+    """The daily puzzle for a date from an archive, or None."""
+    index, _ = read_index(path)
+    if index is None or date_string not in index['dates']:
+        return None
+    i = index['dates'].index(date_string)
+    with open(path, 'rb') as f:
+        f.seek(index['offsets'][i])
+        packed = json.loads(f.read(index['lengths'][i]))
+    return unpack_puzzle(packed, index['strings'], index['year'], index['division'], date_string)
+
+
+def packed_dates(year, division, crossword_dir=CROSSWORD_DIR):
+    index, _ = read_index(Path(crossword_dir) / year / division / ARCHIVE_NAME)
+    return set(index['dates']) if index else set()
+
+
+def append_puzzles(path, year, division, puzzles):
+    """Append daily puzzles to an archive, creating it if needed.
+
+    Dates already in the archive are skipped. Returns the dates added.
+    """
+    path = Path(path)
+    index, start = read_index(path)
+    created = index is None
+    if created:
+        index = {'version': ARCHIVE_VERSION, 'year': year, 'division': division,
+                 'strings': [], 'dates': [], 'offsets': [], 'lengths': []}
+        start = len(MAGIC)
+    elif (index['year'], index['division']) != (year, division):
+        raise ValueError(f"{path} holds {index['year']}/{index['division']}, not {year}/{division}")
+
+    table = StringTable(index['strings'])
+    existing = set(index['dates'])
+    blobs = []
+    added = []
+    offset = start
+    for daily in sorted(puzzles, key=lambda p: p['dateString']):
+        date_string = daily['dateString']
+        if date_string in existing:
+            continue
+        if (daily['year'], daily['division']) != (year, division):
+            raise ValueError(f"{daily['id']} does not belong in {year}/{division}")
+        packed = pack_puzzle(daily, table)
+        if unpack_puzzle(packed, table.strings, year, division, date_string) != daily:
+            raise ValueError(f"{daily['id']}: puzzle does not survive packing")
+        blob = json.dumps(packed, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        existing.add(date_string)
+        index['dates'].append(date_string)
+        index['offsets'].append(offset)
+        index['lengths'].append(len(blob))
+        blobs.append(blob)
+        added.append(date_string)
+        offset += len(blob)
+    if not blobs:
+        return added
+
+    # Keep the index sorted by date so readers can list dates without sorting
+    order = sorted(range(len(index['dates'])), key=index['dates'].__getitem__)
+    for key in ('dates', 'offsets', 'lengths'):
+        index[key] = [index[key][i] for i in order]
+    index['strings'] = table.strings
+    index_bytes = json.dumps(index, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    # Written to a temporary file and swapped in, so readers never see a half-written archive
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+    try:
+        with open(tmp_path, 'wb') as f:
+            if created:
+                f.write(MAGIC)
+            else:
+                with open(path, 'rb') as old:
+                    f.write(old.read(start))
+            for blob in blobs:
+                f.write(blob)
+            f.write(index_bytes)
+            f.write(TRAILER.pack(len(index_bytes), MAGIC))
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return added
+
+
+def pack_division(division_dir, year, division, prune=False):
+    """Append a division's crossword-<date>.json files to its archive.
+
+    Returns (dates added, files removed).
+    """
+    files = sorted(Path(division_dir).glob('crossword-*.json'))
+    puzzles = []
+    for file in files:
+        with open(file, 'r', encoding='utf-8') as f:
+            puzzles.append(json.load(f))
+    archive = Path(division_dir) / ARCHIVE_NAME
+    added = append_puzzles(archive, year, division, puzzles)
+
+    removed = []
+    if prune:
+        for file, daily in zip(files, puzzles):
+            # A file is only removed once the archive gives back the same puzzle
+            if read_puzzle(archive, daily['dateString']) == daily:
+                file.unlink()
+                removed.append(file.name)
+    return added, removed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack daily crossword files into one archive per division.")
+    parser.add_argument('divisions', nargs='*', metavar='YEAR/DIVISION', help="limit to these divisions (default: all)")
+    parser.add_argument('--crossword-dir', default=str(CROSSWORD_DIR), help="default: content/daily-crosswords")
+    parser.add_argument('--prune', action='store_true', help="remove the JSON files once their puzzles are packed")
+    parser.add_argument('--list', action='store_true', help="list each archive's dates and size instead of packing")
+    args = parser.parse_args()
+
+    crossword_dir = Path(args.crossword_dir)
+    targets = [crossword_dir / d for d in args.divisions] or sorted(p for p in crossword_dir.glob('*/*') if p.is_dir())
+
+    for division_dir in targets:
+        year, division = division_dir.parent.name, division_dir.name
+        if args.list:
+            index, _ = read_index(division_dir / ARCHIVE_NAME)
+            if index is None:
+                print(f"📦 {year}/{division}: no archive")
+                continue
+            size = (division_dir / ARCHIVE_NAME).stat().st_size
+            print(f"📦 {year}/{division}: {len(index['dates'])} puzzles, {index['dates'][0]} to {index['dates'][-1]}, "
+                  f"{len(index['strings']):,} shared strings, {size / 1024:.0f} KB")
+            continue
+        added, removed = pack_division(division_dir, year, division, prune=args.prune)
+        size = (division_dir / ARCHIVE_NAME).stat().st_size if (division_dir / ARCHIVE_NAME).exists() else 0
+        print(f"📦 {year}/{division}: {len(added)} puzzles added"
+              f"{f', {len(removed)} files removed' if args.prune else ''} ({size / 1024:.0f} KB)")
+
+
+if __name__ == "__main__":
+    main()
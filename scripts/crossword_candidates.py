@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+
+"""Crossword candidate-answer index.
+
+The `crossword` sink of build_question_data.py writes one index per
+division to public/crossword-candidates/<year>/<division>.json, so daily
+puzzle generation can load its candidate clues directly instead of
+filtering the whole corpus for every puzzle:
+
+- candidates: every content question whose answer passes
+              isSingleWordAnswer, for a book in books.json, in
+              getAllQuestions order. Each has the question ID (the same IDs
+              as the search index), the normalized answer, its length, a
+              letter histogram (26 digits, A-Z counts), the book key and
+              title, the clue text and the page.
+- byLength:   answer length -> candidate positions
+- byLetter:   "<position><letter>" (e.g. "0A") -> candidate positions
+- corpus:     the division's question count and division_fingerprint (a
+              hash of its books.json, sources.json and question files);
+              lib/crossword/candidate-index.ts ignores an index whose
+              hash no longer matches the files
+
+normalize_answer and is_single_word_answer mirror lib/crossword/utils.ts,
+so the candidates (and their order) are exactly what
+filterCrosswordQuestions returns.
+"""
+
+import argparse
+import re
+from collections import Counter
+from string import ascii_uppercase
+
+from obob_corpus import OBOB_DIR, REPO_ROOT, division_fingerprint, find_year_divisions, load_corpus
+from port_helpers import JS_SPACE_CLASS, js_trim
+
+INDEX_VERSION = 2
+CANDIDATES_DIR = REPO_ROOT / 'public' / 'crossword-candidates'
+
+PARENTHETICAL_PATTERN = re.compile(r'\(.*?\)')
+PG_PATTERN = re.compile(rf'\bPG\.?{JS_SPACE_CLASS}*[0-9]+\b', re.IGNORECASE | re.ASCII)
+PAGE_PATTERN = re.compile(rf'\bPAGE{JS_SPACE_CLASS}*[0-9]+\b', re.IGNORECASE | re.ASCII)
+NON_LETTER_PATTERN = re.compile(r'[^A-Z]')
+SPACE_PATTERN = re.compile(JS_SPACE_CLASS)
+SEPARATOR_PATTERN = re.compile(r'[/\-]')
+
+MIN_LENGTH = 3
+MAX_LENGTH = 15
+
+
+def normalize_answer(answer):
+    """normalizeAnswer from lib/crossword/utils.ts."""
+    normalized = js_trim(answer).upper()
+    normalized = PARENTHETICAL_PATTERN.sub('', normalized)
+    normalized = PG_PATTERN.sub('', normalized)
+    normalized = PAGE_PATTERN.sub('', normalized)
+    return NON_LETTER_PATTERN.sub('', normalized)
+
+
+def is_single_word_answer(answer):
+    """isSingleWordAnswer from lib/crossword/utils.ts."""
+    normalized = normalize_answer(answer)
+    if not MIN_LENGTH <= len(normalized) <= MAX_LENGTH:
+        return False
+    without_parens = js_trim(PARENTHETICAL_PATTERN.sub('', js_trim(answer)))
+    return not SPACE_PATTERN.search(without_parens) and not SEPARATOR_PATTERN.search(without_parens)
+
+
+def letter_histogram(word):
+    counts = Counter(word)
+    return ''.join(str(min(counts[letter], 9)) for letter in ascii_uppercase)
+
+
+def build_candidate_index(entry, obob_dir=OBOB_DIR):
+    """The crossword candidate index for one division of the loaded corpus."""
+    books = entry['books']
+    candidates = []
+    by_length = {}
+    by_letter = {}
+    for doc_id, q in enumerate(entry['questions']):
+        if q.get('type') != 'content' or q.get('book_key') not in books:
+            continue
+        answer = q.get('answer')
+        if not isinstance(answer, str) or not is_single_word_answer(answer):
+            continue
+        word = normalize_answer(answer)
+        position = len(candidates)
+        candidate = {
+            'id': doc_id,
+            'answer': word,
+            'length': len(word),
+            'letters': letter_histogram(word),
+            'bookKey': q['book_key'],
+            'bookTitle': books[q['book_key']].get('title') or q['book_key'],
+            'text': q['text'],
+        }
+        if 'page' in q:
+            candidate['page'] = q['page']
+        candidates.append(candidate)
+        by_length.setdefault(str(len(word)), []).append(position)
+        for i, letter in enumerate(word):
+            by_letter.setdefault(f'{i}{letter}', []).append(position)
+
+    return {
+        'version': INDEX_VERSION,
+        'year': entry['year'],
+        'division': entry['division'],
+        'candidates': candidates,
+        'byLength': dict(sorted(by_length.items(), key=lambda item: int(item[0]))),
+        'byLetter': dict(sorted(by_letter.items(), key=lambda item: (int(item[0][:-1]), item[0][-1]))),
+        'corpus': {
+            'questions': len(entry['questions']),
+            'sha256': division_fingerprint(entry['year'], entry['division'], obob_dir),
+        },
+    }
+
+
+def candidate_index_path(year, division, candidates_dir=CANDIDATES_DIR):
+    return candidates_dir / year / f'{division}.json'
+
+
+def matching_candidates(index, pattern):
+    """Candidates fitting a pattern like "?A??E" ("?" is any letter)."""
+    positions = set(index['byLength'].get(str(len(pattern)), []))
+    for i, letter in enumerate(pattern.upper()):
+        if letter != '?':
+            positions &= set(index['byLetter'].get(f'{i}{letter}', []))
+    return [index['candidates'][p] for p in sorted(positions)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Count crossword clue candidates per book, or find answers by pattern.")
+    parser.add_argument('divisions', nargs='*', metavar='YEAR/DIVISION',
+                        help="divisions to report, e.g. 2025-2026/3-5 (default: all)")
+    parser.add_argument('--pattern', help='list answers fitting a pattern such as "?A??E"')
+    args = parser.parse_args()
+
+    year_divisions = [tuple(d.split('/', 1)) for d in args.divisions] or find_year_divisions()
+    for entry in load_corpus(year_divisions=year_divisions):
+        index = build_candidate_index(entry)
+        print(f"\n=== {entry['year']} / {entry['division']} ===")
+
+        if args.pattern:
+            matches = matching_candidates(index, args.pattern)
+            for candidate in matches:
+                print(f"  {candidate['answer']:<15} {candidate['bookKey']}: {candidate['text']}")
+            print(f"  {len(matches)} answers match {args.pattern.upper()}")
+            continue
+
+        per_book = Counter(candidate['bookKey'] for candidate in index['candidates'])
+        for book in entry['books'].values():
+            print(f"  {book['title']}: {per_book[book['book_key']]} clue candidates")
+        print(f"  TOTAL: {len(index['candidates'])} clue candidates")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+
+"""Summarize the stored state of CrosswordRoom Durable Objects.
+
+Each room is a SQLite file under
+cloudflare/.wrangler/state/v3/do/obob-crossword-realtime-CrosswordRoom/
+(local `wrangler dev` state, or an export in the same layout). Its _cf_KV
+table holds the values crossword-room.ts writes with storage.put, in V8's
+structured-clone serialization:
+
+- gameState: teamCode, year, division, puzzleDate, answers ("row,col" ->
+  letter), correctClues, startedAt, completedAt
+- puzzleClues: [clue id, clue] pairs for the room's puzzle
+- puzzleCluesDate
+
+The files are read in a process pool without creating anything next to
+them, decoded, and streamed into per-room rows, which are aggregated into
+completion by date and division, clue solve rates, and state size against
+cells filled.
+
+Storage doesn't record who was connected (players live in WebSocket
+attachments) or when each clue was solved, so team size and clue timelines
+can't be recovered from it. Every letter or delete rewrites the whole
+gameState value, so the estimated write volume of a room is roughly one
+gameState write per filled cell.
+"""
+
+import argparse
+import csv
+import os
+import shutil
+import sqlite3
+import struct
+import sys
+import tempfile
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from obob_corpus import REPO_ROOT
+
+ROOMS_DIR = REPO_ROOT / 'cloudflare' / '.wrangler' / 'state' / 'v3' / 'do' / 'obob-crossword-realtime-CrosswordRoom'
+
+CSV_COLUMNS = ['room', 'team_code', 'year', 'division', 'puzzle_date', 'clues', 'correct_clues', 'cells',
+               'filled_cells', 'correct_cells', 'completed', 'fill_seconds', 'game_state_bytes',
+               'puzzle_clues_bytes', 'file_bytes', 'estimated_write_bytes']
+
+
+# --- V8 value deserializer -------------------------------------------------------------
+
+class V8Reader:
+    """Decodes the subset of V8's ValueSerializer format that storage.put produces for JSON-like values."""
+
+    def __init__(self, data):
+        self.data = data
+        self.pos = 0
+        self.objects = []
+
+    def byte(self):
+        value = self.data[self.pos]
+        self.pos += 1
+        return value
+
+    def varint(self):
+        result = shift = 0
+        while True:
+            b = self.byte()
+            result |= (b & 0x7f) << shift
+            shift += 7
+            if not b & 0x80:
+                return result
+
+    def raw(self, length):
+        chunk = self.data[self.pos:self.pos + length]
+        if len(chunk) != length:
+            raise ValueError("truncated value")
+        self.pos += length
+        return chunk
+
+    def read(self):
+        if self.data[:1] == b'\xff':
+            self.pos = 1
+            self.varint()  # format version
+        return self.value()
+
+    def value(self):
+        tag = chr(self.byte())
+        while tag == '\0':  # padding
+            tag = chr(self.byte())
+        if tag == '_':
+            return None  # undefined
+        if tag == '0':
+            return None
+        if tag == 'T':
+            return True
+        if tag == 'F':
+            return False
+        if tag == 'I':
+            n = self.varint()
+            return (n >> 1) ^ -(n & 1)
+        if tag == 'U':
+            return self.varint()
+        if tag == 'N':
+            return struct.unpack('<d', self.raw(8))[0]
+        if tag == '"':
+            return self.raw(self.varint()).decode('latin-1')
+        if tag == 'c':
+            return self.raw(self.varint()).decode('utf-16-le')
+        if tag == 'S':
+            return self.raw(self.varint()).decode('utf-8')
+        if tag == 'D':
+            return struct.unpack('<d', self.raw(8))[0]
+        if tag == '^':
+            return self.objects[self.varint()]
+        if tag == 'o':
+            obj = {}
+            self.objects.append(obj)
+            self.properties(obj, '{')
+            return obj
+        if tag == 'A':
+            items = [None] * self.varint()
+            self.objects.append(items)
+            for i in range(len(items)):
+                if self.data[self.pos] == ord('-'):  # the hole
+                    self.pos += 1
+                    continue
+                items[i] = self.value()
+            self.properties({}, '$')
+            self.varint()  # length
+            return items
+        if tag == 'a':
+            length = self.varint()
+            sparse = {}
+            self.objects.append(sparse)
+            self.properties(sparse, '@')
+            self.varint()
+            return [sparse.get(str(i), sparse.get(i)) for i in range(length)]
+        if tag == ';':
+            pairs = {}
+            self.objects.append(pairs)
+            while self.data[self.pos] != ord(':'):
+                key = self.value()
+                pairs[key] = self.value()
+            self.pos += 1
+            self.varint()
+            return pairs
+        if tag == "'":
+            items = []
+            self.objects.append(items)
+            while self.data[self.pos] != ord(','):
+                items.append(self.value())
+            self.pos += 1
+            self.varint()
+            return items
+        raise ValueError(f"unsupported V8 tag {tag!r} at offset {self.pos - 1}")
+
+    def properties(self, obj, end_tag):
+        while self.data[self.pos] != ord(end_tag):
+            key = self.value()
+            obj[key] = self.value()
+        self.pos += 1
+        self.varint()  # number of properties
+
+
+def decode_value(data):
+    return V8Reader(bytes(data)).read()
+
+
+# --- Rooms -----------------------------------------------------------------------------
+
+def read_values(path):
+    """The room's _cf_KV table as {key: value bytes}, read without writing to or next to the file.
+
+    mode=ro alone still creates -wal and -shm files beside a WAL database,
+    so the file is opened immutable. A room with an uncheckpointed -wal is
+    copied (with its WAL) to a temporary directory and read from there.
+    """
+    path = Path(path)
+    wal = Path(f'{path}-wal')
+    with tempfile.TemporaryDirectory() if wal.exists() and wal.stat().st_size else nullcontext() as tmp:
+        if tmp:
+            shutil.copyfile(path, Path(tmp) / path.name)
+            shutil.copyfile(wal, Path(tmp) / wal.name)
+            conn = sqlite3.connect(Path(tmp) / path.name)
+        else:
+            conn = sqlite3.connect(f'{path.resolve().as_uri()}?mode=ro&immutable=1', uri=True)
+        try:
+            return dict(conn.execute('SELECT key, value FROM _cf_KV').fetchall())
+        except sqlite3.OperationalError:
+            return {}  # the room never stored anything
+        finally:
+            conn.close()
+
+
+def read_room(path):
+    """One room's row, or None for a database that never stored anything."""
+    path = Path(path)
+    file_bytes = sum(p.stat().st_size for p in (path, Path(f'{path}-wal')) if p.exists())
+    values = read_values(path)
+    if 'gameState' not in values:
+        return None
+
+    state = decode_value(values['gameState'])
+    clues = [clue for _, clue in decode_value(values['puzzleClues'])] if 'puzzleClues' in values else []
+    answers = state.get('answers') or {}
+
+    expected = {}
+    for clue in clues:
+        for i, letter in enumerate(clue['answer']):
+            row = clue['startRow'] + (i if clue['direction'] == 'down' else 0)
+            col = clue['startCol'] + (i if clue['direction'] == 'across' else 0)
+            expected[f'{row},{col}'] = letter.upper()
+    correct = set(state.get('correctClues') or [])
+
+    started, completed = state.get('startedAt'), state.get('completedAt')
+    state_bytes = len(values['gameState'])
+    return {
+        'room': path.stem,
+        'team_code': state.get('teamCode'),
+        'year': state.get('year'),
+        'division': state.get('division'),
+        'puzzle_date': state.get('puzzleDate'),
+        'clues': len(clues),
+        'correct_clues': len(correct),
+        'cells': len(expected),
+        'filled_cells': len(answers),
+        'correct_cells': sum(1 for cell, letter in answers.items() if expected.get(cell) == str(letter).upper()),
+        'completed': completed is not None,
+        'fill_seconds': round((completed - started) / 1000) if completed and started else None,
+        'game_state_bytes': state_bytes,
+        'puzzle_clues_bytes': len(values.get('puzzleClues') or b''),
+        'file_bytes': file_bytes,
+        # Each filled cell rewrote gameState, which grew by about one answer per write
+        'estimated_write_bytes': round(len(answers) * (state_bytes + max(0, state_bytes - 8 * len(answers))) / 2),
+        # Per clue: (clue id, answer length, solved), for the solve-rate table
+        'clue_results': [(clue['id'], len(clue['answer']), clue['id'] in correct) for clue in clues],
+    }
+
+
+def scan_rooms(rooms_dir=ROOMS_DIR, workers=None):
+    """Yield each room's row as it is read."""
+    paths = sorted(Path(rooms_dir).glob('*.sqlite'))
+    if not paths:
+        return
+    workers = workers or os.cpu_count()
+    if workers <= 1 or len(paths) < 8:
+        for path in paths:
+            room = read_room(path)
+            if room:
+                yield room
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for room in pool.map(read_room, paths, chunksize=16):
+            if room:
+                yield room
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0
+
+
+def print_report(rooms, empty):
+    print(f"🧩 {len(rooms)} rooms with stored state ({empty} empty databases)")
+    if not rooms:
+        return
+
+    print("\n📅 COMPLETION BY DATE")
+    print(f"  {'date':<12} {'division':<9} {'rooms':>6} {'completed':>10} {'avg cells filled':>17} {'median fill time':>17}")
+    groups = {}
+    for room in rooms:
+        groups.setdefault((room['puzzle_date'] or '', room['division'] or ''), []).append(room)
+    for (puzzle_date, division), group in sorted(groups.items()):
+        completed = [r for r in group if r['completed']]
+        times = [r['fill_seconds'] for r in completed if r['fill_seconds'] is not None]
+        filled = sum(r['filled_cells'] / r['cells'] for r in group if r['cells']) / len(group)
+        median = f"{percentile(times, 0.5) / 60:.1f} min" if times else '-'
+        print(f"  {puzzle_date:<12} {division:<9} {len(group):>6} {len(completed):>10} {filled:>16.0%} {median:>17}")
+
+    print("\n✏️  CLUE SOLVE RATE BY ANSWER LENGTH")
+    by_length = {}
+    for room in rooms:
+        for _, length, solved in room['clue_results']:
+            counts = by_length.setdefault(length, [0, 0])
+            counts[0] += solved
+            counts[1] += 1
+    for length, (solved, total) in sorted(by_length.items()):
+        print(f"  {length:>3} letters: {solved:>5}/{total:<5} solved ({solved / total:.0%})")
+
+    print("\n💾 STATE SIZE BY CELLS FILLED")
+    print(f"  {'cells filled':<14} {'rooms':>6} {'gameState p50':>14} {'p90':>8} {'max':>8} {'est. writes':>12}")
+    buckets = {}
+    for room in rooms:
+        low = room['filled_cells'] // 25 * 25
+        buckets.setdefault(low, []).append(room)
+    for low, group in sorted(buckets.items()):
+        sizes = [r['game_state_bytes'] for r in group]
+        writes = sum(r['estimated_write_bytes'] for r in group) / len(group)
+        print(f"  {f'{low}-{low + 24}':<14} {len(group):>6} {percentile(sizes, 0.5):>13,}B {percentile(sizes, 0.9):>7,}B "
+              f"{max(sizes):>7,}B {writes / 1024:>10.0f}KB")
+    files = [r['file_bytes'] for r in rooms]
+    print(f"\n  Database files: {sum(files) / 1024:.0f} KB total, median {percentile(files, 0.5) / 1024:.0f} KB, "
+          f"largest {max(files) / 1024:.0f} KB")
+    print("  (Team size isn't stored by the Durable Object, so rooms are grouped by cells filled.)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize CrosswordRoom Durable Object state, read-only.")
+    parser.add_argument('rooms_dir', nargs='?', default=str(ROOMS_DIR),
+                        help="directory of room .sqlite files (default: the local wrangler state)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="worker processes (default: one per CPU)")
+    parser.add_argument('--csv', metavar='PATH', help="also write one row per room to this CSV ('-' for stdout)")
+    args = parser.parse_args()
+
+    rooms_dir = Path(args.rooms_dir)
+    if not rooms_dir.is_dir():
+        raise SystemExit(f"❌ {rooms_dir} not found (run `wrangler dev` in cloudflare/ or export the state there)")
+    total = len(list(rooms_dir.glob('*.sqlite')))
+
+    writer = None
+    out = None
+    if args.csv:
+        out = sys.stdout if args.csv == '-' else open(args.csv, 'w', encoding='utf-8', newline='')
+        writer = csv.DictWriter(out, fieldnames=CSV_COLUMNS, extrasaction='ignore')
+        writer.writeheader()
+
+    rooms = []
+    for room in scan_rooms(rooms_dir, args.workers):
+        if writer:
+            writer.writerow(room)
+        rooms.append(room)
+    if out and out is not sys.stdout:
+        out.close()
+
+    if args.csv != '-':
+        print_report(rooms, total - len(rooms))
+        if args.csv:
+            print(f"\n📝 Room table written to {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
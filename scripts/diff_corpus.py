@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+
+"""Diff two snapshots of the question corpus record by record.
+
+A snapshot is either a directory (a public/obob tree, or a checkout that
+contains one) or a git revision, read with `git show`. Every questions.json
+file in each is loaded, and the two record lists are joined in linear time
+through dicts keyed on each record's normalized content (division, type and
+the text's match key from canonical.py):
+
+1. identical records in the same source file are paired
+2. what's left is paired by content in the same source file
+3. what's left is paired by content in any source file of the division:
+   these are moves
+4. what's left is paired by source, book, type, page and answer when
+   exactly one old and one new record share them: these are text edits
+
+Paired records are compared field by field; unpaired old records are
+deletions and unpaired new ones additions. Reordering within a file is not
+reported. The summary counts changes per source and per book, unlike a
+text diff of the JSON, where a moved record looks like a rewrite.
+"""
+
+import argparse
+import json
+import subprocess
+from pathlib import Path
+
+from canonical import match_key
+from obob_corpus import OBOB_DIR, REPO_ROOT
+
+OBOB_PATH = OBOB_DIR.relative_to(REPO_ROOT).as_posix()
+
+
+def parse_records(rel_path, data):
+    """Records for one questions.json file, given its path relative to the obob dir."""
+    parts = rel_path.split('/')
+    division = '/'.join(parts[:2])
+    source = '/'.join(parts[2:-1])
+    try:
+        questions = json.loads(data).get('questions', [])
+    except (json.JSONDecodeError, AttributeError):
+        print(f"⚠️  Skipping unreadable {rel_path}")
+        return []
+    return [{'division': division, 'source': source, 'index': i, 'question': q}
+            for i, q in enumerate(questions) if isinstance(q, dict)]
+
+
+def load_directory_snapshot(path):
+    """Records from every questions.json under a public/obob directory."""
+    path = Path(path)
+    if (path / OBOB_PATH).is_dir():
+        path = path / OBOB_PATH
+    records = []
+    for file in sorted(path.glob('*/*/**/questions.json')):
+        records.extend(parse_records(file.relative_to(path).as_posix(), file.read_bytes()))
+    return records
+
+
+def git(*args):
+    return subprocess.run(['git', '-C', str(REPO_ROOT), *args], check=True, capture_output=True).stdout
+
+
+def load_git_snapshot(rev):
+    """Records from every questions.json under public/obob at a git revision."""
+    names = git('ls-tree', '-r', '-z', '--name-only', rev, '--', OBOB_PATH).decode('utf-8').split('\0')
+    records = []
+    for name in sorted(n for n in names if n.endswith('/questions.json')):
+        records.extend(parse_records(name[len(OBOB_PATH) + 1:], git('show', f'{rev}:{name}')))
+    return records
+
+
+def load_snapshot(spec):
+    """A snapshot from a directory path or, failing that, a git revision."""
+    if Path(spec).is_dir():
+        return load_directory_snapshot(spec)
+    try:
+        git('rev-parse', '--verify', '--quiet', f'{spec}^{{commit}}')
+    except subprocess.CalledProcessError:
+        raise SystemExit(f"❌ {spec} is neither a directory nor a git revision")
+    return load_git_snapshot(spec)
+
+
+def content_key(record):
+    q = record['question']
+    return (record['division'], q.get('type'), match_key(q.get('text')))
+
+
+def exact_key(record):
+    return (record['division'], record['source'], repr(record['question']))
+
+
+def located_key(record):
+    return (record['source'],) + content_key(record)
+
+
+def edit_key(record):
+    q = record['question']
+    return (record['division'], record['source'], q.get('book_key'), q.get('type'), q.get('page'), q.get('answer'))
+
+
+def join(old, new, key, unique=False):
+    """Pair old and new records with equal keys; returns (pairs, old left, new left)."""
+    buckets = {}
+    for record in reversed(old):
+        buckets.setdefault(key(record), []).append(record)
+    if unique:
+        counts = {}
+        for record in new:
+            counts[key(record)] = counts.get(key(record), 0) + 1
+    pairs = []
+    new_left = []
+    for record in new:
+        k = key(record)
+        bucket = buckets.get(k)
+        if bucket and (not unique or (len(bucket) == 1 and counts[k] == 1)):
+            pairs.append((bucket.pop(), record))
+        else:
+            new_left.append(record)
+    old_left = [record for bucket in buckets.values() for record in reversed(bucket)]
+    return pairs, old_left, new_left
+
+
+def field_changes(old, new):
+    """(field, old value, new value) for each field that differs."""
+    fields = list(old) + [field for field in new if field not in old]
+    return [(field, old.get(field), new.get(field)) for field in fields if old.get(field) != new.get(field)]
+
+
+def diff_snapshots(old, new):
+    """Added, deleted, modified and moved records between two snapshots."""
+    pairs, old_left, new_left = join(old, new, exact_key)
+    located_pairs, old_left, new_left = join(old_left, new_left, located_key)
+    moved_pairs, old_left, new_left = join(old_left, new_left, content_key)
+    edit_pairs, old_left, new_left = join(old_left, new_left, edit_key, unique=True)
+
+    modified = []
+    moved = []
+    unchanged = 0
+    for a, b in pairs + located_pairs + moved_pairs + edit_pairs:
+        changes = field_changes(a['question'], b['question'])
+        if a['source'] != b['source']:
+            moved.append({'old': a, 'new': b, 'changes': changes})
+        elif changes:
+            modified.append({'old': a, 'new': b, 'changes': changes})
+        else:
+            unchanged += 1
+    return {
+        'added': new_left,
+        'deleted': old_left,
+        'modified': modified,
+        'moved': moved,
+        'unchanged': unchanged,
+    }
+
+
+def summarize(diff):
+    """Change counts per (division, source) and per (division, book)."""
+    by_source = {}
+    by_book = {}
+
+    def count(record, kind):
+        q = record['question']
+        for table, key in ((by_source, (record['division'], record['source'])),
+                           (by_book, (record['division'], q.get('book_key')))):
+            row = table.setdefault(key, {'added': 0, 'deleted': 0, 'modified': 0, 'moved in': 0, 'moved out': 0})
+            row[kind] += 1
+
+    for record in diff['added']:
+        count(record, 'added')
+    for record in diff['deleted']:
+        count(record, 'deleted')
+    for change in diff['modified']:
+        count(change['new'], 'modified')
+    for change in diff['moved']:
+        count(change['old'], 'moved out')
+        count(change['new'], 'moved in')
+    return by_source, by_book
+
+
+def describe(record):
+    q = record['question']
+    return f"{record['division']} {record['source']}#{record['index']} [{q.get('book_key')}] {str(q.get('text'))[:70]}"
+
+
+def print_table(title, table):
+    if not table:
+        return
+    columns = ['added', 'deleted', 'modified', 'moved in', 'moved out']
+    print(f"\n{title}")
+    print(f"  {'':50} " + ' '.join(f'{c:>9}' for c in columns))
+    for (division, name), row in sorted(table.items(), key=lambda item: (item[0][0], str(item[0][1]))):
+        print(f"  {(division + ' ' + str(name))[:50]:50} " + ' '.join(f'{row[c]:>9}' for c in columns))
+
+
+def to_json(diff):
+    def record(r):
+        return {'division': r['division'], 'source': r['source'], 'index': r['index'], 'question': r['question']}
+
+    def change(c):
+        return {'old': record(c['old']), 'new': record(c['new']),
+                'changes': [{'field': f, 'old': a, 'new': b} for f, a, b in c['changes']]}
+
+    return {
+        'added': [record(r) for r in diff['added']],
+        'deleted': [record(r) for r in diff['deleted']],
+        'modified': [change(c) for c in diff['modified']],
+        'moved': [change(c) for c in diff['moved']],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Diff two snapshots of the question corpus.")
+    parser.add_argument('old', help="a public/obob directory (or a checkout containing one), or a git revision")
+    parser.add_argument('new', nargs='?', default=str(OBOB_DIR), help="the same (default: the working tree)")
+    parser.add_argument('--division', action='append', help="only this division, e.g. 2025-2026/3-5 (can be repeated)")
+    parser.add_argument('--details', action='store_true', help="list every change")
+    parser.add_argument('--json', help="write the full diff as JSON to this path")
+    args = parser.parse_args()
+
+    old = load_snapshot(args.old)
+    new = load_snapshot(args.new)
+    if args.division:
+        old = [r for r in old if r['division'] in args.division]
+        new = [r for r in new if r['division'] in args.division]
+
+    diff = diff_snapshots(old, new)
+    print(f"🔍 {args.old} ({len(old):,} questions) → {args.new} ({len(new):,} questions)\n")
+    print(f"  ➕ added:    {len(diff['added']):,}")
+    print(f"  ➖ deleted:  {len(diff['deleted']):,}")
+    print(f"  ✏️  modified: {len(diff['modified']):,}")
+    print(f"  🔀 moved:    {len(diff['moved']):,}")
+
+    by_source, by_book = summarize(diff)
+    print_table("📁 BY SOURCE", by_source)
+    print_table("📚 BY BOOK", by_book)
+
+    if args.details:
+        for kind, sign in (('added', '+'), ('deleted', '-')):
+            for record in diff[kind]:
+                print(f"\n{sign} {describe(record)}")
+        for kind in ('modified', 'moved'):
+            for change in diff[kind]:
+                header = describe(change['new'])
+                if kind == 'moved':
+                    header = f"{change['old']['source']} → {header}"
+                print(f"\n~ {header}")
+                for field, a, b in change['changes']:
+                    print(f"    {field}: {json.dumps(a, ensure_ascii=False)} → {json.dumps(b, ensure_ascii=False)}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(to_json(diff), f, indent=2, ensure_ascii=False)
+            f.write('\n')
+        print(f"\n📝 Diff written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,395 @@
+"""Double Metaphone phonetic encoding.
+
+A port of Lawrence Philips' original C++ implementation. double_metaphone()
+returns a (primary, secondary) pair of keys, each up to four characters,
+for a single word. The secondary key covers alternate pronunciations
+(mostly non-English spellings) and equals the primary when there is none.
+"""
+
+import unicodedata
+
+VOWELS = frozenset('AEIOUY')
+
+
+def _prepare(word):
+    # Keep Ç and Ñ, which the algorithm handles, and strip other accents
+    prepared = []
+    for ch in word.upper():
+        if ch in 'ÇÑ':
+            prepared.append(ch)
+            continue
+        for part in unicodedata.normalize('NFKD', ch):
+            if 'A' <= part <= 'Z' or part == ' ':
+                prepared.append(part)
+    return ''.join(prepared)
+
+
+def double_metaphone(word):
+    """Return the (primary, secondary) Double Metaphone keys of a word."""
+    word = _prepare(word)
+    length = len(word)
+    if length == 0:
+        return '', ''
+    last = length - 1
+    # Pad like the original so lookahead past the end sees spaces
+    word += '     '
+
+    primary = []
+    secondary = []
+
+    def add(main, alternate=None):
+        primary.append(main)
+        secondary.append(main if alternate is None else alternate)
+
+    def string_at(start, size, *options):
+        if start < 0:
+            return False
+        return word[start:start + size] in options
+
+    def is_vowel(i):
+        return 0 <= i < length and word[i] in VOWELS
+
+    slavo_germanic = 'W' in word or 'K' in word or 'CZ' in word or 'WITZ' in word
+
+    pos = 0
+    if string_at(0, 2, 'GN', 'KN', 'PN', 'WR', 'PS'):
+        pos += 1
+    if word[0] == 'X':
+        add('S')
+        pos += 1
+
+    while pos < length and (len(''.join(primary)) < 4 or len(''.join(secondary)) < 4):
+        ch = word[pos]
+
+        if ch in VOWELS:
+            if pos == 0:
+                add('A')
+            pos += 1
+
+        elif ch == 'B':
+            add('P')
+            pos += 2 if word[pos + 1] == 'B' else 1
+
+        elif ch == 'Ç':
+            add('S')
+            pos += 1
+
+        elif ch == 'C':
+            if (pos > 1 and not is_vowel(pos - 2) and string_at(pos - 1, 3, 'ACH')
+                    and word[pos + 2] != 'I'
+                    and (word[pos + 2] != 'E' or string_at(pos - 2, 6, 'BACHER', 'MACHER'))):
+                add('K')
+                pos += 2
+            elif pos == 0 and string_at(pos, 6, 'CAESAR'):
+                add('S')
+                pos += 2
+            elif string_at(pos, 4, 'CHIA'):
+                add('K')
+                pos += 2
+            elif string_at(pos, 2, 'CH'):
+                if pos > 0 and string_at(pos, 4, 'CHAE'):
+                    add('K', 'X')
+                elif (pos == 0
+                        and (string_at(pos + 1, 5, 'HARAC', 'HARIS') or string_at(pos + 1, 3, 'HOR', 'HYM', 'HIA', 'HEM'))
+                        and not string_at(0, 5, 'CHORE')):
+                    add('K')
+                elif (string_at(0, 4, 'VAN ', 'VON ') or string_at(0, 3, 'SCH')
+                        or string_at(pos - 2, 6, 'ORCHES', 'ARCHIT', 'ORCHID')
+                        or string_at(pos + 2, 1, 'T', 'S')
+                        or ((string_at(pos - 1, 1, 'A', 'O', 'U', 'E') or pos == 0)
+                            and string_at(pos + 2, 1, 'L', 'R', 'N', 'M', 'B', 'H', 'F', 'V', 'W', ' '))):
+                    add('K')
+                elif pos > 0:
+                    if string_at(0, 2, 'MC'):
+                        add('K')
+                    else:
+                        add('X', 'K')
+                else:
+                    add('X')
+                pos += 2
+            elif string_at(pos, 2, 'CZ') and not string_at(pos - 2, 4, 'WICZ'):
+                add('S', 'X')
+                pos += 2
+            elif string_at(pos + 1, 3, 'CIA'):
+                add('X')
+                pos += 3
+            elif string_at(pos, 2, 'CC') and not (pos == 1 and word[0] == 'M'):
+                if string_at(pos + 2, 1, 'I', 'E', 'H') and not string_at(pos + 2, 2, 'HU'):
+                    if (pos == 1 and word[pos - 1] == 'A') or string_at(pos - 1, 5, 'UCCEE', 'UCCES'):
+                        add('KS')
+                    else:
+                        add('X')
+                    pos += 3
+                else:
+                    add('K')
+                    pos += 2
+            elif string_at(pos, 2, 'CK', 'CG', 'CQ'):
+                add('K')
+                pos += 2
+            elif string_at(pos, 2, 'CI', 'CE', 'CY'):
+                if string_at(pos, 3, 'CIO', 'CIE', 'CIA'):
+                    add('S', 'X')
+                else:
+                    add('S')
+                pos += 2
+            else:
+                add('K')
+                if string_at(pos + 1, 2, ' C', ' Q', ' G'):
+                    pos += 3
+                elif string_at(pos + 1, 1, 'C', 'K', 'Q') and not string_at(pos + 1, 2, 'CE', 'CI'):
+                    pos += 2
+                else:
+                    pos += 1
+
+        elif ch == 'D':
+            if string_at(pos, 2, 'DG'):
+                if string_at(pos + 2, 1, 'I', 'E', 'Y'):
+                    add('J')
+                    pos += 3
+                else:
+                    add('TK')
+                    pos += 2
+            elif string_at(pos, 2, 'DT', 'DD'):
+                add('T')
+                pos += 2
+            else:
+                add('T')
+                pos += 1
+
+        elif ch == 'F':
+            add('F')
+            pos += 2 if word[pos + 1] == 'F' else 1
+
+        elif ch == 'G':
+            if word[pos + 1] == 'H':
+                if pos > 0 and not is_vowel(pos - 1):
+                    add('K')
+                elif pos == 0:
+                    add('J' if word[pos + 2] == 'I' else 'K')
+                elif ((pos > 1 and string_at(pos - 2, 1, 'B', 'H', 'D'))
+                        or (pos > 2 and string_at(pos - 3, 1, 'B', 'H', 'D'))
+                        or (pos > 3 and string_at(pos - 4, 1, 'B', 'H'))):
+                    pass
+                elif pos > 2 and word[pos - 1] == 'U' and string_at(pos - 3, 1, 'C', 'G', 'L', 'R', 'T'):
+                    add('F')
+                elif pos > 0 and word[pos - 1] != 'I':
+                    add('K')
+                pos += 2
+            elif word[pos + 1] == 'N':
+                if pos == 1 and is_vowel(0) and not slavo_germanic:
+                    add('KN', 'N')
+                elif not string_at(pos + 2, 2, 'EY') and word[pos + 1] != 'Y' and not slavo_germanic:
+                    add('N', 'KN')
+                else:
+                    add('KN')
+                pos += 2
+            elif string_at(pos + 1, 2, 'LI') and not slavo_germanic:
+                add('KL', 'L')
+                pos += 2
+            elif pos == 0 and (word[pos + 1] == 'Y' or string_at(pos + 1, 2, 'ES', 'EP', 'EB', 'EL', 'EY', 'IB', 'IL',
+                                                                  'IN', 'IE', 'EI', 'ER')):
+                add('K', 'J')
+                pos += 2
+            elif ((string_at(pos + 1, 2, 'ER') or word[pos + 1] == 'Y')
+                    and not string_at(0, 6, 'DANGER', 'RANGER', 'MANGER')
+                    and not string_at(pos - 1, 1, 'E', 'I')
+                    and not string_at(pos - 1, 3, 'RGY', 'OGY')):
+                add('K', 'J')
+                pos += 2
+            elif string_at(pos + 1, 1, 'E', 'I', 'Y') or string_at(pos - 1, 4, 'AGGI', 'OGGI'):
+                if string_at(0, 4, 'VAN ', 'VON ') or string_at(0, 3, 'SCH') or string_at(pos + 1, 2, 'ET'):
+                    add('K')
+                elif string_at(pos + 1, 4, 'IER '):
+                    add('J')
+                else:
+                    add('J', 'K')
+                pos += 2
+            else:
+                add('K')
+                pos += 2 if word[pos + 1] == 'G' else 1
+
+        elif ch == 'H':
+            if (pos == 0 or is_vowel(pos - 1)) and is_vowel(pos + 1):
+                add('H')
+                pos += 2
+            else:
+                pos += 1
+
+        elif ch == 'J':
+            if string_at(pos, 4, 'JOSE') or string_at(0, 4, 'SAN '):
+                if (pos == 0 and word[pos + 4] == ' ') or string_at(0, 4, 'SAN '):
+                    add('H')
+                else:
+                    add('J', 'H')
+                pos += 1
+                continue
+            if pos == 0 and not string_at(pos, 4, 'JOSE'):
+                add('J', 'A')
+            elif is_vowel(pos - 1) and not slavo_germanic and word[pos + 1] in 'AO':
+                add('J', 'H')
+            elif pos == last:
+                add('J', '')
+            elif (not string_at(pos + 1, 1, 'L', 'T', 'K', 'S', 'N', 'M', 'B', 'Z')
+                    and not string_at(pos - 1, 1, 'S', 'K', 'L')):
+                add('J')
+            pos += 2 if word[pos + 1] == 'J' else 1
+
+        elif ch == 'K':
+            add('K')
+            pos += 2 if word[pos + 1] == 'K' else 1
+
+        elif ch == 'L':
+            if word[pos + 1] == 'L':
+                if ((pos == length - 3 and string_at(pos - 1, 4, 'ILLO', 'ILLA', 'ALLE'))
+                        or ((string_at(last - 1, 2, 'AS', 'OS') or string_at(last, 1, 'A', 'O'))
+                            and string_at(pos - 1, 4, 'ALLE'))):
+                    add('L', '')
+                else:
+                    add('L')
+                pos += 2
+            else:
+                add('L')
+                pos += 1
+
+        elif ch == 'M':
+            add('M')
+            if ((string_at(pos - 1, 3, 'UMB') and (pos + 1 == last or string_at(pos + 2, 2, 'ER')))
+                    or word[pos + 1] == 'M'):
+                pos += 2
+            else:
+                pos += 1
+
+        elif ch == 'N':
+            add('N')
+            pos += 2 if word[pos + 1] == 'N' else 1
+
+        elif ch == 'Ñ':
+            add('N')
+            pos += 1
+
+        elif ch == 'P':
+            if word[pos + 1] == 'H':
+                add('F')
+                pos += 2
+            else:
+                add('P')
+                pos += 2 if string_at(pos + 1, 1, 'P', 'B') else 1
+
+        elif ch == 'Q':
+            add('K')
+            pos += 2 if word[pos + 1] == 'Q' else 1
+
+        elif ch == 'R':
+            if (pos == last and not slavo_germanic and string_at(pos - 2, 2, 'IE')
+                    and not string_at(pos - 4, 2, 'ME', 'MA')):
+                add('', 'R')
+            else:
+                add('R')
+            pos += 2 if word[pos + 1] == 'R' else 1
+
+        elif ch == 'S':
+            if string_at(pos - 1, 3, 'ISL', 'YSL'):
+                pos += 1
+            elif pos == 0 and string_at(pos, 5, 'SUGAR'):
+                add('X', 'S')
+                pos += 1
+            elif string_at(pos, 2, 'SH'):
+                if string_at(pos + 1, 4, 'HEIM', 'HOEK', 'HOLM', 'HOLZ'):
+                    add('S')
+                else:
+                    add('X')
+                pos += 2
+            elif string_at(pos, 3, 'SIO', 'SIA') or string_at(pos, 4, 'SIAN'):
+                if slavo_germanic:
+                    add('S')
+                else:
+                    add('S', 'X')
+                pos += 3
+            elif (pos == 0 and string_at(pos + 1, 1, 'M', 'N', 'L', 'W')) or string_at(pos + 1, 1, 'Z'):
+                add('S', 'X')
+                pos += 2 if string_at(pos + 1, 1, 'Z') else 1
+            elif string_at(pos, 2, 'SC'):
+                if word[pos + 2] == 'H':
+                    if string_at(pos + 3, 2, 'OO', 'ER', 'EN', 'UY', 'ED', 'EM'):
+                        if string_at(pos + 3, 2, 'ER', 'EN'):
+                            add('X', 'SK')
+                        else:
+                            add('SK')
+                    elif pos == 0 and not is_vowel(3) and word[3] != 'W':
+                        add('X', 'S')
+                    else:
+                        add('X')
+                elif string_at(pos + 2, 1, 'I', 'E', 'Y'):
+                    add('S')
+                else:
+                    add('SK')
+                pos += 3
+            else:
+                if pos == last and string_at(pos - 2, 2, 'AI', 'OI'):
+                    add('', 'S')
+                else:
+                    add('S')
+                pos += 2 if string_at(pos + 1, 1, 'S', 'Z') else 1
+
+        elif ch == 'T':
+            if string_at(pos, 4, 'TION'):
+                add('X')
+                pos += 3
+            elif string_at(pos, 3, 'TIA', 'TCH'):
+                add('X')
+                pos += 3
+            elif string_at(pos, 2, 'TH') or string_at(pos, 3, 'TTH'):
+                if string_at(pos + 2, 2, 'OM', 'AM') or string_at(0, 4, 'VAN ', 'VON ') or string_at(0, 3, 'SCH'):
+                    add('T')
+                else:
+                    add('0', 'T')
+                pos += 2
+            else:
+                add('T')
+                pos += 2 if string_at(pos + 1, 1, 'T', 'D') else 1
+
+        elif ch == 'V':
+            add('F')
+            pos += 2 if word[pos + 1] == 'V' else 1
+
+        elif ch == 'W':
+            if string_at(pos, 2, 'WR'):
+                add('R')
+                pos += 2
+                continue
+            if pos == 0 and (is_vowel(pos + 1) or string_at(pos, 2, 'WH')):
+                if is_vowel(pos + 1):
+                    add('A', 'F')
+                else:
+                    add('A')
+            if ((pos == last and is_vowel(pos - 1))
+                    or string_at(pos - 1, 5, 'EWSKI', 'EWSKY', 'OWSKI', 'OWSKY')
+                    or string_at(0, 3, 'SCH')):
+                add('', 'F')
+                pos += 1
+            elif string_at(pos, 4, 'WICZ', 'WITZ'):
+                add('TS', 'FX')
+                pos += 4
+            else:
+                pos += 1
+
+        elif ch == 'X':
+            if not (pos == last and (string_at(pos - 3, 3, 'IAU', 'EAU') or string_at(pos - 2, 2, 'AU', 'OU'))):
+                add('KS')
+            pos += 2 if string_at(pos + 1, 1, 'C', 'X') else 1
+
+        elif ch == 'Z':
+            if word[pos + 1] == 'H':
+                add('J')
+                pos += 2
+                continue
+            if string_at(pos + 1, 2, 'ZO', 'ZI', 'ZA') or (slavo_germanic and pos > 0 and word[pos - 1] != 'T'):
+                add('S', 'TS')
+            else:
+                add('S')
+            pos += 2 if word[pos + 1] == 'Z' else 1
+
+        else:
+            pos += 1
+
+    return ''.join(primary)[:4], ''.join(secondary)[:4]
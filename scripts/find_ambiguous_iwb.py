@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+
+"""Find in-which-book questions that could point to more than one book.
+
+For each division, every question (both types) is turned into a TF-IDF
+vector, and each book gets a centroid: the sum of its questions' vectors.
+Each in-which-book question is scored against every book's centroid by
+cosine similarity. Its own book is scored leave-one-out, so the question
+doesn't vouch for itself. A question is flagged as ambiguous when another
+book matches it clearly better than its own, and as generic when three or
+more books match it about equally well. Stop words and the usual
+"does a character..." phrasing are ignored.
+
+Vectors are stored as CSR arrays and scored with vectorized NumPy
+products, so the whole corpus takes a couple of seconds. Models are cached
+under .obob-cache/ keyed by the division's data, and --new scores fresh
+submissions against the cached model without rebuilding it.
+"""
+
+import argparse
+import io
+import json
+import math
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+from obob_cache import STATE_DIR
+from obob_corpus import OBOB_DIR, division_fingerprint, find_year_divisions, load_corpus
+from search_questions import tokenize
+
+# Bump when tokenization or weighting changes so cached models are rebuilt
+MODEL_VERSION = 2
+MODEL_DIR = STATE_DIR / 'iwb-ambiguity'
+
+DEFAULT_MIN_RIVAL = 0.1
+DEFAULT_RATIO = 1.5
+GENERIC_BAND = 0.8
+GENERIC_BOOKS = 3
+
+STOP_WORDS = frozenset('''
+a about after an and another any are as at be been before being but by can could did do does done for from
+had has have having he her here him his how i if in into is it its me my no not of on one or other our out
+over person people she so someone somebody than that the their them then there these they this those to up
+was we were what when where which who whom whose why will with would you your s t character characters
+'''.split())
+
+
+def terms(text):
+    """Tokens of text that carry meaning for book matching."""
+    return [token for token in tokenize(text) if token not in STOP_WORDS]
+
+
+# --- Sparse vectors -------------------------------------------------------------
+
+def csr_rows(token_lists, vocabulary, idf):
+    """L2-normalized sublinear TF-IDF rows as (indptr, indices, data)."""
+    indptr = [0]
+    indices = []
+    data = []
+    for tokens in token_lists:
+        counts = Counter(vocabulary[t] for t in tokens if t in vocabulary)
+        for term, count in sorted(counts.items()):
+            indices.append(term)
+            data.append((1 + math.log(count)) * idf[term])
+        indptr.append(len(indices))
+    indptr = np.array(indptr, dtype=np.int64)
+    indices = np.array(indices, dtype=np.int64)
+    data = np.array(data, dtype=np.float64)
+
+    row_ids = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+    norms = np.sqrt(np.bincount(row_ids, weights=data ** 2, minlength=len(indptr) - 1))
+    data /= np.where(norms > 0, norms, 1)[row_ids]
+    return indptr, indices, data
+
+
+def csr_dot_dense(indptr, indices, data, dense):
+    """CSR matrix times a dense (terms x k) matrix."""
+    result = np.zeros((len(indptr) - 1, dense.shape[1]))
+    nonempty = np.diff(indptr) > 0
+    if nonempty.any():
+        products = data[:, None] * dense[indices]
+        result[nonempty] = np.add.reduceat(products, indptr[:-1][nonempty], axis=0)
+    return result
+
+
+# --- Model ----------------------------------------------------------------------
+
+def build_model(entry):
+    """Vocabulary, IDF weights and per-book centroid sums for one division."""
+    book_keys = sorted(entry['books'])
+    book_index = {key: i for i, key in enumerate(book_keys)}
+
+    # Duplicate questions across sources would pull the centroid toward
+    # themselves, so each distinct (book, text) counts once
+    documents = {}
+    for q in entry['questions']:
+        b = book_index.get(q.get('book_key'))
+        if b is None:
+            continue
+        tokens = terms(q.get('text') or '')
+        if q.get('type') == 'content' and isinstance(q.get('answer'), str):
+            tokens += terms(q['answer'])
+        documents.setdefault((b, ' '.join(tokens)), tokens)
+
+    doc_books = np.array([b for b, _ in documents], dtype=np.int64)
+    token_lists = list(documents.values())
+
+    document_frequency = Counter()
+    for tokens in token_lists:
+        document_frequency.update(set(tokens))
+    vocabulary_terms = sorted(document_frequency)
+    vocabulary = {term: i for i, term in enumerate(vocabulary_terms)}
+    n = len(token_lists)
+    idf = np.array([math.log((1 + n) / (1 + document_frequency[t])) + 1 for t in vocabulary_terms])
+
+    indptr, indices, data = csr_rows(token_lists, vocabulary, idf)
+    sums = np.zeros((len(book_keys), len(vocabulary_terms)))
+    np.add.at(sums, (np.repeat(doc_books, np.diff(indptr)), indices), data)
+
+    return {
+        'book_keys': book_keys,
+        'terms': vocabulary_terms,
+        'vocabulary': vocabulary,
+        'idf': idf,
+        'sums': sums,
+        'documents': {key: i for i, key in enumerate(documents)},
+    }
+
+
+def save_model(model, path, fingerprint):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    buffer = io.BytesIO()
+    documents = list(model['documents'])
+    np.savez_compressed(
+        buffer,
+        meta=np.array(json.dumps({
+            'version': MODEL_VERSION,
+            'fingerprint': fingerprint,
+            'book_keys': model['book_keys'],
+            'terms': model['terms'],
+            'documents': [[b, text] for b, text in documents],
+        })),
+        idf=model['idf'],
+        sums=model['sums'],
+    )
+    tmp_path = path.with_suffix('.tmp')
+    tmp_path.write_bytes(buffer.getvalue())
+    tmp_path.replace(path)
+
+
+def load_model(path, fingerprint):
+    try:
+        with np.load(path) as saved:
+            meta = json.loads(str(saved['meta']))
+            if meta.get('version') != MODEL_VERSION or meta.get('fingerprint') != fingerprint:
+                return None
+            return {
+                'book_keys': meta['book_keys'],
+                'terms': meta['terms'],
+                'vocabulary': {term: i for i, term in enumerate(meta['terms'])},
+                'idf': saved['idf'],
+                'sums': saved['sums'],
+                'documents': {(b, text): i for i, (b, text) in enumerate(meta['documents'])},
+            }
+    except (FileNotFoundError, ValueError, KeyError):
+        return None
+
+
+def get_model(year, division, use_cache=True, obob_dir=OBOB_DIR):
+    """Return (model, entry or None), loading from the cache when the data is unchanged."""
+    path = MODEL_DIR / f'{year}-{division}.npz'
+    fingerprint = division_fingerprint(year, division, obob_dir)
+    if use_cache:
+        model = load_model(path, fingerprint)
+        if model is not None:
+            return model, None
+    entry = load_corpus(obob_dir, [(year, division)])[0]
+    model = build_model(entry)
+    if use_cache:
+        save_model(model, path, fingerprint)
+    return model, entry
+
+
+# --- Scoring --------------------------------------------------------------------
+
+def score_questions(model, questions, in_model=True):
+    """Cosine scores of questions against every book centroid.
+
+    Returns an (n, books) array. With in_model, questions that are part of
+    the model have their own contribution removed from their book's
+    centroid first.
+    """
+    book_index = {key: i for i, key in enumerate(model['book_keys'])}
+    token_lists = [terms(q.get('text') or '') for q in questions]
+    indptr, indices, data = csr_rows(token_lists, model['vocabulary'], model['idf'])
+
+    sums = model['sums']
+    sum_norms2 = (sums ** 2).sum(axis=1)
+    dots = csr_dot_dense(indptr, indices, data, sums.T)
+    scores = dots / np.sqrt(np.where(sum_norms2 > 0, sum_norms2, 1))
+
+    if in_model:
+        own_books = np.array([book_index.get(q.get('book_key'), -1) for q in questions])
+        # Each question's own document vector (question text only for IWB)
+        self_dots = np.zeros(len(questions))
+        in_centroid = np.zeros(len(questions), dtype=bool)
+        for i, q in enumerate(questions):
+            if (own_books[i], ' '.join(token_lists[i])) in model['documents']:
+                self_dots[i] = (data[indptr[i]:indptr[i + 1]] ** 2).sum()
+                in_centroid[i] = True
+        # Only questions that were added to their book's centroid are taken out of it
+        rows = np.flatnonzero((own_books >= 0) & in_centroid)
+        own = own_books[rows]
+        own_dot = dots[rows, own] - self_dots[rows]
+        own_norm2 = sum_norms2[own] - 2 * dots[rows, own] + self_dots[rows]
+        scores[rows, own] = own_dot / np.sqrt(np.where(own_norm2 > 1e-12, own_norm2, 1))
+    return scores
+
+
+def find_ambiguous(model, questions, in_model=True, min_rival=DEFAULT_MIN_RIVAL, ratio=DEFAULT_RATIO, rivals=3):
+    """Flag the in-which-book questions whose text doesn't single out their book.
+
+    Ambiguous: another book scores at least min_rival and at least ratio
+    times the question's own book. Generic: the best score is at least
+    min_rival and GENERIC_BOOKS or more books score within GENERIC_BAND of it.
+    """
+    book_keys = model['book_keys']
+    book_index = {key: i for i, key in enumerate(book_keys)}
+    iwb = [q for q in questions if q.get('type') == 'in-which-book' and q.get('book_key') in book_index]
+    if not iwb:
+        return []
+    scores = score_questions(model, iwb, in_model)
+
+    findings = []
+    for i, q in enumerate(iwb):
+        own_book = book_index[q['book_key']]
+        own_score = scores[i, own_book]
+        others = np.delete(np.arange(len(book_keys)), own_book)
+        order = others[np.argsort(-scores[i, others], kind='stable')]
+        best_other = scores[i, order[0]] if len(order) else 0.0
+
+        top_score = max(own_score, best_other)
+        if best_other >= min_rival and best_other >= own_score * ratio:
+            reason = 'ambiguous'
+        elif top_score >= min_rival and (scores[i] >= GENERIC_BAND * top_score).sum() >= GENERIC_BOOKS:
+            reason = 'generic'
+        else:
+            continue
+        findings.append({
+            'reason': reason,
+            'book_key': q['book_key'],
+            'text': q.get('text', ''),
+            'source': (q.get('source') or {}).get('name'),
+            'own_score': round(float(own_score), 4),
+            'rivals': [{'book_key': book_keys[b], 'score': round(float(scores[i, b]), 4)}
+                       for b in order[:rivals] if scores[i, b] > 0],
+        })
+    findings.sort(key=lambda f: (f['reason'] != 'ambiguous',
+                                 -(f['rivals'][0]['score'] - f['own_score']) if f['rivals'] else 0))
+    return findings
+
+
+# --- CLI --------------------------------------------------------------------
+
+def load_new_questions(path):
+    """Read submissions from a questions.json-style file or JSON Lines."""
+    text = Path(path).read_text(encoding='utf-8')
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
+    return data.get('questions', []) if isinstance(data, dict) else data
+
+
+def print_findings(year, division, findings, checked, limit):
+    ambiguous = sum(1 for f in findings if f['reason'] == 'ambiguous')
+    generic = len(findings) - ambiguous
+    print(f"\n📚 {year}/{division}: {checked:,} in-which-book questions, "
+          f"{ambiguous:,} ambiguous, {generic:,} generic")
+    for f in findings[:limit]:
+        rivals = ', '.join(f"{r['book_key']} {r['score']:.2f}" for r in f['rivals']) or 'none'
+        print(f"  [{f['reason']}] {f['book_key']} {f['own_score']:.2f} vs {rivals}")
+        print(f"      {f['text']}")
+    if len(findings) > limit:
+        print(f"  ... and {len(findings) - limit:,} more")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Flag in-which-book questions that match several books.")
+    parser.add_argument('divisions', nargs='*', metavar='YEAR/DIVISION',
+                        help="divisions to check, e.g. 2025-2026/3-5 (default: all)")
+    parser.add_argument('--new', metavar='FILE',
+                        help="score the questions in FILE (questions.json or JSON Lines) against one division")
+    parser.add_argument('--min-rival', type=float, default=DEFAULT_MIN_RIVAL,
+                        help=f"lowest rival score worth flagging (default: {DEFAULT_MIN_RIVAL})")
+    parser.add_argument('--ratio', type=float, default=DEFAULT_RATIO,
+                        help=f"flag when a rival scores this many times the own book (default: {DEFAULT_RATIO})")
+    parser.add_argument('--limit', type=int, default=20, help="findings to show per division (default: 20)")
+    parser.add_argument('--format', choices=('text', 'json'), default='text')
+    parser.add_argument('--no-cache', action='store_true', help="rebuild models without reading or writing the cache")
+    args = parser.parse_args()
+
+    year_divisions = [tuple(d.split('/', 1)) for d in args.divisions] or find_year_divisions()
+    if args.new and len(year_divisions) != 1:
+        print("--new needs exactly one YEAR/DIVISION")
+        sys.exit(2)
+
+    start_time = time.perf_counter()
+    results = []
+    for year, division in year_divisions:
+        model, entry = get_model(year, division, use_cache=not args.no_cache)
+        if args.new:
+            questions = load_new_questions(args.new)
+            findings = find_ambiguous(model, questions, in_model=False, min_rival=args.min_rival, ratio=args.ratio)
+        else:
+            if entry is None:
+                entry = load_corpus(year_divisions=[(year, division)])[0]
+            questions = entry['questions']
+            findings = find_ambiguous(model, questions, min_rival=args.min_rival, ratio=args.ratio)
+        checked = sum(1 for q in questions if q.get('type') == 'in-which-book')
+        results.append({'year': year, 'division': division, 'checked': checked, 'findings': findings})
+
+    elapsed = time.perf_counter() - start_time
+    if args.format == 'json':
+        print(json.dumps({'elapsed_ms': round(elapsed * 1000), 'divisions': results}, indent=2, ensure_ascii=False))
+        return
+
+    print("=" * 80)
+    print("IN-WHICH-BOOK AMBIGUITY REPORT")
+    print("=" * 80)
+    for result in results:
+        print_findings(result['year'], result['division'], result['findings'], result['checked'], args.limit)
+    print(f"\nChecked {sum(r['checked'] for r in results):,} questions in {elapsed * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
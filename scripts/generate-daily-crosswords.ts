@@ -9,6 +9,7 @@
 
 import fs from "fs/promises";
 import path from "path";
+import { hasArchivedPuzzle } from "@/lib/daily-crossword/archive";
 import { generateDailyPuzzle, getPacificDateString } from "@/lib/daily-crossword/generate-daily";
 import type { DailyPuzzle } from "@/lib/daily-crossword/types";
 
@@ -21,6 +22,9 @@ function getPuzzlePath(year: string, division: string, dateString: string): stri
 }
 
 async function puzzleExists(year: string, division: string, dateString: string): Promise<boolean> {
+  if (await hasArchivedPuzzle(year, division, dateString)) {
+    return true;
+  }
   try {
     await fs.access(getPuzzlePath(year, division, dateString));
     return true;
@@ -89,6 +93,7 @@ async function main() {
   console.log(`  Generated: ${generated} new puzzles`);
   console.log(`  Skipped: ${skipped} existing puzzles`);
   console.log(`Output: ${OUTPUT_DIR}`);
+  console.log("Run `python3 scripts/crossword_archive.py --prune` to pack the new puzzles.");
 }
 
 main().catch(console.error);
@@ -0,0 +1,423 @@
+#!/usr/bin/env python3
+
+"""Batch-generate daily crossword puzzles for a whole season.
+
+Writes the same content/daily-crosswords/<year>/<division>/crossword-<date>.json
+files as generate-daily-crosswords.ts, generating every division and date
+across a process pool. Each puzzle is seeded with "<year>:<division>:<date>"
+and picks its 40 candidate clues with the seeded_random.py port of
+seeded-random.ts, so the same date always gives the same candidates and,
+because the layout search is deterministic too, the same puzzle.
+
+The layout search mirrors lib/crossword/generator.ts: every attempt shuffles
+the candidates and takes a subset around the target size (drawing the same
+random numbers as the TS generator), lays it out and keeps the densest
+layout by the same calculateDensityScore weighting. Layouts are built here
+on a NumPy letter grid rather than by crossword-layout-generator: each word
+goes where it crosses the most existing letters while growing the grid
+least, with every candidate placement checked at once. Grids never grow
+past 24 cells, where generator.ts lets very dense grids run 10% over.
+A layout takes a few milliseconds, so more attempts per day (--attempts)
+are cheap.
+
+Existing puzzles, as files or in the division's season.pack archive (see
+crossword_archive.py), are never overwritten.
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from crossword_archive import packed_dates
+from crossword_candidates import build_candidate_index
+from obob_corpus import REPO_ROOT, find_year_divisions, load_corpus
+from seeded_random import create_seeded_random, seeded_select_distributed, seeded_shuffle
+
+OUTPUT_DIR = REPO_ROOT / 'content' / 'daily-crosswords'
+PACIFIC = ZoneInfo('America/Los_Angeles')
+
+# DAILY_OPTIONS in lib/daily-crossword/generate-daily.ts
+TARGET_WORDS = 20
+MAX_GRID_SIZE = 24
+MIN_WORDS = 14
+MAX_ATTEMPTS = 50
+
+ACROSS = 'across'
+DOWN = 'down'
+
+# Placement preference: each crossing is worth this many cells of grid growth
+CROSSING_WEIGHT = 4
+
+
+# --- Layout -----------------------------------------------------------------------
+
+class Layout:
+    """Words placed on a letter grid (0 = empty, 1-26 = A-Z).
+
+    The grid is kept twice, as is and transposed, so a down placement is an
+    across placement on the second copy and both are checked in one pass.
+    It is padded by one empty cell on every side, so neighbour checks never
+    fall off the edge.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        size = 2 * max_size + 2
+        self.letters = np.zeros((2, size, size), dtype=np.uint8)
+        # used[0]: cells in across words; used[1]: cells in down words (transposed)
+        self.used = np.zeros((2, size, size), dtype=bool)
+        self.words = []  # (answer, row, col, orientation) in grid coordinates
+        self.bounds = None  # (top, bottom, left, right), inclusive
+        # Every filled cell, so crossings are found without scanning the grid
+        self.cell_rows = np.zeros(0, dtype=np.intp)
+        self.cell_cols = np.zeros(0, dtype=np.intp)
+        self.cell_codes = np.zeros(0, dtype=np.uint8)
+
+    def place(self, answer, codes, row, col, orientation):
+        offsets = np.arange(len(codes))
+        rows = row + offsets if orientation == DOWN else np.full(len(codes), row)
+        cols = col + offsets if orientation == ACROSS else np.full(len(codes), col)
+        new_cells = self.letters[0, rows, cols] == 0
+        self.cell_rows = np.concatenate([self.cell_rows, rows[new_cells]])
+        self.cell_cols = np.concatenate([self.cell_cols, cols[new_cells]])
+        self.cell_codes = np.concatenate([self.cell_codes, codes[new_cells]])
+        self.letters[0, rows, cols] = codes
+        self.letters[1, cols, rows] = codes
+        if orientation == ACROSS:
+            self.used[0, rows, cols] = True
+        else:
+            self.used[1, cols, rows] = True
+        self.words.append((answer, row, col, orientation))
+        bottom, right = int(rows[-1]), int(cols[-1])
+        if self.bounds is None:
+            self.bounds = (row, bottom, col, right)
+        else:
+            top, old_bottom, left, old_right = self.bounds
+            self.bounds = (min(top, row), max(old_bottom, bottom), min(left, col), max(old_right, right))
+
+    def best_placement(self, codes):
+        """The best (row, col, orientation) crossing the grid, or None."""
+        length = len(codes)
+        size = self.letters.shape[2]
+
+        # Start cells that put some letter of the word on a matching grid letter,
+        # first across (on the grid) then down (on the transposed grid)
+        cell, offset = np.nonzero(self.cell_codes[:, None] == codes)
+        cell_rows, cell_cols = self.cell_rows[cell], self.cell_cols[cell]
+        grids = np.repeat([0, 1], len(cell))
+        rows = np.concatenate([cell_rows, cell_cols])
+        cols = np.concatenate([cell_cols - offset, cell_rows - offset])
+        inside = (cols >= 1) & (cols + length <= size - 1)
+        grids, rows, cols = grids[inside], rows[inside], cols[inside]
+        if len(rows) == 0:
+            return None
+
+        letters = self.letters
+        grid_index, row_index = grids[:, None], rows[:, None]
+        span = cols[:, None] + np.arange(length)
+        cells = letters[grid_index, row_index, span]
+        crossing = cells == codes
+        empty = cells == 0
+        neighbours = (letters[grid_index, row_index - 1, span] != 0) | (letters[grid_index, row_index + 1, span] != 0)
+        fits = (
+            np.all(crossing | empty, axis=1)
+            & ~np.any(self.used[grid_index, row_index, span], axis=1)
+            & ~np.any(empty & neighbours, axis=1)
+            & (letters[grids, rows, cols - 1] == 0)
+            & (letters[grids, rows, cols + length] == 0)
+        )
+
+        top, bottom, left, right = np.array([self.bounds, self.bounds[2:] + self.bounds[:2]])[grids].T
+        height = np.maximum(bottom, rows) - np.minimum(top, rows) + 1
+        width = np.maximum(right, cols + length - 1) - np.minimum(left, cols) + 1
+        fits &= (height <= self.max_size) & (width <= self.max_size)
+        if not fits.any():
+            return None
+
+        growth = (height + width) - (bottom - top + right - left + 2)
+        score = crossing.sum(axis=1) * CROSSING_WEIGHT - growth - np.abs(height - width) * 0.5
+        best = int(np.argmax(np.where(fits, score, -np.inf)))
+        row, col = int(rows[best]), int(cols[best])
+        if grids[best]:
+            return col, row, DOWN
+        return row, col, ACROSS
+
+    def to_result(self):
+        """The layout in crossword-layout-generator's shape (rows, cols, table, result)."""
+        top, bottom, left, right = self.bounds
+        table = [['-' if code == 0 else chr(64 + code) for code in row]
+                 for row in self.letters[0, top:bottom + 1, left:right + 1].tolist()]
+
+        starts = sorted({(row, col) for _, row, col, _ in self.words})
+        positions = {start: number for number, start in enumerate(starts, 1)}
+        result = [{
+            'answer': answer,
+            'startx': col - left + 1,
+            'starty': row - top + 1,
+            'position': positions[(row, col)],
+            'orientation': orientation,
+        } for answer, row, col, orientation in self.words]
+        return {'rows': bottom - top + 1, 'cols': right - left + 1, 'table': table, 'result': result}
+
+
+def letter_codes(answer):
+    return np.frombuffer(answer.encode('ascii'), dtype=np.uint8) - 64
+
+
+def generate_layout(answers, max_size):
+    """Lay out answers longest first, retrying unplaced words until none fit."""
+    layout = Layout(max_size)
+    pending = sorted(answers, key=len, reverse=True)
+    pending = [answer for answer in pending if len(answer) <= max_size]
+    if not pending:
+        return layout
+    first = pending.pop(0)
+    layout.place(first, letter_codes(first), max_size, max_size - len(first) // 2, ACROSS)
+
+    placed_any = True
+    while pending and placed_any:
+        placed_any = False
+        remaining = []
+        for answer in pending:
+            placement = layout.best_placement(letter_codes(answer))
+            if placement is None:
+                remaining.append(answer)
+                continue
+            row, col, orientation = placement
+            layout.place(answer, letter_codes(answer), row, col, orientation)
+            placed_any = True
+        pending = remaining
+    return layout
+
+
+def density_metrics(layout):
+    """calculateDensityScore from lib/crossword/generator.ts, counted with NumPy."""
+    if not layout.words:
+        return {'score': 0, 'placedWords': 0, 'intersections': 0, 'fillRatio': 0, 'gridSize': 0}
+
+    words = layout.words
+    counts = layout.used[0].astype(np.int8) + layout.used[1].T
+    letter_cells = int(np.count_nonzero(counts))
+    intersections = int(np.count_nonzero(counts > 1))
+    top, bottom, left, right = layout.bounds
+    rows, cols = bottom - top + 1, right - left + 1
+    grid_area = rows * cols
+
+    fill_ratio = letter_cells / grid_area
+    intersection_ratio = intersections / letter_cells
+    words_per_area = len(words) / grid_area
+    aspect_ratio = min(rows, cols) / max(rows, cols)
+    per_word_score = min(intersections / len(words) / 3, 1)
+    score = (fill_ratio * 0.25 + intersection_ratio * 0.30 + words_per_area * 10 * 0.15
+             + aspect_ratio * 0.10 + per_word_score * 0.20)
+    return {
+        'score': score,
+        'placedWords': len(words),
+        'intersections': intersections,
+        'fillRatio': fill_ratio,
+        'gridSize': max(rows, cols),
+    }
+
+
+def adjusted_score(metrics, target_words):
+    """The bonuses generateCrossword adds for hitting the target word count."""
+    score = metrics['score']
+    word_ratio = metrics['placedWords'] / target_words
+    if 0.9 <= word_ratio <= 1.1:
+        score += 0.15
+    elif word_ratio >= 0.75:
+        score += 0.08
+    if metrics['intersections'] / metrics['placedWords'] >= 1.5:
+        score += 0.1
+    return score
+
+
+def generate_crossword(questions, random, target_words=TARGET_WORDS, max_grid_size=MAX_GRID_SIZE,
+                       min_words=MIN_WORDS, max_attempts=MAX_ATTEMPTS):
+    """generateCrossword: the densest of max_attempts layouts, or None."""
+    if len(questions) < min_words:
+        return None
+
+    best_layout = None
+    best_metrics = None
+    best_score = -1
+    variance = int(target_words * 0.3)
+    for _ in range(max_attempts):
+        shuffled = seeded_shuffle(questions, random)
+        subset_size = max(min_words, min(len(questions),
+                                         target_words - variance + int(random() * (variance * 2 + 1))))
+        layout = generate_layout([q['answer'] for q in shuffled[:subset_size]], max_grid_size)
+        metrics = density_metrics(layout)
+        if metrics['placedWords'] < min_words:
+            continue
+        score = adjusted_score(metrics, target_words)
+        if score > best_score:
+            best_layout, best_metrics, best_score = layout, metrics, score
+
+    if best_layout is None:
+        return None
+    return build_puzzle(best_layout.to_result(), questions), dict(best_metrics, score=best_score)
+
+
+def build_puzzle(layout, questions):
+    """buildPuzzleFromLayout: a centred square grid plus numbered clues."""
+    question_map = {q['answer']: q for q in questions}
+    size = max(layout['rows'], layout['cols'])
+    row_offset = (size - layout['rows']) // 2
+    col_offset = (size - layout['cols']) // 2
+
+    grid = [[None] * size for _ in range(size)]
+    for row, cells in enumerate(layout['table']):
+        for col, cell in enumerate(cells):
+            if cell != '-':
+                grid[row + row_offset][col + col_offset] = cell
+
+    clues = []
+    cell_numbers = {}
+    used_answers = set()
+    for word in sorted(layout['result'], key=lambda w: w['position']):
+        question = question_map.get(word['answer'])
+        if question is None or word['answer'] in used_answers:
+            continue
+        used_answers.add(word['answer'])
+        start_row = word['starty'] - 1 + row_offset
+        start_col = word['startx'] - 1 + col_offset
+        clue = {
+            'id': f"{word['position']}-{word['orientation']}",
+            'number': word['position'],
+            'direction': word['orientation'],
+            'text': question['text'],
+            'answer': word['answer'],
+            'startRow': start_row,
+            'startCol': start_col,
+            'length': len(word['answer']),
+            'bookKey': question['bookKey'],
+            'bookTitle': question['bookTitle'],
+        }
+        if 'page' in question:
+            clue['page'] = question['page']
+        clues.append(clue)
+        cell_numbers.setdefault(f'{start_row},{start_col}', word['position'])
+
+    return {'grid': grid, 'clues': clues, 'rows': size, 'cols': size, 'cellNumbers': cell_numbers}
+
+
+# --- Season batch -------------------------------------------------------------------
+
+_candidates = {}
+
+
+def _init_worker(candidates):
+    global _candidates
+    _candidates = candidates
+
+
+def generate_daily_puzzle(job):
+    """generateDailyPuzzle for one (year, division, date, attempts) job."""
+    year, division, date_string, attempts = job
+    seed = f'{year}:{division}:{date_string}'
+    random = create_seeded_random(seed)
+    questions = _candidates[(year, division)]
+    candidates = seeded_select_distributed(questions, TARGET_WORDS * 2, random)
+    generated = generate_crossword(candidates, random, max_attempts=attempts)
+    if generated is None:
+        return job, None, None
+    puzzle, metrics = generated
+    daily = {
+        'id': seed,
+        'year': year,
+        'division': division,
+        'dateString': date_string,
+        'puzzle': puzzle,
+        'generatedAt': int(time.time() * 1000),
+        'clueCount': len(puzzle['clues']),
+    }
+    return job, daily, metrics
+
+
+def puzzle_path(year, division, date_string, output_dir=OUTPUT_DIR):
+    return output_dir / year / division / f'crossword-{date_string}.json'
+
+
+def season_dates(start, days):
+    """start plus the next `days` days, as YYYY-MM-DD strings."""
+    return [(start + timedelta(days=i)).isoformat() for i in range(days + 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-generate daily crossword puzzles for a season.")
+    parser.add_argument('days', nargs='?', type=int, default=7, help="days after the start date to generate (default: 7)")
+    parser.add_argument('--start', type=date.fromisoformat, help="first date, YYYY-MM-DD (default: today in Pacific time)")
+    parser.add_argument('--year', help="school year (default: the latest in public/obob)")
+    parser.add_argument('--division', action='append', dest='divisions', help="division to generate (repeatable; default: all)")
+    parser.add_argument('--attempts', type=int, default=MAX_ATTEMPTS, help=f"layout attempts per puzzle (default: {MAX_ATTEMPTS})")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="worker processes (default: one per CPU)")
+    parser.add_argument('--output-dir', default=str(OUTPUT_DIR), help="where to write puzzles (default: content/daily-crosswords)")
+    parser.add_argument('--dry-run', action='store_true', help="generate and report, but don't write files")
+    args = parser.parse_args()
+
+    year_divisions = find_year_divisions()
+    year = args.year or max(y for y, _ in year_divisions)
+    year_divisions = [(y, d) for y, d in year_divisions
+                      if y == year and (not args.divisions or d in args.divisions)]
+    start = args.start or datetime.now(PACIFIC).date()
+    dates = season_dates(start, args.days)
+    output_dir = REPO_ROOT / Path(args.output_dir)
+
+    print(f"🧩 Generating {year} puzzles for {dates[0]} through {dates[-1]}")
+    candidates = {}
+    for entry in load_corpus(year_divisions=year_divisions):
+        index = build_candidate_index(entry)
+        candidates[(entry['year'], entry['division'])] = index['candidates']
+        print(f"  {entry['division']}: {len(index['candidates'])} clue candidates")
+
+    jobs = []
+    skipped = 0
+    for (y, division) in candidates:
+        packed = packed_dates(y, division, output_dir)
+        for date_string in dates:
+            if date_string in packed or puzzle_path(y, division, date_string, output_dir).exists():
+                skipped += 1
+            else:
+                jobs.append((y, division, date_string, args.attempts))
+
+    started = time.perf_counter()
+    generated = failed = 0
+    scores = []
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker, initargs=(candidates,)) as pool:
+        for (y, division, date_string, _), daily, metrics in pool.map(generate_daily_puzzle, jobs, chunksize=8):
+            if daily is None:
+                print(f"  ❌ Failed to generate {y}/{division}/crossword-{date_string}.json")
+                failed += 1
+                continue
+            generated += 1
+            scores.append(metrics)
+            if not args.dry_run:
+                path = puzzle_path(y, division, date_string, output_dir)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with open(path, 'w', encoding='utf-8') as f:
+                    json.dump(daily, f, indent=2, ensure_ascii=False)
+    elapsed = time.perf_counter() - started
+
+    print(f"\n✅ Generated {generated} puzzles in {elapsed:.1f}s ({skipped} existing skipped, {failed} failed)")
+    if scores:
+        print(f"  Average: {np.mean([m['placedWords'] for m in scores]):.1f} words, "
+              f"{np.mean([m['intersections'] for m in scores]):.1f} intersections, "
+              f"{np.mean([m['fillRatio'] for m in scores]) * 100:.0f}% fill, "
+              f"score {np.mean([m['score'] for m in scores]):.3f}")
+    if args.dry_run:
+        print("  (dry run: nothing written)")
+    else:
+        print(f"Output: {output_dir}")
+        print("Run `python3 scripts/crossword_archive.py --prune` to pack the new puzzles.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+
+"""Import reviewed community submissions from a local export.
+
+The offline counterpart of import-reviewed-questions.ts: reads a CSV or
+JSONL export of the submissions sheet (the same columns: timestamp, status,
+year, division, bookKey, questionType, questionText, page, answer,
+sourceName, sourceLink, sourceEmail), keeps the rows marked reviewed, and
+appends them to each division's obobdog_community/questions.json.
+
+The question text and answer are stored in their canonical display form
+(see canonical.py). Rows are checked against books.json and skipped if
+they duplicate a question already in any of the division's sources, or an
+earlier row. The duplicate key is the book key plus the text's match key,
+so differences in case, quotes or punctuation don't hide a duplicate. The
+key hashes for each question file are kept in .obob-cache/, keyed by file
+content, so only files that changed since the last import are read.
+
+Each target file gets a single write. The new questions are appended after
+the existing file contents, which are copied without being parsed and
+re-serialized, and the result replaces the file atomically. Afterwards the
+derived files are rebuilt with build_question_data.py; only outputs whose
+content changed are rewritten.
+"""
+
+import argparse
+import json
+import os
+import re
+from pathlib import Path
+
+from build_question_data import build
+from canonical import display_form, match_key
+from obob_cache import ResultCache, content_hash
+from obob_corpus import OBOB_DIR, QUESTION_TYPES, division_dir, load_books, load_sources
+from port_helpers import js_parse_int, read_rows
+
+COMMUNITY_DIR = 'obobdog_community'
+# Bump when duplicate_key changes, so cached keys are recomputed
+KEY_VERSION = 1
+
+FILE_TAIL_PATTERN = re.compile(rb'\n  \]\n\}\n?$')
+
+
+def parse_page(value):
+    """parseInt(value, 10) || 0."""
+    return js_parse_int(str(value or '')) or 0
+
+
+def format_contributor_name(full_name):
+    """Convert a full name to "FirstName L." format."""
+    parts = full_name.strip().split() or ['']
+    first_name = parts[0]
+    last_initial = parts[-1][0].upper() if len(parts) > 1 else ''
+    return f'{first_name} {last_initial}.' if last_initial else first_name
+
+
+def row_question(row):
+    """The question a sheet row adds, in the field order the TS importer writes."""
+    question = {
+        'type': row.get('questionType') or '',
+        'text': display_form(row.get('questionText')),
+        'book_key': row.get('bookKey') or '',
+        'page': parse_page(row.get('page') or '0'),
+        'contributor': format_contributor_name(row.get('sourceName') or ''),
+    }
+    if question['type'] == 'content' and display_form(row.get('answer')):
+        question['answer'] = display_form(row['answer'])
+    return question
+
+
+def duplicate_key(question):
+    text = question.get('text')
+    if not isinstance(text, str):
+        return None
+    return content_hash(f"{question.get('book_key')}::{match_key(text)}".encode('utf-8'))[:16]
+
+
+def file_keys(data):
+    """Duplicate keys for every question in a questions.json file's bytes."""
+    try:
+        questions = json.loads(data).get('questions', [])
+    except (json.JSONDecodeError, AttributeError):
+        return None
+    return [key for key in map(duplicate_key, questions) if key]
+
+
+def division_keys(year, division, cache, obob_dir=OBOB_DIR):
+    """Duplicate keys across all of a division's sources, from the cache where possible."""
+    keys = set()
+    for source in load_sources(year, division, obob_dir):
+        path = division_dir(year, division, obob_dir) / source['path']
+        if path.exists():
+            keys.update(cache.get_file(path, file_keys) or [])
+    return keys
+
+
+def append_questions(path, questions):
+    """Append questions to a questions.json file in one atomic write; returns the new bytes."""
+    path = Path(path)
+    try:
+        existing = path.read_bytes()
+    except FileNotFoundError:
+        existing = None
+
+    entries = ',\n'.join('    ' + json.dumps(q, indent=2, ensure_ascii=False).replace('\n', '\n    ')
+                         for q in questions).encode('utf-8')
+    tail = FILE_TAIL_PATTERN.search(existing) if existing else None
+    if tail:
+        # Copy the existing questions through untouched and add to the end of the list
+        data = existing[:tail.start()] + b',\n' + entries + b'\n  ]\n}\n'
+    else:
+        current = json.loads(existing)['questions'] if existing else []
+        data = (json.dumps({'questions': current + questions}, indent=2, ensure_ascii=False) + '\n').encode('utf-8')
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return data
+
+
+def plan_import(rows, cache, obob_dir=OBOB_DIR, first_line=1):
+    """Group reviewed rows by division and sort them into new, duplicate and invalid."""
+    plan = {}
+    skipped = []
+    for line, row in enumerate(rows, first_line):
+        if (row.get('status') or '').lower() != 'reviewed':
+            continue
+        year, division = row.get('year') or '', row.get('division') or ''
+        question = row_question(row)
+        if not (division_dir(year, division, obob_dir) / 'books.json').exists():
+            skipped.append((line, 'unknown division', row))
+            continue
+        target = plan.get((year, division))
+        if target is None:
+            target = plan[(year, division)] = {
+                'books': load_books(year, division, obob_dir),
+                'keys': division_keys(year, division, cache, obob_dir),
+                'questions': [],
+                'duplicates': 0,
+                'emails': set(),
+            }
+        if question['book_key'] not in target['books']:
+            skipped.append((line, f"unknown book '{question['book_key']}'", row))
+            continue
+        if question['type'] not in QUESTION_TYPES or not question['text'].strip():
+            skipped.append((line, 'missing question type or text', row))
+            continue
+        key = duplicate_key(question)
+        if key in target['keys']:
+            target['duplicates'] += 1
+            continue
+        target['keys'].add(key)
+        target['questions'].append(question)
+        if row.get('sourceEmail'):
+            target['emails'].add(row['sourceEmail'])
+    return plan, skipped
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import reviewed community questions from a CSV or JSONL export.")
+    parser.add_argument('export', help="the exported sheet (.csv with a header row, or .jsonl)")
+    parser.add_argument('--dry-run', action='store_true', help="report what would be imported without writing")
+    parser.add_argument('--no-build', action='store_true', help="don't rebuild the derived question files")
+    args = parser.parse_args()
+
+    rows = read_rows(args.export)
+    print(f"📄 Read {len(rows)} rows from {args.export}")
+
+    cache = ResultCache('import_keys', KEY_VERSION)
+    plan, skipped = plan_import(rows, cache, first_line=1 if args.export.lower().endswith('.jsonl') else 2)
+
+    print("\n📝 Adding questions to files...\n")
+    imported = 0
+    emails = set()
+    for (year, division), target in plan.items():
+        questions = target['questions']
+        print(f"  {year}/{division}: {len(questions)} new, {target['duplicates']} duplicates skipped")
+        emails |= target['emails']
+        if not questions or args.dry_run:
+            continue
+        path = division_dir(year, division) / COMMUNITY_DIR / 'questions.json'
+        data = append_questions(path, questions)
+        cache.put_file(path, data, file_keys(data))
+        imported += len(questions)
+    cache.save()
+
+    if skipped:
+        print(f"\n⚠️  Skipped {len(skipped)} invalid rows:")
+        for line, reason, row in skipped:
+            print(f"  line {line}: {reason} ({(row.get('questionText') or '')[:60]})")
+
+    print("\n📧 Emails to notify:\n")
+    if not emails:
+        print("  (No emails found)")
+    for email in sorted(emails):
+        print(f"  • {email}")
+
+    if args.dry_run:
+        print("\n(dry run: nothing written)")
+        return
+    print(f"\n✅ Imported {imported} questions into {sum(1 for t in plan.values() if t['questions'])} files")
+
+    if imported and not args.no_build:
+        print()
+        build()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,459 @@
+"""A port of V8's Array.prototype.sort so Python output matches the TS scripts.
+
+The TS export code sorts with comparators like `a.page - b.page`, which
+return NaN when a question has no page. JS treats NaN as "equal", which
+isn't a consistent ordering, so the result depends on the exact steps the
+sort takes. Python's own sort uses a different merge strategy, so this
+follows V8's TimSort (third_party/v8/builtins/array-sort.tq) step for step.
+"""
+
+import math
+
+MIN_GALLOP = 7
+
+
+def _min_run_length(n):
+    r = 0
+    while n >= 64:
+        r |= n & 1
+        n >>= 1
+    return n + r
+
+
+class _SortState:
+    def __init__(self, items, compare):
+        self.a = items
+        self.compare = compare
+        self.min_gallop = MIN_GALLOP
+        self.runs = []
+
+    def binary_insertion_sort(self, low, start, high):
+        a, compare = self.a, self.compare
+        if low == start:
+            start += 1
+        while start < high:
+            left, right = low, start
+            pivot = a[start]
+            while left < right:
+                mid = left + ((right - left) >> 1)
+                if compare(pivot, a[mid]) < 0:
+                    right = mid
+                else:
+                    left = mid + 1
+            a[left + 1:start + 1] = a[left:start]
+            a[left] = pivot
+            start += 1
+
+    def count_and_make_run(self, low_arg, high):
+        a, compare = self.a, self.compare
+        low = low_arg + 1
+        if low == high:
+            return 1
+        run_length = 2
+        previous = a[low]
+        descending = compare(previous, a[low - 1]) < 0
+        for idx in range(low + 1, high):
+            current = a[idx]
+            order = compare(current, previous)
+            if descending:
+                if order >= 0:
+                    break
+            elif order < 0:
+                break
+            previous = current
+            run_length += 1
+        if descending:
+            a[low_arg:low_arg + run_length] = a[low_arg:low_arg + run_length][::-1]
+        return run_length
+
+    def gallop_left(self, arr, key, base, length, hint):
+        compare = self.compare
+        last_ofs, offset = 0, 1
+        if compare(arr[base + hint], key) < 0:
+            max_ofs = length - hint
+            while offset < max_ofs:
+                if compare(arr[base + hint + offset], key) >= 0:
+                    break
+                last_ofs = offset
+                offset = (offset << 1) + 1
+            offset = min(offset, max_ofs)
+            last_ofs += hint
+            offset += hint
+        else:
+            max_ofs = hint + 1
+            while offset < max_ofs:
+                if compare(arr[base + hint - offset], key) < 0:
+                    break
+                last_ofs = offset
+                offset = (offset << 1) + 1
+            offset = min(offset, max_ofs)
+            last_ofs, offset = hint - offset, hint - last_ofs
+
+        last_ofs += 1
+        while last_ofs < offset:
+            m = last_ofs + ((offset - last_ofs) >> 1)
+            if compare(arr[base + m], key) < 0:
+                last_ofs = m + 1
+            else:
+                offset = m
+        return offset
+
+    def gallop_right(self, arr, key, base, length, hint):
+        compare = self.compare
+        last_ofs, offset = 0, 1
+        if compare(key, arr[base + hint]) < 0:
+            max_ofs = hint + 1
+            while offset < max_ofs:
+                if compare(key, arr[base + hint - offset]) >= 0:
+                    break
+                last_ofs = offset
+                offset = (offset << 1) + 1
+            offset = min(offset, max_ofs)
+            last_ofs, offset = hint - offset, hint - last_ofs
+        else:
+            max_ofs = length - hint
+            while offset < max_ofs:
+                if compare(key, arr[base + hint + offset]) < 0:
+                    break
+                last_ofs = offset
+                offset = (offset << 1) + 1
+            offset = min(offset, max_ofs)
+            last_ofs += hint
+            offset += hint
+
+        last_ofs += 1
+        while last_ofs < offset:
+            m = last_ofs + ((offset - last_ofs) >> 1)
+            if compare(key, arr[base + m]) < 0:
+                offset = m
+            else:
+                last_ofs = m + 1
+        return offset
+
+    def merge_low(self, base_a, length_a, base_b, length_b):
+        a, compare = self.a, self.compare
+        temp = a[base_a:base_a + length_a]
+        dest, cursor_temp, cursor_b = base_a, 0, base_b
+
+        a[dest] = a[cursor_b]
+        dest += 1
+        cursor_b += 1
+        length_b -= 1
+
+        copy_b = False
+        if length_b == 0:
+            pass
+        elif length_a == 1:
+            copy_b = True
+        else:
+            min_gallop = self.min_gallop
+            done = False
+            while not done:
+                wins_a = wins_b = 0
+                while True:
+                    if compare(a[cursor_b], temp[cursor_temp]) < 0:
+                        a[dest] = a[cursor_b]
+                        dest += 1
+                        cursor_b += 1
+                        wins_b += 1
+                        length_b -= 1
+                        wins_a = 0
+                        if length_b == 0:
+                            done = True
+                            break
+                        if wins_b >= min_gallop:
+                            break
+                    else:
+                        a[dest] = temp[cursor_temp]
+                        dest += 1
+                        cursor_temp += 1
+                        wins_a += 1
+                        length_a -= 1
+                        wins_b = 0
+                        if length_a == 1:
+                            copy_b = done = True
+                            break
+                        if wins_a >= min_gallop:
+                            break
+                if done:
+                    break
+
+                min_gallop += 1
+                first_iteration = True
+                while wins_a >= MIN_GALLOP or wins_b >= MIN_GALLOP or first_iteration:
+                    first_iteration = False
+                    min_gallop = max(1, min_gallop - 1)
+                    self.min_gallop = min_gallop
+
+                    wins_a = self.gallop_right(temp, a[cursor_b], cursor_temp, length_a, 0)
+                    if wins_a > 0:
+                        a[dest:dest + wins_a] = temp[cursor_temp:cursor_temp + wins_a]
+                        dest += wins_a
+                        cursor_temp += wins_a
+                        length_a -= wins_a
+                        if length_a == 1:
+                            copy_b = done = True
+                            break
+                        if length_a == 0:
+                            done = True
+                            break
+
+                    a[dest] = a[cursor_b]
+                    dest += 1
+                    cursor_b += 1
+                    length_b -= 1
+                    if length_b == 0:
+                        done = True
+                        break
+
+                    wins_b = self.gallop_left(a, temp[cursor_temp], cursor_b, length_b, 0)
+                    if wins_b > 0:
+                        a[dest:dest + wins_b] = a[cursor_b:cursor_b + wins_b]
+                        dest += wins_b
+                        cursor_b += wins_b
+                        length_b -= wins_b
+                        if length_b == 0:
+                            done = True
+                            break
+
+                    a[dest] = temp[cursor_temp]
+                    dest += 1
+                    cursor_temp += 1
+                    length_a -= 1
+                    if length_a == 1:
+                        copy_b = done = True
+                        break
+                if done:
+                    break
+                min_gallop += 1
+                self.min_gallop = min_gallop
+
+        if copy_b:
+            # The last element of run A belongs at the end of the merge
+            a[dest:dest + length_b] = a[cursor_b:cursor_b + length_b]
+            a[dest + length_b] = temp[cursor_temp]
+        elif length_a > 0:
+            a[dest:dest + length_a] = temp[cursor_temp:cursor_temp + length_a]
+
+    def merge_high(self, base_a, length_a, base_b, length_b):
+        a, compare = self.a, self.compare
+        temp = a[base_b:base_b + length_b]
+        dest = base_b + length_b - 1
+        cursor_temp = length_b - 1
+        cursor_a = base_a + length_a - 1
+
+        a[dest] = a[cursor_a]
+        dest -= 1
+        cursor_a -= 1
+        length_a -= 1
+
+        copy_a = False
+        if length_a == 0:
+            pass
+        elif length_b == 1:
+            copy_a = True
+        else:
+            min_gallop = self.min_gallop
+            done = False
+            while not done:
+                wins_a = wins_b = 0
+                while True:
+                    if compare(temp[cursor_temp], a[cursor_a]) < 0:
+                        a[dest] = a[cursor_a]
+                        dest -= 1
+                        cursor_a -= 1
+                        wins_a += 1
+                        length_a -= 1
+                        wins_b = 0
+                        if length_a == 0:
+                            done = True
+                            break
+                        if wins_a >= min_gallop:
+                            break
+                    else:
+                        a[dest] = temp[cursor_temp]
+                        dest -= 1
+                        cursor_temp -= 1
+                        wins_b += 1
+                        length_b -= 1
+                        wins_a = 0
+                        if length_b == 1:
+                            copy_a = done = True
+                            break
+                        if wins_b >= min_gallop:
+                            break
+                if done:
+                    break
+
+                min_gallop += 1
+                first_iteration = True
+                while wins_a >= MIN_GALLOP or wins_b >= MIN_GALLOP or first_iteration:
+                    first_iteration = False
+                    min_gallop = max(1, min_gallop - 1)
+                    self.min_gallop = min_gallop
+
+                    k = self.gallop_right(a, temp[cursor_temp], base_a, length_a, length_a - 1)
+                    wins_a = length_a - k
+                    if wins_a > 0:
+                        dest -= wins_a
+                        cursor_a -= wins_a
+                        a[dest + 1:dest + 1 + wins_a] = a[cursor_a + 1:cursor_a + 1 + wins_a]
+                        length_a -= wins_a
+                        if length_a == 0:
+                            done = True
+                            break
+
+                    a[dest] = temp[cursor_temp]
+                    dest -= 1
+                    cursor_temp -= 1
+                    length_b -= 1
+                    if length_b == 1:
+                        copy_a = done = True
+                        break
+
+                    k = self.gallop_left(temp, a[cursor_a], 0, length_b, length_b - 1)
+                    wins_b = length_b - k
+                    if wins_b > 0:
+                        dest -= wins_b
+                        cursor_temp -= wins_b
+                        a[dest + 1:dest + 1 + wins_b] = temp[cursor_temp + 1:cursor_temp + 1 + wins_b]
+                        length_b -= wins_b
+                        if length_b == 1:
+                            copy_a = done = True
+                            break
+                        if length_b == 0:
+                            done = True
+                            break
+
+                    a[dest] = a[cursor_a]
+                    dest -= 1
+                    cursor_a -= 1
+                    length_a -= 1
+                    if length_a == 0:
+                        done = True
+                        break
+                if done:
+                    break
+                min_gallop += 1
+                self.min_gallop = min_gallop
+
+        if copy_a:
+            # The first element of run B belongs at the front of the merge
+            dest -= length_a
+            cursor_a -= length_a
+            a[dest + 1:dest + 1 + length_a] = a[cursor_a + 1:cursor_a + 1 + length_a]
+            a[dest] = temp[cursor_temp]
+        elif length_b > 0:
+            a[dest - (length_b - 1):dest + 1] = temp[0:length_b]
+
+    def merge_at(self, i):
+        a, runs = self.a, self.runs
+        base_a, length_a = runs[i]
+        base_b, length_b = runs[i + 1]
+        runs[i] = (base_a, length_a + length_b)
+        del runs[i + 1]
+
+        k = self.gallop_right(a, a[base_b], base_a, length_a, 0)
+        base_a += k
+        length_a -= k
+        if length_a == 0:
+            return
+        length_b = self.gallop_left(a, a[base_a + length_a - 1], base_b, length_b, length_b - 1)
+        if length_b == 0:
+            return
+        if length_a <= length_b:
+            self.merge_low(base_a, length_a, base_b, length_b)
+        else:
+            self.merge_high(base_a, length_a, base_b, length_b)
+
+    def _invariant_established(self, n):
+        if n < 2:
+            return True
+        runs = self.runs
+        return runs[n - 2][1] > runs[n - 1][1] + runs[n][1]
+
+    def merge_collapse(self):
+        runs = self.runs
+        while len(runs) > 1:
+            n = len(runs) - 2
+            if not self._invariant_established(n + 1) or not self._invariant_established(n):
+                if runs[n - 1][1] < runs[n + 1][1]:
+                    n -= 1
+                self.merge_at(n)
+            elif runs[n][1] <= runs[n + 1][1]:
+                self.merge_at(n)
+            else:
+                break
+
+    def merge_force_collapse(self):
+        runs = self.runs
+        while len(runs) > 1:
+            n = len(runs) - 2
+            if n > 0 and runs[n - 1][1] < runs[n + 1][1]:
+                n -= 1
+            self.merge_at(n)
+
+    def sort(self):
+        remaining = len(self.a)
+        if remaining < 2:
+            return
+        low = 0
+        min_run = _min_run_length(remaining)
+        while remaining:
+            run_length = self.count_and_make_run(low, low + remaining)
+            if run_length < min_run:
+                forced = min(min_run, remaining)
+                self.binary_insertion_sort(low, low + run_length, low + forced)
+                run_length = forced
+            self.runs.append((low, run_length))
+            self.merge_collapse()
+            low += run_length
+            remaining -= run_length
+        self.merge_force_collapse()
+
+
+def js_sort(items, compare):
+    """Sort a list in place exactly like V8's `items.sort(compare)`.
+
+    `compare(a, b)` returns a number like a JS comparator; NaN is allowed
+    and is treated as 0, as it is in JS.
+    """
+    def compare_js(a, b):
+        # Per spec (and V8's SortCompareUserFn), a NaN result counts as +0
+        order = compare(a, b)
+        return 0 if order != order else order
+
+    _SortState(items, compare_js).sort()
+    return items
+
+
+def js_subtract(a, b):
+    """Evaluate `a - b` for JSON values the way JS would (undefined -> NaN, null -> 0)."""
+    if a is None:
+        a = 0
+    if b is None:
+        b = 0
+    if a is MISSING or b is MISSING:
+        return math.nan
+    return a - b
+
+
+class _Missing:
+    """Stand-in for a JS `undefined` property value."""
+
+    def __repr__(self):
+        return 'undefined'
+
+
+MISSING = _Missing()
+
+
+def locale_compare(a, b):
+    """String.prototype.localeCompare for the ASCII keys the TS scripts sort on.
+
+    Book keys and question types are lowercase letters, digits and hyphens,
+    for which the ICU collation order matches plain code point order.
+    """
+    if a == b:
+        return 0
+    return -1 if a < b else 1
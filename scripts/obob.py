@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+
+"""One entry point for the question data tools.
+
+    obob ingest YEAR/DIVISION/SOURCE...   run a source's parser script
+                                          (--deterministic, --check)
+    obob analyze [...]                    analyze_questions.py
+    obob validate [...]                   validate_questions.py
+    obob dedup [YEAR/DIVISION...]         report duplicate questions
+    obob canonicalize [YEAR/DIVISION...]  rewrite text and answers in display form
+                                          (--check)
+    obob export [...]                     build_question_data.py
+    obob diff OLD [NEW]                   diff_corpus.py
+    obob store refresh|search|sql|export  question_store.py
+
+Each subcommand imports its module only when it runs, so heavy
+dependencies such as pandas and openpyxl (used by the parent_group
+spreadsheet parsers) are loaded only by the commands that need them, and
+`obob <command> --help` starts in tens of milliseconds. Paths are resolved
+from the repository root, so it can be run from any directory.
+"""
+
+import importlib
+import os
+import sys
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# command -> (module, description); the module's main() parses the remaining arguments
+COMMANDS = {
+    'ingest': (None, "run the parser script of one or more sources (YEAR/DIVISION/SOURCE)"),
+    'analyze': ('analyze_questions', "statistics for questions.json files (--all, --history)"),
+    'validate': ('validate_questions', "validate question data against the schema and books.json"),
+    'dedup': (None, "report questions repeated within a division"),
+    'canonicalize': (None, "rewrite question text and answers in canonical display form"),
+    'export': ('build_question_data', "build the counts, CSV exports and indexes"),
+    'diff': ('diff_corpus', "diff two snapshots of the corpus"),
+    'store': ('question_store', "maintain and query the SQLite question store"),
+}
+
+
+def usage():
+    lines = ["usage: obob <command> [args]", "", "commands:"]
+    lines += [f"  {name:<13} {description}" for name, (_, description) in COMMANDS.items()]
+    lines += ["", "Run `obob <command> --help` for a command's options."]
+    return '\n'.join(lines)
+
+
+def canonical_value(value):
+    """NFC strings and integral floats as ints, recursively."""
+    import unicodedata
+
+    if isinstance(value, str):
+        return unicodedata.normalize('NFC', value)
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, list):
+        return [canonical_value(item) for item in value]
+    if isinstance(value, dict):
+        return {key: canonical_value(item) for key, item in value.items()}
+    return value
+
+
+def canonical_output(data):
+    """A parser's questions.json bytes in canonical form.
+
+    Questions are stably sorted by book and type, so within each group they
+    keep the order of the rows they were parsed from. Values are encoded
+    canonically and the file is written like JSON.stringify(data, null, 2).
+    """
+    import json
+
+    from obob_corpus import QUESTION_TYPES
+
+    document = canonical_value(json.loads(data))
+    type_order = {t: i for i, t in enumerate(QUESTION_TYPES)}
+    document['questions'] = sorted(
+        document.get('questions', []),
+        key=lambda q: (str(q.get('book_key')), type_order.get(q.get('type'), len(type_order)), str(q.get('type'))))
+    return (json.dumps(document, indent=2, ensure_ascii=False) + '\n').encode('utf-8')
+
+
+def run_parser(script, deterministic):
+    """Run a parser script from its own directory; returns its questions.json bytes."""
+    import runpy
+
+    output = script.parent / 'questions.json'
+    cwd = os.getcwd()
+    os.chdir(script.parent)
+    try:
+        runpy.run_path(str(script), run_name='__main__')
+    finally:
+        os.chdir(cwd)
+    data = output.read_bytes()
+    if deterministic:
+        canonical = canonical_output(data)
+        if canonical != data:
+            output.write_bytes(canonical)
+        data = canonical
+    return data
+
+
+def check_reproducible(script, deterministic):
+    """Build a source twice and compare digests, leaving its questions.json as it was.
+
+    Returns (first digest, second digest, whether the first build matches the file on disk).
+    """
+    import contextlib
+    import hashlib
+    import io
+
+    output = script.parent / 'questions.json'
+    original = output.read_bytes() if output.exists() else None
+    digests = []
+    try:
+        for _ in range(2):
+            with contextlib.redirect_stdout(io.StringIO()):
+                digests.append(hashlib.sha256(run_parser(script, deterministic)).hexdigest())
+    finally:
+        if original is None:
+            output.unlink(missing_ok=True)
+        else:
+            output.write_bytes(original)
+    return digests[0], digests[1], original is not None and hashlib.sha256(original).hexdigest() == digests[0]
+
+
+def ingest(argv):
+    """Run each source's parser script from its own directory, as they expect."""
+    import argparse
+
+    from obob_corpus import OBOB_DIR
+
+    parser = argparse.ArgumentParser(prog='obob ingest', description="Run the parser script of one or more sources.")
+    parser.add_argument('sources', nargs='+', metavar='YEAR/DIVISION/SOURCE',
+                        help="a source directory under public/obob, e.g. 2025-2026/3-5/parent_group")
+    parser.add_argument('--deterministic', action='store_true',
+                        help="sort the questions by book and type and write them in canonical form")
+    parser.add_argument('--check', action='store_true',
+                        help="build each source twice and compare digests, without changing any files")
+    args = parser.parse_args(argv)
+
+    targets = []
+    for source in args.sources:
+        source_dir = OBOB_DIR / source
+        scripts = sorted(source_dir.glob('*.py')) if source_dir.is_dir() else []
+        if len(scripts) != 1:
+            found = 'no parser script' if not scripts else f"{len(scripts)} scripts"
+            parser.error(f"{source}: expected one parser script, found {found}")
+        targets.append(scripts[0])
+
+    if args.check:
+        failed = False
+        for script in targets:
+            try:
+                first, second, matches = check_reproducible(script, args.deterministic)
+            except Exception as e:
+                failed = True
+                print(f"❌ build failed: {script.relative_to(OBOB_DIR)} ({type(e).__name__}: {e})")
+                continue
+            status = "✅ reproducible" if first == second else "❌ differs between builds"
+            failed |= first != second
+            print(f"{status}: {script.relative_to(OBOB_DIR)} ({first[:12]} / {second[:12]})"
+                  f"{'' if matches else ', differs from the current questions.json'}")
+        if failed:
+            sys.exit(1)
+        return
+
+    for script in targets:
+        print(f"📥 {script.relative_to(OBOB_DIR)}")
+        run_parser(script, args.deterministic)
+    print("\nRun `obob export` to rebuild the derived files.")
+
+
+def dedup(argv):
+    """Report repeated questions like analyze-duplicates.ts: the same book and text match key in a division."""
+    import argparse
+
+    from obob_corpus import load_corpus
+    from validate_questions import parse_year_division
+
+    parser = argparse.ArgumentParser(prog='obob dedup', description="Report questions repeated within a division.")
+    parser.add_argument('divisions', nargs='*', type=parse_year_division, metavar='YEAR/DIVISION',
+                        help="limit to these divisions (default: all)")
+    parser.add_argument('--limit', type=int, default=5, help="examples to show of each kind (default: 5)")
+    args = parser.parse_args(argv)
+
+    within = []
+    across = []
+    for division in load_corpus(year_divisions=args.divisions or None):
+        occurrences = {}
+        keys = iter(division['text_keys'])
+        for source, questions in division['questions_by_source']:
+            for index, q in enumerate(questions):
+                key = (q.get('book_key'), next(keys))
+                occurrences.setdefault(key, []).append((source['path'], index, q))
+        for found in occurrences.values():
+            if len(found) > 1:
+                entry = (f"{division['year']}/{division['division']}", found)
+                (within if len({path for path, _, _ in found}) == 1 else across).append(entry)
+
+    print("=" * 70)
+    print("DUPLICATE ANALYSIS")
+    print("=" * 70)
+    print(f"Total duplicate questions: {len(within) + len(across)}")
+    print(f"Within same source: {len(within)}")
+    print(f"Across different sources: {len(across)}")
+    for title, entries in (("WITHIN SAME SOURCE", within), ("ACROSS DIFFERENT SOURCES", across)):
+        if not entries:
+            continue
+        print(f"\nDUPLICATES {title} (first {args.limit}):")
+        print("-" * 70)
+        for division, found in entries[:args.limit]:
+            q = found[0][2]
+            text = str(q.get('text', ''))
+            print(f"\n{division} {q.get('book_key')}: {text[:80]}{'...' if len(text) > 80 else ''}")
+            for path, index, _ in found:
+                print(f"  - {path}[{index}]")
+    # remove-duplicate-questions.ts only removes repeats within a source whose
+    # text matches ignoring case and surrounding space, a narrower key than ours
+    removable = sum(1 for _, found in within
+                    if len({str(q.get('text', '')).lower().strip() for _, _, q in found}) == 1)
+    if removable:
+        print(f"\n{removable} of the repeats within a source have the same text ignoring case and can be removed "
+              f"with `pnpm remove-duplicates`; the others differ in punctuation or spelling, or are in "
+              f"different sources, and need editing by hand.")
+    elif within or across:
+        print("\nNone of the repeats have the same text ignoring case within a source, "
+              "so `pnpm remove-duplicates` will not remove them; edit them by hand.")
+
+
+def canonicalize_source(raw):
+    """A questions.json's text with each question's text and answer in display form.
+
+    Only the changed string literals are rewritten, so the file keeps its
+    indentation and escaping, and revisionHistory entries keep the text
+    they recorded. Returns (new text, number of values changed).
+    """
+    import json
+    import re
+
+    from canonical import display_form
+
+    ensure_ascii = raw.isascii()
+    token_pattern = re.compile(r'"(?:[^"\\]|\\.)*"|[{}\[\]]')
+    field_pattern = re.compile(r'\s*:\s*("(?:[^"\\]|\\.)*")')
+    parts = []
+    changed = 0
+    depth = 0
+    position = 0
+    for token in token_pattern.finditer(raw):
+        if token.start() < position:
+            continue
+        value = token.group()
+        if value in '{[':
+            depth += 1
+        elif value in '}]':
+            depth -= 1
+        elif depth == 3 and value in ('"text"', '"answer"'):
+            # The fields of a question: {"questions": [{...}]}
+            field = field_pattern.match(raw, token.end())
+            if field:
+                literal = field.group(1)
+                old = json.loads(literal)
+                new = display_form(old)
+                if new != old:
+                    parts.append(raw[position:field.start(1)])
+                    parts.append(json.dumps(new, ensure_ascii=ensure_ascii))
+                    position = field.end(1)
+                    changed += 1
+    parts.append(raw[position:])
+    return ''.join(parts), changed
+
+
+def canonicalize(argv):
+    """Rewrite the checked-in questions.json files in canonical display form, in place.
+
+    Parsers write display forms themselves; this brings files that have been
+    edited since they were parsed into line without rerunning their parsers.
+    """
+    import argparse
+
+    from obob_corpus import OBOB_DIR, find_year_divisions
+    from validate_questions import parse_year_division
+
+    parser = argparse.ArgumentParser(prog='obob canonicalize',
+                                     description="Rewrite question text and answers in canonical display form.")
+    parser.add_argument('divisions', nargs='*', type=parse_year_division, metavar='YEAR/DIVISION',
+                        help="limit to these divisions (default: all)")
+    parser.add_argument('--check', action='store_true', help="report files that would change, without writing them")
+    args = parser.parse_args(argv)
+
+    total = 0
+    for year, division in args.divisions or find_year_divisions():
+        for path in sorted((OBOB_DIR / year / division).glob('*/questions.json')):
+            raw = path.read_text(encoding='utf-8')
+            text, changed = canonicalize_source(raw)
+            if not changed:
+                continue
+            total += changed
+            print(f"{'⚠️ ' if args.check else '✏️ '} {path.relative_to(OBOB_DIR)}: {changed} value(s)")
+            if not args.check:
+                path.write_text(text, encoding='utf-8')
+
+    if not total:
+        print("✅ All question text and answers are in display form")
+    elif args.check:
+        print(f"\n{total} value(s) not in display form; run `obob canonicalize` to rewrite them.")
+        sys.exit(1)
+    else:
+        print(f"\nRewrote {total} value(s). Run `obob export` to rebuild the derived files.")
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ('-h', '--help', 'help'):
+        print(usage())
+        return
+    command, rest = argv[0], argv[1:]
+    if command not in COMMANDS:
+        print(f"obob: unknown command '{command}'\n\n{usage()}", file=sys.stderr)
+        sys.exit(2)
+
+    if SCRIPTS_DIR not in sys.path:
+        sys.path.insert(0, SCRIPTS_DIR)
+    if command == 'ingest':
+        return ingest(rest)
+    if command == 'dedup':
+        return dedup(rest)
+    if command == 'canonicalize':
+        return canonicalize(rest)
+
+    module = importlib.import_module(COMMANDS[command][0])
+    # The modules parse sys.argv themselves
+    sys.argv = [f'obob {command}', *rest]
+    return module.main()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""Persistent result caches for the question tools.
+
+Caches live under .obob-cache/ at the repository root. Each cache is a
+single JSON file of entries keyed by content hash, bounded by entry count
+and total size, and evicted least-recently-used first. Each cache also
+records the version of the code that computed its results; a cache saved
+by another version is discarded on load.
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+from obob_corpus import REPO_ROOT
+
+STATE_DIR = REPO_ROOT / '.obob-cache'
+
+# The cache file format; each cache's own version covers what its results mean
+CACHE_VERSION = 1
+
+
+def content_hash(data):
+    """Return the hex SHA-256 of bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+
+class ResultCache:
+    """A JSON-serializable result store keyed by content hash.
+
+    Entries are loaded lazily on first use and written back by save() only
+    if an entry or path was added. Hits update an entry's last-used time in
+    memory without marking the cache changed, so a warm run does not rewrite
+    the file; the times are saved with the next change. A `paths` map
+    records (mtime_ns, size, hash) per file so unchanged files can be looked
+    up without being read or hashed.
+
+    version identifies the code that computes the results. Callers bump it
+    when that code changes, and entries saved under another version are
+    dropped instead of being returned.
+    """
+
+    def __init__(self, name, version=1, max_entries=1024, max_bytes=32 * 1024 * 1024,
+                 state_dir=None):
+        self.path = Path(state_dir or STATE_DIR) / f'{name}.json'
+        self.version = version
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = None
+        self._paths = None
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+
+    def _load(self):
+        if self._entries is not None:
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            data = {}
+        if data.get('version') != CACHE_VERSION or data.get('results_version') != self.version:
+            data = {}
+        self._entries = data.get('entries', {})
+        self._paths = data.get('paths', {})
+
+    def get(self, key):
+        self._load()
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        entry['used'] = time.time()
+        return entry['value']
+
+    def put(self, key, value):
+        self._load()
+        size = len(json.dumps(value, separators=(',', ':')))
+        self._entries[key] = {'value': value, 'size': size, 'used': time.time()}
+        self._dirty = True
+
+    def get_file(self, path, compute):
+        """Return compute(data) for a file, reusing the cached result when possible.
+
+        The mtime/size fast path skips reading the file entirely; otherwise
+        the file is hashed and the result looked up by content. compute is
+        only called on a miss, and a None result is not cached.
+        """
+        self._load()
+        path = Path(path)
+        stat = path.stat()
+        path_key = str(path.resolve())
+        fingerprint = self._paths.get(path_key)
+        if fingerprint and fingerprint[0] == stat.st_mtime_ns and fingerprint[1] == stat.st_size:
+            value = self.get(fingerprint[2])
+            if value is not None:
+                return value
+        data = path.read_bytes()
+        key = content_hash(data)
+        if fingerprint != [stat.st_mtime_ns, stat.st_size, key]:
+            self._paths[path_key] = [stat.st_mtime_ns, stat.st_size, key]
+            self._dirty = True
+        value = self.get(key)
+        if value is None:
+            value = compute(data)
+            if value is not None:
+                self.put(key, value)
+        return value
+
+    def put_file(self, path, data, value):
+        """Record the result for a file just written with the given bytes."""
+        self._load()
+        path = Path(path)
+        stat = path.stat()
+        key = content_hash(data)
+        self._paths[str(path.resolve())] = [stat.st_mtime_ns, stat.st_size, key]
+        self.put(key, value)
+
+    def _evict(self):
+        entries = self._entries
+        total = sum(entry['size'] for entry in entries.values())
+        if len(entries) <= self.max_entries and total <= self.max_bytes:
+            return
+        for key in sorted(entries, key=lambda k: entries[k]['used']):
+            if len(entries) <= self.max_entries and total <= self.max_bytes:
+                break
+            total -= entries.pop(key)['size']
+        live = set(entries)
+        self._paths = {p: fp for p, fp in self._paths.items() if fp[2] in live}
+
+    def save(self):
+        """Write the cache back to disk atomically if it changed."""
+        if not self._dirty:
+            return
+        self._evict()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f'.{os.getpid()}.tmp')
+        # json.dumps uses the C encoder; json.dump to a file does not
+        data = json.dumps({'version': CACHE_VERSION, 'results_version': self.version,
+                           'entries': self._entries, 'paths': self._paths},
+                          separators=(',', ':'), ensure_ascii=False)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(data)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+    def clear(self):
+        self._entries = {}
+        self._paths = {}
+        self._dirty = False
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
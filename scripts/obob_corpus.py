@@ -0,0 +1,181 @@
+"""Shared helpers for locating and loading OBOB question data.
+
+Every path is resolved from the repository root, so the tools that import
+this module can be run from any working directory.
+"""
+
+import hashlib
+import json
+import re
+from pathlib import Path
+
+from canonical import match_key
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+OBOB_DIR = REPO_ROOT / 'public' / 'obob'
+
+QUESTION_TYPES = ('in-which-book', 'content')
+DIVISIONS = ('3-5', '6-8', '9-12')
+
+YEAR_PATTERN = re.compile(r'^\d{4}-\d{4}$')
+QUESTIONS_ARRAY_PATTERN = re.compile(r'"questions"\s*:\s*\[')
+
+_decoder = json.JSONDecoder()
+
+
+def find_year_divisions(obob_dir=OBOB_DIR):
+    """Return sorted (year, division) pairs that have a directory under public/obob."""
+    obob_dir = Path(obob_dir)
+    pairs = []
+    if not obob_dir.is_dir():
+        return pairs
+    for year_dir in sorted(obob_dir.iterdir()):
+        if not year_dir.is_dir() or year_dir.name.startswith('.'):
+            continue
+        for division_dir in sorted(year_dir.iterdir()):
+            if division_dir.is_dir() and not division_dir.name.startswith('.'):
+                pairs.append((year_dir.name, division_dir.name))
+    return pairs
+
+
+def division_dir(year, division, obob_dir=OBOB_DIR):
+    return Path(obob_dir) / year / division
+
+
+def division_fingerprint(year, division, obob_dir=OBOB_DIR):
+    """SHA-256 of a division's books.json, sources.json and question files, joined by NUL bytes.
+
+    A missing question file counts as empty. lib/crossword/candidate-index.ts
+    computes the same hash to tell whether a built index is still current.
+    """
+    base = division_dir(year, division, obob_dir)
+    parts = []
+    for name in ('books.json', 'sources.json'):
+        parts.append((base / name).read_bytes())
+    for source in json.loads(parts[1]).get('sources', []):
+        path = base / source['path']
+        parts.append(path.read_bytes() if path.exists() else b'')
+    return hashlib.sha256(b'\0'.join(parts)).hexdigest()
+
+
+def load_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_books(year, division, obob_dir=OBOB_DIR):
+    """Return the book_key -> book mapping from a division's books.json."""
+    return load_json(division_dir(year, division, obob_dir) / 'books.json').get('books', {})
+
+
+def load_sources(year, division, obob_dir=OBOB_DIR):
+    """Return the list of sources declared in a division's sources.json."""
+    return load_json(division_dir(year, division, obob_dir) / 'sources.json').get('sources', [])
+
+
+def iter_question_spans(text):
+    """Yield (start, end, question) for each entry of a questions.json document.
+
+    start and end are the offsets of the record's text, so the document can
+    be rebuilt exactly from the records and the text between them. Raises
+    json.JSONDecodeError if the document is malformed.
+    """
+    match = QUESTIONS_ARRAY_PATTERN.search(text)
+    if match is None:
+        # No questions array; let the regular parser produce the error (or nothing)
+        json.loads(text)
+        return
+
+    pos = match.end()
+    length = len(text)
+    while True:
+        while pos < length and text[pos] in ' \t\r\n':
+            pos += 1
+        if pos < length and text[pos] == ']':
+            return
+        start = pos
+        question, pos = _decoder.raw_decode(text, start)
+        yield start, pos, question
+        while pos < length and text[pos] in ' \t\r\n':
+            pos += 1
+        if pos < length and text[pos] == ',':
+            pos += 1
+        elif pos < length and text[pos] == ']':
+            return
+        else:
+            raise json.JSONDecodeError("Expecting ',' delimiter", text, pos)
+
+
+def iter_question_records(text):
+    """Yield (index, line, question) for each entry of a questions.json document.
+
+    Each element of the "questions" array is decoded on its own so callers
+    can report the 1-based line where the record starts. Raises
+    json.JSONDecodeError if the document is malformed.
+    """
+    line = 1
+    counted = 0
+    for index, (start, _, question) in enumerate(iter_question_spans(text)):
+        # Count newlines incrementally so locating every record stays linear
+        line += text.count('\n', counted, start)
+        counted = start
+        yield index, line, question
+
+
+def load_questions(path):
+    """Return the questions list from a questions.json file."""
+    return load_json(path).get('questions', [])
+
+
+def load_division(year, division, obob_dir=OBOB_DIR):
+    """Load books, sources and every source's questions for one division.
+
+    Returns (books, sources, questions_by_source) where questions_by_source
+    is a list of (source, questions) in sources.json order. Missing question
+    files produce an empty list, matching getAllQuestions in lib/questions.ts.
+    """
+    base = division_dir(year, division, obob_dir)
+    books = load_books(year, division, obob_dir)
+    sources = load_sources(year, division, obob_dir)
+    questions_by_source = []
+    for source in sources:
+        try:
+            questions = load_questions(base / source['path'])
+        except FileNotFoundError:
+            print(f"Warning: Failed to load questions from {base / source['path']}")
+            questions = []
+        questions_by_source.append((source, questions))
+    return books, sources, questions_by_source
+
+
+def load_corpus(obob_dir=OBOB_DIR, year_divisions=None):
+    """Load every division once for the build's output sinks.
+
+    Returns a list of dicts with year, division, books, sources and a flat
+    questions list. Like getAllQuestions in lib/questions.ts, each question
+    is copied with its source's name and link attached under 'source'. The
+    unmodified per-file lists are kept under 'questions_by_source'; the flat
+    list is their concatenation, in the same order. 'text_keys' holds the
+    canonical match key of each question's text (see canonical.py), computed
+    once here for the tools that compare questions.
+    """
+    if year_divisions is None:
+        year_divisions = find_year_divisions(obob_dir)
+
+    corpus = []
+    for year, division in year_divisions:
+        books, sources, questions_by_source = load_division(year, division, obob_dir)
+        questions = []
+        for source, source_questions in questions_by_source:
+            source_info = {'name': source['name'], 'link': source['link']}
+            questions.extend(dict(q, source=source_info) for q in source_questions)
+        corpus.append({
+            'year': year,
+            'division': division,
+            'books': books,
+            'sources': sources,
+            'questions': questions,
+            'questions_by_source': questions_by_source,
+            'text_keys': [match_key(q.get('text')) for q in questions],
+        })
+    return corpus
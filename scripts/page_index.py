@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+
+"""Page-range index for "questions up to page N" selection.
+
+The `pages` sink of build_question_data.py writes one index per division
+to public/page-index/<year>/<division>.json. For every book and question
+type it stores:
+
+- ids:     question IDs (the same IDs as the search index) sorted by page,
+           ties in getAllQuestions order
+- pages:   the distinct pages cited, ascending
+- ends:    prefix counts: ends[i] is how many of ids have a page <= pages[i]
+- unpaged: IDs of questions without a page
+
+so the questions from pages <= N are ids[:ends[k - 1]], where k is the
+number of pages <= N, found by binary search.
+"""
+
+import argparse
+from bisect import bisect_right
+
+from obob_corpus import QUESTION_TYPES, REPO_ROOT, load_corpus
+
+INDEX_VERSION = 1
+PAGE_INDEX_DIR = REPO_ROOT / 'public' / 'page-index'
+
+
+def question_page(q):
+    page = q.get('page')
+    return page if isinstance(page, int) and not isinstance(page, bool) and page > 0 else None
+
+
+def build_page_index(entry):
+    """The per-book, per-type page index for one division of the loaded corpus."""
+    grouped = {}
+    for doc_id, q in enumerate(entry['questions']):
+        if q.get('type') not in QUESTION_TYPES:
+            continue
+        grouped.setdefault(q['book_key'], {}).setdefault(q['type'], []).append((question_page(q), doc_id))
+
+    books = {}
+    for book_key in sorted(grouped):
+        books[book_key] = {}
+        for question_type in QUESTION_TYPES:
+            questions = grouped[book_key].get(question_type)
+            if not questions:
+                continue
+            paged = sorted((page, doc_id) for page, doc_id in questions if page is not None)
+            pages = []
+            ends = []
+            for position, (page, _) in enumerate(paged, 1):
+                if pages and pages[-1] == page:
+                    ends[-1] = position
+                else:
+                    pages.append(page)
+                    ends.append(position)
+            books[book_key][question_type] = {
+                'ids': [doc_id for _, doc_id in paged],
+                'pages': pages,
+                'ends': ends,
+                'unpaged': [doc_id for page, doc_id in questions if page is None],
+            }
+
+    return {
+        'version': INDEX_VERSION,
+        'year': entry['year'],
+        'division': entry['division'],
+        'books': books,
+    }
+
+
+def page_index_path(year, division, index_dir=PAGE_INDEX_DIR):
+    return index_dir / year / f'{division}.json'
+
+
+def ids_up_to_page(entry, max_page, include_unpaged=False):
+    """Question IDs for one book and type with a page <= max_page."""
+    count = bisect_right(entry['pages'], max_page)
+    ids = entry['ids'][:entry['ends'][count - 1]] if count else []
+    return ids + entry['unpaged'] if include_unpaged else ids
+
+
+def questions_up_to_page(index, book_keys, max_page, question_type=None, include_unpaged=False):
+    """Question IDs from pages <= max_page of the given books, for one type or both."""
+    types = [question_type] if question_type else QUESTION_TYPES
+    ids = []
+    for book_key in book_keys:
+        for t in types:
+            entry = index['books'].get(book_key, {}).get(t)
+            if entry:
+                ids.extend(ids_up_to_page(entry, max_page, include_unpaged))
+    return ids
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List the questions from the first pages of some books.")
+    parser.add_argument('year')
+    parser.add_argument('division')
+    parser.add_argument('max_page', type=int, help="last page read")
+    parser.add_argument('--books', help="comma-separated book keys (default: all)")
+    parser.add_argument('--type', choices=QUESTION_TYPES, help="only one question type")
+    parser.add_argument('--include-unpaged', action='store_true', help="also count questions without a page")
+    args = parser.parse_args()
+
+    entry = load_corpus(year_divisions=[(args.year, args.division)])[0]
+    index = build_page_index(entry)
+    book_keys = args.books.split(',') if args.books else list(index['books'])
+
+    print(f"📖 {args.year}/{args.division}: questions up to page {args.max_page}")
+    total = 0
+    for book_key in book_keys:
+        ids = questions_up_to_page(index, [book_key], args.max_page, args.type, args.include_unpaged)
+        available = questions_up_to_page(index, [book_key], float('inf'), args.type, True)
+        title = entry['books'].get(book_key, {}).get('title', book_key)
+        print(f"  {title}: {len(ids)} of {len(available)} questions")
+        total += len(ids)
+    print(f"  TOTAL: {total} questions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""Small helpers shared by the Python ports of the TS scripts.
+
+JavaScript's String.prototype.trim() and parseInt() don't behave like
+str.strip() and int(), and the ports need to match them exactly. The
+feedback and review tools also read the same sheet exports.
+"""
+
+import csv
+import json
+import re
+from pathlib import Path
+
+# The characters JavaScript's \s and String.prototype.trim() treat as whitespace
+JS_WHITESPACE = ('\t\n\v\f\r \u00a0\u1680' + ''.join(chr(c) for c in range(0x2000, 0x200b))
+                 + '\u2028\u2029\u202f\u205f\u3000\ufeff')
+JS_SPACE_CLASS = f'[{JS_WHITESPACE}]'
+
+INT_PREFIX_PATTERN = re.compile(r'^\s*[+-]?\d+')
+
+
+def js_trim(value):
+    return value.strip(JS_WHITESPACE)
+
+
+def js_parse_int(value):
+    """parseInt(value, 10), with None for NaN."""
+    match = INT_PREFIX_PATTERN.match(value)
+    return int(match.group()) if match else None
+
+
+def read_rows(path):
+    """Rows from a .csv (with a header row) or .jsonl export."""
+    path = Path(path)
+    if path.suffix.lower() == '.jsonl':
+        with open(path, 'r', encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        return list(csv.DictReader(f))
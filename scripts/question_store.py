@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+
+"""An optional SQLite store of the question corpus.
+
+The JSON files under public/obob stay the source of truth. This store is
+a local, indexed copy of them at .obob-cache/questions.db, for curation
+queries, duplicate lookups and counts that would otherwise re-read every
+questions.json file:
+
+- books:     one row per book of each division's books.json
+- sources:   one row per entry of each division's sources.json
+- questions: one row per question, with its year, division, book_key,
+             type, page, text, answer and text match key (canonical.py)
+             as columns, indexed on (year, division, book_key, type, page)
+             and on (year, division, text_key)
+- questions_fts: an FTS5 index over text and answer
+
+refresh() brings the store up to date incrementally. Files whose mtime and
+size haven't changed are skipped without being read; a changed file is
+hashed, and only if its content changed are its rows replaced.
+
+Each question keeps its record's text exactly as it appears in the file,
+and each source the text around and between the records, so export()
+streams the rows back into questions.json files byte for byte. Rows whose
+book_key, type, page, text or answer are changed with `sql` are marked
+edited (a trigger also updates their text key and FTS entry), and export()
+writes those records from their columns in the file's layout instead.
+Export edits before changing the JSON: a refresh replaces the rows of a
+changed file. The trigger calls match_key(), which connect() registers,
+so edit the store through this script rather than the sqlite3 shell.
+"""
+
+import argparse
+import hashlib
+import json
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+from canonical import match_key
+from obob_corpus import OBOB_DIR, QUESTIONS_ARRAY_PATTERN, find_year_divisions, iter_question_spans
+from obob_cache import STATE_DIR
+
+DB_PATH = STATE_DIR / 'questions.db'
+
+SCHEMA_VERSION = 2
+
+# Question fields stored as columns, which export() writes back when edited
+EDITABLE_FIELDS = ('book_key', 'type', 'page', 'text', 'answer')
+
+SCHEMA = """
+CREATE TABLE files (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    hash TEXT NOT NULL
+);
+CREATE TABLE books (
+    year TEXT NOT NULL,
+    division TEXT NOT NULL,
+    book_key TEXT NOT NULL,
+    title TEXT,
+    author TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (year, division, book_key)
+);
+CREATE TABLE sources (
+    id INTEGER PRIMARY KEY,
+    year TEXT NOT NULL,
+    division TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    path TEXT NOT NULL,
+    name TEXT,
+    link TEXT,
+    hash TEXT,
+    head TEXT,
+    tail TEXT,
+    UNIQUE (year, division, path)
+);
+CREATE TABLE questions (
+    id INTEGER PRIMARY KEY,
+    source_id INTEGER NOT NULL REFERENCES sources (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    year TEXT NOT NULL,
+    division TEXT NOT NULL,
+    book_key TEXT,
+    type TEXT,
+    page,
+    text TEXT,
+    answer TEXT,
+    text_key TEXT,
+    gap TEXT NOT NULL,
+    raw TEXT NOT NULL,
+    edited INTEGER NOT NULL DEFAULT 0
+);
+CREATE UNIQUE INDEX questions_source ON questions (source_id, position);
+CREATE INDEX questions_lookup ON questions (year, division, book_key, type, page);
+CREATE INDEX questions_text_key ON questions (year, division, text_key);
+
+CREATE VIRTUAL TABLE questions_fts USING fts5 (
+    text, answer, content='questions', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER questions_fts_insert AFTER INSERT ON questions BEGIN
+    INSERT INTO questions_fts (rowid, text, answer) VALUES (new.id, new.text, new.answer);
+END;
+CREATE TRIGGER questions_fts_delete AFTER DELETE ON questions BEGIN
+    INSERT INTO questions_fts (questions_fts, rowid, text, answer) VALUES ('delete', old.id, old.text, old.answer);
+END;
+CREATE TRIGGER questions_edit AFTER UPDATE OF book_key, type, page, text, answer ON questions BEGIN
+    INSERT INTO questions_fts (questions_fts, rowid, text, answer) VALUES ('delete', old.id, old.text, old.answer);
+    INSERT INTO questions_fts (rowid, text, answer) VALUES (new.id, new.text, new.answer);
+    UPDATE questions SET edited = 1, text_key = match_key(new.text) WHERE id = new.id;
+END;
+"""
+
+
+def open_connection(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.execute('PRAGMA foreign_keys = ON')
+    # Used by the questions_edit trigger
+    conn.create_function('match_key', 1, match_key, deterministic=True)
+    return conn
+
+
+def connect(db_path=DB_PATH):
+    """Open the store, creating it (or recreating it after a schema change) as needed."""
+    db_path = Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = open_connection(db_path)
+    if conn.execute('PRAGMA user_version').fetchone()[0] != SCHEMA_VERSION:
+        conn.close()
+        db_path.unlink(missing_ok=True)
+        conn = open_connection(db_path)
+        conn.executescript(SCHEMA)
+        conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+    return conn
+
+
+def text_column(value):
+    return value if isinstance(value, str) else None
+
+
+def question_columns(q):
+    """The EDITABLE_FIELDS column values for a question record."""
+    page = q.get('page')
+    return (text_column(q.get('book_key')), text_column(q.get('type')),
+            page if isinstance(page, (int, float, str)) and not isinstance(page, bool) else None,
+            text_column(q.get('text')), text_column(q.get('answer')))
+
+
+def changed_file(conn, path, rel_path):
+    """The file's bytes if it changed since the last refresh, else None.
+
+    A file whose mtime and size match is skipped without being read; one
+    whose content hash matches only has its stat updated.
+    """
+    stat = path.stat()
+    row = conn.execute('SELECT mtime_ns, size, hash FROM files WHERE path = ?', (rel_path,)).fetchone()
+    if row and row[:2] == (stat.st_mtime_ns, stat.st_size):
+        return None
+    data = path.read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    conn.execute('INSERT OR REPLACE INTO files (path, mtime_ns, size, hash) VALUES (?, ?, ?, ?)',
+                 (rel_path, stat.st_mtime_ns, stat.st_size, digest))
+    if row and row[2] == digest:
+        return None
+    return data
+
+
+def split_document(text):
+    """(head, [(gap, raw, question)], tail) such that head + gaps and raws + tail == text."""
+    match = QUESTIONS_ARRAY_PATTERN.search(text)
+    if match is None:
+        return text, [], ''
+    records = []
+    pos = match.end()
+    for start, end, question in iter_question_spans(text):
+        records.append((text[pos:start], text[start:end], question))
+        pos = end
+    return text[:match.end()], records, text[pos:]
+
+
+def load_source(conn, source_id, year, division, text):
+    conn.execute('DELETE FROM questions WHERE source_id = ?', (source_id,))
+    head, records, tail = split_document(text)
+    rows = []
+    for position, (gap, raw, q) in enumerate(records):
+        if not isinstance(q, dict):
+            q = {}
+        rows.append((source_id, position, year, division, *question_columns(q), match_key(q.get('text')), gap, raw))
+    conn.executemany(
+        'INSERT INTO questions (source_id, position, year, division, book_key, type, page, text, answer, text_key, gap, raw)'
+        ' VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', rows)
+    conn.execute('UPDATE sources SET head = ?, tail = ? WHERE id = ?', (head, tail, source_id))
+    return len(rows)
+
+
+def refresh_division(conn, year, division, obob_dir, stats):
+    base = Path(obob_dir) / year / division
+    prefix = f'{year}/{division}'
+
+    books_path = base / 'books.json'
+    data = changed_file(conn, books_path, f'{prefix}/books.json') if books_path.exists() else None
+    if data is not None:
+        conn.execute('DELETE FROM books WHERE year = ? AND division = ?', (year, division))
+        books = json.loads(data).get('books', {})
+        conn.executemany(
+            'INSERT INTO books (year, division, book_key, title, author, data) VALUES (?, ?, ?, ?, ?, ?)',
+            [(year, division, key, text_column(book.get('title')), text_column(book.get('author')),
+              json.dumps(book, ensure_ascii=False)) for key, book in books.items()])
+        stats['books'] += 1
+
+    sources_path = base / 'sources.json'
+    if not sources_path.exists():
+        return
+    data = changed_file(conn, sources_path, f'{prefix}/sources.json')
+    if data is not None:
+        sources = json.loads(data).get('sources', [])
+        paths = [source['path'] for source in sources]
+        placeholders = ','.join('?' * len(paths))
+        conn.execute(f'DELETE FROM sources WHERE year = ? AND division = ? AND path NOT IN ({placeholders})',
+                     (year, division, *paths))
+        for position, source in enumerate(sources):
+            conn.execute(
+                'INSERT INTO sources (year, division, position, path, name, link) VALUES (?, ?, ?, ?, ?, ?)'
+                ' ON CONFLICT (year, division, path) DO UPDATE SET position = excluded.position,'
+                ' name = excluded.name, link = excluded.link',
+                (year, division, position, source['path'], source.get('name'), source.get('link')))
+        stats['sources'] += 1
+
+    for source_id, path, stored_hash in conn.execute(
+            'SELECT id, path, hash FROM sources WHERE year = ? AND division = ? ORDER BY position',
+            (year, division)).fetchall():
+        rel_path = f'{prefix}/{path}'
+        file = base / path
+        if not file.exists():
+            if stored_hash is not None:
+                # Like getAllQuestions, a missing file contributes no questions
+                conn.execute('DELETE FROM questions WHERE source_id = ?', (source_id,))
+                conn.execute('UPDATE sources SET hash = NULL, head = NULL, tail = NULL WHERE id = ?', (source_id,))
+                conn.execute('DELETE FROM files WHERE path = ?', (rel_path,))
+            continue
+        data = changed_file(conn, file, rel_path)
+        if data is None and stored_hash is not None:
+            continue
+        if data is None:
+            data = file.read_bytes()
+        try:
+            count = load_source(conn, source_id, year, division, data.decode('utf-8'))
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            print(f"⚠️  Skipping unreadable {rel_path}: {e}")
+            conn.execute('DELETE FROM files WHERE path = ?', (rel_path,))
+            continue
+        conn.execute('UPDATE sources SET hash = ? WHERE id = ?', (hashlib.sha256(data).hexdigest(), source_id))
+        stats['files'] += 1
+        stats['questions'] += count
+
+
+def refresh(conn, obob_dir=OBOB_DIR):
+    """Bring the store up to date with the JSON files; returns what was reloaded."""
+    stats = {'books': 0, 'sources': 0, 'files': 0, 'questions': 0}
+    year_divisions = find_year_divisions(obob_dir)
+    with conn:
+        present = {f'{year}/{division}' for year, division in year_divisions}
+        for table in ('books', 'sources'):
+            for year, division in conn.execute(f'SELECT DISTINCT year, division FROM {table}').fetchall():
+                if f'{year}/{division}' not in present:
+                    conn.execute(f'DELETE FROM {table} WHERE year = ? AND division = ?', (year, division))
+        for path, in conn.execute('SELECT path FROM files').fetchall():
+            if '/'.join(path.split('/')[:2]) not in present:
+                conn.execute('DELETE FROM files WHERE path = ?', (path,))
+        for year, division in year_divisions:
+            refresh_division(conn, year, division, obob_dir, stats)
+    return stats
+
+
+def serialize_record(raw, gap, columns, ensure_ascii):
+    """An edited question's record: its raw record with the changed columns applied, laid out the same way.
+
+    A column set to NULL removes its field. Fields the columns don't hold
+    (two_part, revisionHistory, ...) are kept as they were.
+    """
+    record = json.loads(raw)
+    original = question_columns(record)
+    for field, value, before in zip(EDITABLE_FIELDS, columns, original):
+        if value == before and type(value) is type(before):
+            continue
+        if value is None:
+            record.pop(field, None)
+        else:
+            record[field] = value
+    lines = raw.split('\n')
+    if len(lines) == 1:
+        return json.dumps(record, ensure_ascii=ensure_ascii)
+    base = gap[gap.rfind('\n') + 1:]
+    indent = lines[1][len(base):len(lines[1]) - len(lines[1].lstrip())]
+    return json.dumps(record, indent=indent, ensure_ascii=ensure_ascii).replace('\n', '\n' + base)
+
+
+def export_source(conn, source_id, out):
+    """Stream one source's questions.json to a binary file object."""
+    head, tail = conn.execute('SELECT head, tail FROM sources WHERE id = ?', (source_id,)).fetchone()
+    # Files written with \u escapes (json.dump's default) get them in edited records too
+    ensure_ascii = bool(conn.execute(
+        "SELECT EXISTS (SELECT 1 FROM questions WHERE source_id = ? AND instr(raw, '\\u') > 0)", (source_id,)
+    ).fetchone()[0])
+    out.write(head.encode('utf-8'))
+    for gap, raw, edited, *columns in conn.execute(
+            f'SELECT gap, raw, edited, {", ".join(EDITABLE_FIELDS)} FROM questions'
+            ' WHERE source_id = ? ORDER BY position', (source_id,)):
+        out.write(gap.encode('utf-8'))
+        out.write((serialize_record(raw, gap, columns, ensure_ascii) if edited else raw).encode('utf-8'))
+    out.write(tail.encode('utf-8'))
+
+
+def export(conn, output_dir=OBOB_DIR, check=False):
+    """Write every stored questions.json under output_dir, or with check compare them to it.
+
+    Returns the relative paths written (or, with check, the ones that differ).
+    """
+    import io
+
+    output_dir = Path(output_dir)
+    paths = []
+    for source_id, year, division, path in conn.execute(
+            'SELECT id, year, division, path FROM sources WHERE head IS NOT NULL ORDER BY year, division, position'
+    ).fetchall():
+        rel_path = f'{year}/{division}/{path}'
+        target = output_dir / rel_path
+        if check:
+            buffer = io.BytesIO()
+            export_source(conn, source_id, buffer)
+            if not target.exists() or target.read_bytes() != buffer.getvalue():
+                paths.append(rel_path)
+            continue
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with open(target, 'wb') as out:
+            export_source(conn, source_id, out)
+        paths.append(rel_path)
+    return paths
+
+
+def search(conn, query, limit=20):
+    """Questions matching an FTS5 query, best first."""
+    return conn.execute(
+        'SELECT q.year, q.division, q.book_key, q.type, q.page, q.text, q.answer'
+        ' FROM questions_fts JOIN questions q ON q.id = questions_fts.rowid'
+        ' WHERE questions_fts MATCH ? ORDER BY rank LIMIT ?', (query, limit)).fetchall()
+
+
+def print_rows(cursor):
+    columns = [d[0] for d in cursor.description or []]
+    if columns:
+        print('\t'.join(columns))
+    for row in cursor:
+        print('\t'.join('' if value is None else str(value) for value in row))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain and query the SQLite question store.")
+    parser.add_argument('--db', default=str(DB_PATH), help=f"store path (default: {DB_PATH})")
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('refresh', help="bring the store up to date with the JSON files")
+    search_parser = commands.add_parser('search', help="full-text search of question text and answers")
+    search_parser.add_argument('query', help='an FTS5 query, e.g. \'garden AND "secret door"\' or \'lemon*\'')
+    search_parser.add_argument('--limit', type=int, default=20, help="matches to show (default: 20)")
+    sql_parser = commands.add_parser('sql', help="run a SQL statement and print the rows as TSV")
+    sql_parser.add_argument('statement')
+    export_parser = commands.add_parser('export', help="write the questions.json files from the store")
+    export_parser.add_argument('--output-dir', default=str(OBOB_DIR), help="where to write (default: public/obob)")
+    export_parser.add_argument('--check', action='store_true',
+                               help="compare the files with the output directory instead of writing them")
+    args = parser.parse_args()
+
+    conn = connect(args.db)
+    start = time.perf_counter()
+    stats = refresh(conn)
+    if args.command == 'refresh' or any(stats.values()):
+        print(f"🗄️  Refreshed {args.db} in {(time.perf_counter() - start) * 1000:.0f} ms: "
+              f"{stats['files']} question files ({stats['questions']:,} questions) reloaded", file=sys.stderr)
+
+    if args.command == 'search':
+        try:
+            matches = search(conn, args.query, args.limit)
+        except sqlite3.Error as e:
+            raise SystemExit(f"❌ {e}")
+        for year, division, book_key, kind, page, text, answer in matches:
+            print(f"{year}/{division} [{book_key}] {kind} p.{page}: {text}" + (f" → {answer}" if answer else ''))
+    elif args.command == 'sql':
+        try:
+            with conn:
+                print_rows(conn.execute(args.statement))
+        except sqlite3.Error as e:
+            raise SystemExit(f"❌ {e}")
+    elif args.command == 'export':
+        paths = export(conn, args.output_dir, check=args.check)
+        if args.check:
+            if paths:
+                for path in paths:
+                    print(f"❌ differs: {path}")
+                sys.exit(1)
+            print(f"✅ Every stored questions.json matches {args.output_dir}")
+        else:
+            print(f"📝 Wrote {len(paths)} questions.json files to {args.output_dir}")
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
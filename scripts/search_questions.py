@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+
+"""Full-text search over the question corpus.
+
+The `search` sink of build_question_data.py writes one inverted index per
+year/division to public/search/<year>/<division>.json. Each index holds
+everything a search endpoint needs without re-tokenizing questions at
+request time:
+
+- docs:      one entry per question ID, columnar: the source (index into
+             `sources`), its position in that source's questions array,
+             the book (index into `books`) and the question type
+- terms:     every token, sorted, so prefix queries are a binary search
+- postings:  for each term, the question IDs containing it, delta-encoded
+- trigrams:  for each trigram, the terms containing it, delta-encoded,
+             used for substring queries
+
+Question IDs are positions in sources.json order, then file order, the same
+order getAllQuestions in lib/questions.ts returns them in.
+
+Queries combine terms with AND (the default), OR, NOT and parentheses.
+`word*` matches a prefix and `*part*` a substring.
+"""
+
+import argparse
+import bisect
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+from canonical import match_key
+from obob_corpus import REPO_ROOT, load_corpus
+
+INDEX_VERSION = 3
+SEARCH_DIR = REPO_ROOT / 'public' / 'search'
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+POSSESSIVE_PATTERN = re.compile(r"(\w+)['\u2019\u02bc]s\b")
+QUERY_TOKEN_PATTERN = re.compile(r'\(|\)|[^\s()]+')
+TYPE_CODES = {'in-which-book': 0, 'content': 1}
+TYPE_NAMES = {code: name for name, code in TYPE_CODES.items()}
+
+
+def tokenize(text):
+    """The ASCII word tokens of the text's match key (see canonical.py).
+
+    Accents are stripped, case folded and apostrophes dropped ("Lina's" is
+    one token, "linas"). A search endpoint must tokenize query terms the
+    same way.
+    """
+    return TOKEN_PATTERN.findall(match_key(text))
+
+
+def possessive_tokens(text):
+    """The tokens of each word before a possessive 's.
+
+    The index stores these as well as the text's tokens, so "Lina's" is
+    found by both "linas" and "lina".
+    """
+    return [token for word in POSSESSIVE_PATTERN.findall(text) for token in tokenize(word)]
+
+
+def trigrams(term):
+    return {term[i:i + 3] for i in range(len(term) - 2)}
+
+
+def delta_encode(values):
+    previous = 0
+    encoded = []
+    for value in values:
+        encoded.append(value - previous)
+        previous = value
+    return encoded
+
+
+def delta_decode(values):
+    total = 0
+    decoded = []
+    for value in values:
+        total += value
+        decoded.append(total)
+    return decoded
+
+
+# --- Building -----------------------------------------------------------------
+
+def build_index(entry, with_trigrams=True):
+    """Build the search index for one division of the loaded corpus."""
+    book_keys = sorted(entry['books'])
+    book_index = {key: i for i, key in enumerate(book_keys)}
+    docs = {'source': [], 'index': [], 'book': [], 'type': []}
+    postings = {}
+
+    doc_id = 0
+    for source_number, (source, questions) in enumerate(entry['questions_by_source']):
+        for position, q in enumerate(questions):
+            docs['source'].append(source_number)
+            docs['index'].append(position)
+            docs['book'].append(book_index.get(q.get('book_key'), -1))
+            docs['type'].append(TYPE_CODES.get(q.get('type'), -1))
+            terms = set(TOKEN_PATTERN.findall(entry['text_keys'][doc_id]))
+            if isinstance(q.get('text'), str):
+                terms.update(possessive_tokens(q['text']))
+            if q.get('type') == 'content' and isinstance(q.get('answer'), str):
+                terms.update(tokenize(q['answer']))
+                terms.update(possessive_tokens(q['answer']))
+            for term in terms:
+                postings.setdefault(term, []).append(doc_id)
+            doc_id += 1
+
+    terms = sorted(postings)
+    index = {
+        'version': INDEX_VERSION,
+        'year': entry['year'],
+        'division': entry['division'],
+        'sources': [source['path'] for source in entry['sources']],
+        'books': book_keys,
+        'docs': docs,
+        'terms': terms,
+        'postings': [delta_encode(postings[term]) for term in terms],
+    }
+    if with_trigrams:
+        by_trigram = {}
+        for term_number, term in enumerate(terms):
+            for trigram in trigrams(term):
+                by_trigram.setdefault(trigram, []).append(term_number)
+        index['trigrams'] = {trigram: delta_encode(by_trigram[trigram]) for trigram in sorted(by_trigram)}
+    return index
+
+
+def index_path(year, division, search_dir=SEARCH_DIR):
+    return Path(search_dir) / year / f'{division}.json'
+
+
+# --- Querying -----------------------------------------------------------------
+
+class SearchIndex:
+    """A loaded index with postings decoded on first use."""
+
+    def __init__(self, data):
+        self.data = data
+        self.terms = data['terms']
+        self.doc_count = len(data['docs']['book'])
+        self._postings = {}
+        self._trigrams = {}
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def postings(self, term_number):
+        decoded = self._postings.get(term_number)
+        if decoded is None:
+            decoded = self._postings[term_number] = set(delta_decode(self.data['postings'][term_number]))
+        return decoded
+
+    def term_numbers_with_prefix(self, prefix):
+        start = bisect.bisect_left(self.terms, prefix)
+        end = start
+        while end < len(self.terms) and self.terms[end].startswith(prefix):
+            end += 1
+        return range(start, end)
+
+    def term_numbers_containing(self, fragment):
+        if len(fragment) < 3 or 'trigrams' not in self.data:
+            return [i for i, term in enumerate(self.terms) if fragment in term]
+        candidates = None
+        for trigram in trigrams(fragment):
+            numbers = self._trigrams.get(trigram)
+            if numbers is None:
+                numbers = self._trigrams[trigram] = set(delta_decode(self.data['trigrams'].get(trigram, [])))
+            candidates = numbers if candidates is None else candidates & numbers
+        return sorted(i for i in candidates if fragment in self.terms[i])
+
+    def match_term(self, word):
+        """Question IDs matching one query word (exact, prefix* or *substring*)."""
+        contains = word.startswith('*')
+        prefix = word.endswith('*')
+        tokens = tokenize(word)
+        if not tokens:
+            return set()
+        if len(tokens) > 1:
+            # A word the tokenizer splits (e.g. "mother-in-law") must match all its parts
+            result = self.match_term(tokens[0])
+            for token in tokens[1:-1]:
+                result &= self.match_term(token)
+            last = ('*' if contains else '') + tokens[-1] + ('*' if prefix else '')
+            return result & self.match_term(last)
+
+        token = tokens[0]
+        if contains:
+            numbers = self.term_numbers_containing(token)
+        elif prefix:
+            numbers = self.term_numbers_with_prefix(token)
+        else:
+            i = bisect.bisect_left(self.terms, token)
+            numbers = [i] if i < len(self.terms) and self.terms[i] == token else []
+        result = set()
+        for number in numbers:
+            result |= self.postings(number)
+        return result
+
+    def search(self, query):
+        """Return the sorted question IDs matching a boolean query."""
+        return sorted(QueryParser(self, query).parse())
+
+    def describe(self, doc_id):
+        docs = self.data['docs']
+        book = docs['book'][doc_id]
+        return {
+            'id': doc_id,
+            'source': self.data['sources'][docs['source'][doc_id]],
+            'index': docs['index'][doc_id],
+            'book_key': self.data['books'][book] if book >= 0 else None,
+            'type': TYPE_NAMES.get(docs['type'][doc_id]),
+        }
+
+
+class QueryParser:
+    """Recursive-descent parser: OR binds loosest, then AND (or adjacency), then NOT."""
+
+    def __init__(self, index, query):
+        self.index = index
+        self.tokens = QUERY_TOKEN_PATTERN.findall(query)
+        self.pos = 0
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def take(self):
+        token = self.peek()
+        self.pos += 1
+        return token
+
+    def parse(self):
+        if not self.tokens:
+            return set()
+        result = self.parse_or()
+        if self.peek() is not None:
+            raise ValueError(f"Unexpected '{self.peek()}' in query")
+        return result
+
+    def parse_or(self):
+        result = self.parse_and()
+        while self.peek() == 'OR':
+            self.take()
+            result = result | self.parse_and()
+        return result
+
+    def parse_and(self):
+        result = self.parse_not()
+        while self.peek() not in (None, 'OR', ')'):
+            if self.peek() == 'AND':
+                self.take()
+            result = result & self.parse_not()
+        return result
+
+    def parse_not(self):
+        if self.peek() == 'NOT':
+            self.take()
+            return set(range(self.index.doc_count)) - self.parse_not()
+        return self.parse_atom()
+
+    def parse_atom(self):
+        token = self.take()
+        if token is None:
+            raise ValueError("Query ends unexpectedly")
+        if token == '(':
+            result = self.parse_or()
+            if self.take() != ')':
+                raise ValueError("Missing ')' in query")
+            return result
+        if token in ('AND', 'OR', ')'):
+            raise ValueError(f"Unexpected '{token}' in query")
+        return self.index.match_term(token)
+
+
+# --- CLI --------------------------------------------------------------------
+
+def load_question_text(year, division, matches):
+    """Fetch the question records for matches from the division's source files."""
+    entry = load_corpus(year_divisions=[(year, division)])[0]
+    by_path = {source['path']: questions for source, questions in entry['questions_by_source']}
+    return [by_path[match['source']][match['index']] for match in matches]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Search questions with boolean, prefix and substring queries.",
+        epilog="Examples: 'lina AND sister', 'ember OR sparks', 'dog NOT cat', 'garden*', '*lemon*'")
+    parser.add_argument('year', help="e.g. 2025-2026")
+    parser.add_argument('division', help="e.g. 3-5")
+    parser.add_argument('query', help="search query")
+    parser.add_argument('-n', '--limit', type=int, default=20, help="number of results to show (default: 20)")
+    parser.add_argument('--ids', action='store_true', help="print matching question IDs only")
+    args = parser.parse_args()
+
+    start_time = time.perf_counter()
+    path = index_path(args.year, args.division)
+    index = SearchIndex.load(path) if path.exists() else None
+    if index is None or index.data.get('version') != INDEX_VERSION:
+        state = "No index" if index is None else "Outdated index"
+        print(f"{state} at {path.relative_to(REPO_ROOT)}; building it in memory "
+              f"(run scripts/build_question_data.py --only search to write it)", file=sys.stderr)
+        index = SearchIndex(build_index(load_corpus(year_divisions=[(args.year, args.division)])[0]))
+    loaded_time = time.perf_counter()
+
+    try:
+        ids = index.search(args.query)
+    except ValueError as e:
+        print(f"Invalid query: {e}")
+        sys.exit(2)
+    search_time = time.perf_counter()
+
+    if args.ids:
+        print('\n'.join(str(doc_id) for doc_id in ids))
+        return
+
+    print(f"{len(ids):,} matches for {args.query!r} in {(search_time - loaded_time) * 1000:.1f} ms "
+          f"(index loaded in {(loaded_time - start_time) * 1000:.0f} ms)\n")
+    matches = [index.describe(doc_id) for doc_id in ids[:args.limit]]
+    for match, q in zip(matches, load_question_text(args.year, args.division, matches)):
+        print(f"[{match['id']}] {match['book_key']} ({match['type']}, {match['source']}#{match['index']})")
+        print(f"    {q.get('text', '')}")
+        if q.get('answer'):
+            print(f"    → {q['answer']}")
+    if len(ids) > args.limit:
+        print(f"\n... and {len(ids) - args.limit:,} more")
+
+
+if __name__ == "__main__":
+    main()
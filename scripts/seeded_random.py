@@ -0,0 +1,86 @@
+"""A port of lib/daily-crossword/seeded-random.ts.
+
+Given the same seed string these produce exactly the same numbers, shuffles
+and selections as the TS versions, so Python tools can reproduce what the
+daily crossword generator picks for a given year, division and date.
+"""
+
+MASK_32 = 0xFFFFFFFF
+
+
+def _int32(value):
+    value &= MASK_32
+    return value - 0x100000000 if value & 0x80000000 else value
+
+
+def _imul(a, b):
+    return _int32((a & MASK_32) * (b & MASK_32))
+
+
+def hash_string(seed):
+    """hashString: the 32-bit string hash used to seed Mulberry32."""
+    value = 0
+    # charCodeAt works on UTF-16 code units
+    encoded = seed.encode('utf-16-le')
+    for i in range(0, len(encoded), 2):
+        char = encoded[i] | (encoded[i + 1] << 8)
+        value = _int32((value << 5) - value + char)
+    return value & MASK_32
+
+
+def create_seeded_random(seed):
+    """createSeededRandom: a Mulberry32 generator returning floats in [0, 1)."""
+    state = _int32(hash_string(seed))
+
+    def random():
+        nonlocal state
+        state = _int32(state + 0x6D2B79F5)
+        u = state & MASK_32
+        t = _imul(u ^ (u >> 15), 1 | state)
+        u = t & MASK_32
+        t = _int32(_int32(t + _imul(u ^ (u >> 7), 61 | t)) ^ t)
+        u = t & MASK_32
+        return ((u ^ (u >> 14)) & MASK_32) / 4294967296
+
+    return random
+
+
+def seeded_shuffle(items, random):
+    """seededShuffle: Fisher-Yates on a copy."""
+    result = list(items)
+    for i in range(len(result) - 1, 0, -1):
+        j = int(random() * (i + 1))
+        result[i], result[j] = result[j], result[i]
+    return result
+
+
+def seeded_select_distributed(questions, target_count, random, answer_key='answer', book_key='bookKey'):
+    """seededSelectDistributed: dedup by answer, then round-robin across shuffled books."""
+    if not questions or target_count <= 0:
+        return []
+
+    unique_by_answer = {}
+    for q in seeded_shuffle(questions, random):
+        unique_by_answer.setdefault(q[answer_key], q)
+
+    by_book = {}
+    for q in unique_by_answer.values():
+        by_book.setdefault(q[book_key], []).append(q)
+    for key in by_book:
+        by_book[key] = seeded_shuffle(by_book[key], random)
+
+    selected = []
+    book_keys = seeded_shuffle(list(by_book), random)
+    book_index = 0
+    used = {}
+    limit = len(book_keys) * -(-target_count // len(book_keys))
+    while len(selected) < target_count:
+        key = book_keys[book_index % len(book_keys)]
+        used_index = used.get(key, 0)
+        if used_index < len(by_book[key]):
+            selected.append(by_book[key][used_index])
+            used[key] = used_index + 1
+        book_index += 1
+        if book_index > limit:
+            break
+    return selected
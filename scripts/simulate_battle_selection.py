@@ -0,0 +1,583 @@
+#!/usr/bin/env python3
+
+"""Monte-Carlo simulator for battle question selection.
+
+Replays selectQuestions / selectDistributedQuestions from lib/questions.ts
+over the real question pool (or a synthetic 10x/100x copy of it) and
+reports how evenly questions are spread across books and sources, how often
+questions repeat across the battles of a practice session, and how the
+selection cost grows with pool size.
+
+Battles are sampled in vectorized NumPy batches. A direct Python port of
+the TS code is kept alongside as the reference implementation: it is used
+for the cost curve and, with --check, to confirm the vectorized sampler
+produces the same distribution.
+"""
+
+import argparse
+import json
+import math
+import random
+import sys
+import time
+
+import numpy as np
+
+from obob_corpus import load_corpus
+
+IWB, CONTENT = 0, 1
+TYPE_CODES = {'in-which-book': IWB, 'content': CONTENT}
+
+
+# --- Question pool -----------------------------------------------------------
+
+class QuestionPool:
+    """Columnar view of one division's questions for the selected books."""
+
+    def __init__(self, book_keys, source_names, book, source, q_type):
+        self.book_keys = book_keys
+        self.source_names = source_names
+        self.book = book
+        self.source = source
+        self.type = q_type
+        # Plain lists for the reference port, which reads them one question at
+        # a time like the TS does; indexing NumPy arrays per item is far slower
+        self.book_list = book.tolist()
+        self.type_list = q_type.tolist()
+
+    @classmethod
+    def from_corpus(cls, entry, book_keys=None):
+        if book_keys is None:
+            book_keys = sorted(entry['books'])
+        book_index = {key: i for i, key in enumerate(book_keys)}
+        source_names = [source['name'] for source in entry['sources']]
+        source_index = {name: i for i, name in enumerate(source_names)}
+
+        book, source, q_type = [], [], []
+        for q in entry['questions']:
+            b = book_index.get(q['book_key'])
+            # Mirrors the battle route: only questions for the selected books
+            if b is None or q['type'] not in TYPE_CODES:
+                continue
+            book.append(b)
+            source.append(source_index[q['source']['name']])
+            q_type.append(TYPE_CODES[q['type']])
+        return cls(book_keys, source_names,
+                   np.array(book, dtype=np.int32),
+                   np.array(source, dtype=np.int32),
+                   np.array(q_type, dtype=np.int8))
+
+    def __len__(self):
+        return len(self.book)
+
+    def scaled(self, factor):
+        """Return a synthetic pool with every question repeated `factor` times."""
+        return QuestionPool(self.book_keys, self.source_names,
+                            np.tile(self.book, factor), np.tile(self.source, factor), np.tile(self.type, factor))
+
+    def typed(self, q_type):
+        """Return (question ids, books) for one question type, grouped by book."""
+        ids = np.flatnonzero(self.type == q_type)
+        ids = ids[np.argsort(self.book[ids], kind='stable')]
+        return ids, self.book[ids]
+
+
+# --- Reference implementation (direct port of lib/questions.ts) ---------------
+
+def _shuffle(items, rnd):
+    shuffled = list(items)
+    for i in range(len(shuffled) - 1, 0, -1):
+        j = math.floor(rnd.random() * (i + 1))
+        shuffled[i], shuffled[j] = shuffled[j], shuffled[i]
+    return shuffled
+
+
+def reference_select_distributed(pool, book, selection_count, rnd):
+    by_book = {}
+    for q in pool:
+        by_book.setdefault(book[q], []).append(q)
+
+    unique_books = list(by_book)
+    selected = {}
+
+    if selection_count > len(unique_books):
+        questions_per_book = math.ceil(selection_count / len(unique_books))
+        shuffled_books = _shuffle(unique_books, rnd)
+        shuffled_by_book = {b: _shuffle(by_book[b], rnd) for b in shuffled_books}
+
+        for round_ in range(questions_per_book):
+            for b in shuffled_books:
+                book_questions = shuffled_by_book[b]
+                if len(book_questions) > round_:
+                    selected.setdefault(book_questions[round_], None)
+                    if len(selected) >= selection_count:
+                        break
+            if len(selected) >= selection_count:
+                break
+
+        if len(selected) < selection_count:
+            remaining = [q for q in pool if q not in selected]
+            for q in _shuffle(remaining, rnd):
+                selected.setdefault(q, None)
+                if len(selected) >= selection_count:
+                    break
+    else:
+        for b in _shuffle(unique_books, rnd)[:selection_count]:
+            book_questions = by_book[b]
+            selected.setdefault(book_questions[math.floor(rnd.random() * len(book_questions))], None)
+
+    return _shuffle(selected, rnd)[:selection_count]
+
+
+def reference_select_questions(pool, count, question_type, rnd):
+    """Select one battle's question ids exactly as selectQuestions does."""
+    book, q_type = pool.book_list, pool.type_list
+    if question_type == 'both':
+        iwb = [q for q in range(len(pool)) if q_type[q] == IWB]
+        content = [q for q in range(len(pool)) if q_type[q] == CONTENT]
+
+        half_count = math.ceil(count / 2)
+        iwb_count = min(half_count, len(iwb))
+        content_count = min(half_count, len(content))
+
+        selected_iwb = reference_select_distributed(iwb, book, iwb_count, rnd)
+
+        used_books = {book[q] for q in selected_iwb}
+        unused_content = [q for q in content if book[q] not in used_books]
+        unused_book_count = len({book[q] for q in unused_content})
+        min_books_needed = max(2, math.ceil(content_count / 4))
+
+        content_pool = content
+        if unused_book_count >= min_books_needed and len(unused_content) >= content_count:
+            content_pool = unused_content
+
+        return selected_iwb + reference_select_distributed(content_pool, book, content_count, rnd)
+
+    filtered = [q for q in range(len(pool)) if q_type[q] == TYPE_CODES[question_type]]
+    return reference_select_distributed(filtered, book, count, rnd)
+
+
+# --- Vectorized sampler ------------------------------------------------------
+
+class DistributedSampler:
+    """Vectorized selectDistributedQuestions over one typed pool.
+
+    The TS algorithm deals questions round-robin over the shuffled books,
+    ceil(count / books) rounds at most, then tops up from whatever is left.
+    That is equivalent to: every book gets min(size, r) questions for each
+    completed round r, a uniformly random subset of the books still holding
+    questions gets one more in the partial round, each book's questions are
+    a uniform random subset, and the top-up is uniform over the leftovers.
+    (With count <= books this reduces to "count random books, one random
+    question each".) Each book can be masked out per battle, which is how
+    content selection avoids the books already used by IWB questions.
+    """
+
+    def __init__(self, ids, books, num_books):
+        self.ids = ids
+        self.num_books = num_books
+        self.lens = np.bincount(books, minlength=num_books).astype(np.int64)
+        self.offsets = np.concatenate(([0], np.cumsum(self.lens)[:-1]))
+        self.local_book = books
+
+    def sample(self, n, count, rng, available=None):
+        """Return an (n, count) array of question ids, -1 padded if the pool runs short."""
+        lens = self.lens
+        if available is None:
+            avail_lens = np.broadcast_to(lens, (n, self.num_books))
+        else:
+            avail_lens = np.where(available, lens, 0)
+        has_questions = avail_lens > 0
+        num_avail_books = has_questions.sum(axis=1)
+        pool_size = avail_lens.sum(axis=1)
+        counts = np.minimum(count, pool_size)
+        result = np.full((n, count), -1, dtype=np.int64)
+        if count == 0 or not counts.any():
+            return result
+
+        per_book = -(-counts // np.maximum(num_avail_books, 1))
+        max_rounds = int(per_book.max())
+
+        # Walk the rounds for every battle at once: round r deals one
+        # question to each available book with more than r questions
+        dealt = np.zeros(n, dtype=np.int64)
+        done_rounds = np.zeros(n, dtype=np.int64)
+        partial_round = np.full(n, -1, dtype=np.int64)
+        partial_take = np.zeros(n, dtype=np.int64)
+        active = counts > 0
+        for r in range(max_rounds):
+            in_round = active & (r < per_book)
+            dealing = (avail_lens > r).sum(axis=1)
+            finishes = in_round & (dealt + dealing >= counts)
+            partial_round[finishes] = r
+            partial_take[finishes] = counts[finishes] - dealt[finishes]
+            dealt[finishes] = counts[finishes]
+            continuing = in_round & ~finishes
+            dealt[continuing] += dealing[continuing]
+            done_rounds[in_round] = r + 1
+            done_rounds[finishes] = r
+            active &= ~finishes
+
+        quotas = np.minimum(avail_lens, done_rounds[:, None])
+        partial = partial_round >= 0
+        if partial.any():
+            eligible = avail_lens > partial_round[:, None]
+            keys = rng.random((n, self.num_books))
+            keys[~eligible] = 2.0
+            ranks = np.argsort(np.argsort(keys, axis=1), axis=1)
+            quotas += (ranks < partial_take[:, None]) & partial[:, None]
+
+        # Expand per-book quotas into one book per slot, row by row
+        dealt_per_row = quotas.sum(axis=1)
+        slot_books = np.repeat(np.tile(np.arange(self.num_books), n), quotas.ravel())
+        rows = np.repeat(np.arange(n), dealt_per_row)
+        cols = np.arange(len(slot_books)) - np.repeat(np.cumsum(dealt_per_row) - dealt_per_row, dealt_per_row)
+        books = np.full((n, count), -1, dtype=np.int64)
+        books[rows, cols] = slot_books
+
+        dealt_slots = books >= 0
+        fill_slots = (~dealt_slots) & (np.arange(count) < counts[:, None])
+        cum_lens = np.cumsum(avail_lens, axis=1)
+
+        positions = np.zeros((n, count), dtype=np.int64)
+        redraw_dealt = dealt_slots
+        redraw_fill = fill_slots
+        while True:
+            if redraw_dealt.any():
+                b = books[redraw_dealt]
+                positions[redraw_dealt] = self.offsets[b] + (rng.random(len(b)) * lens[b]).astype(np.int64)
+            if redraw_fill.any():
+                # Top-up questions are uniform over the battle's available pool
+                rows_f = np.nonzero(redraw_fill)[0]
+                target = (rng.random(len(rows_f)) * pool_size[rows_f]).astype(np.int64)
+                book_f = (cum_lens[rows_f] <= target[:, None]).sum(axis=1)
+                within = target - (cum_lens[rows_f, book_f] - avail_lens[rows_f, book_f])
+                positions[redraw_fill] = self.offsets[book_f] + within
+
+            filled = dealt_slots | fill_slots
+            ordered = np.where(filled, positions, -1 - np.arange(count))
+            order = np.argsort(ordered, axis=1, kind='stable')
+            sorted_positions = np.take_along_axis(ordered, order, axis=1)
+            duplicate = np.zeros((n, count), dtype=bool)
+            dup_sorted = sorted_positions[:, 1:] == sorted_positions[:, :-1]
+            if not dup_sorted.any():
+                break
+            np.put_along_axis(duplicate, order[:, 1:], dup_sorted, axis=1)
+            redraw_dealt = duplicate & dealt_slots
+            redraw_fill = duplicate & fill_slots
+
+        filled = dealt_slots | fill_slots
+        result[filled] = self.ids[positions[filled]]
+        return result
+
+
+class BattleSampler:
+    """Vectorized selectQuestions for one pool, count and question type."""
+
+    def __init__(self, pool, count, question_type):
+        self.pool = pool
+        self.question_type = question_type
+        num_books = len(pool.book_keys)
+        self.samplers = {}
+        for q_type in (IWB, CONTENT):
+            ids, books = pool.typed(q_type)
+            self.samplers[q_type] = DistributedSampler(ids, books, num_books)
+
+        if question_type == 'both':
+            half_count = math.ceil(count / 2)
+            self.iwb_count = min(half_count, len(self.samplers[IWB].ids))
+            self.content_count = min(half_count, len(self.samplers[CONTENT].ids))
+            self.min_books_needed = max(2, math.ceil(self.content_count / 4))
+            self.width = self.iwb_count + self.content_count
+        else:
+            self.count = min(count, len(self.samplers[TYPE_CODES[question_type]].ids))
+            self.width = self.count
+
+    def sample(self, n, rng):
+        if self.question_type != 'both':
+            return self.samplers[TYPE_CODES[self.question_type]].sample(n, self.count, rng)
+
+        iwb_sampler, content_sampler = self.samplers[IWB], self.samplers[CONTENT]
+        iwb = iwb_sampler.sample(n, self.iwb_count, rng)
+
+        used = np.zeros((n, len(self.pool.book_keys)), dtype=bool)
+        picked = iwb >= 0
+        used[np.nonzero(picked)[0], self.pool.book[iwb[picked]]] = True
+
+        content_lens = content_sampler.lens
+        unused = ~used & (content_lens > 0)
+        unused_book_count = unused.sum(axis=1)
+        unused_questions = (unused * content_lens).sum(axis=1)
+        use_unused = (unused_book_count >= self.min_books_needed) & (unused_questions >= self.content_count)
+        available = np.where(use_unused[:, None], unused, True)
+
+        content = content_sampler.sample(n, self.content_count, rng, available=available)
+        return np.concatenate([iwb, content], axis=1)
+
+
+# --- Metrics ------------------------------------------------------------------
+
+def repeat_counts(battles, battles_per_session):
+    """Count questions already seen earlier in the same practice session.
+
+    battles is (n, width) with consecutive rows forming sessions of
+    battles_per_session battles. Returns (repeats, questions considered).
+    """
+    n, width = battles.shape
+    sessions = n // battles_per_session
+    if sessions == 0 or battles_per_session < 2:
+        return 0, 0
+    grouped = battles[:sessions * battles_per_session].reshape(sessions, battles_per_session * width)
+    grouped = np.sort(grouped, axis=1)
+    valid = grouped[:, 1:] >= 0
+    repeats = int(((grouped[:, 1:] == grouped[:, :-1]) & valid).sum())
+    return repeats, int((grouped >= 0).sum())
+
+
+def summarize(pool, question_counts, battles, repeats, considered, elapsed):
+    """Turn per-question selection counts into exposure stats."""
+    num_books = len(pool.book_keys)
+    num_sources = len(pool.source_names)
+    selected_total = int(question_counts.sum())
+
+    book_selected = np.bincount(pool.book, weights=question_counts, minlength=num_books)
+    book_pool = np.bincount(pool.book, minlength=num_books)
+    source_selected = np.bincount(pool.source, weights=question_counts, minlength=num_sources)
+    source_pool = np.bincount(pool.source, minlength=num_sources)
+
+    def share_rows(names, selected, in_pool):
+        rows = []
+        for i, name in enumerate(names):
+            if in_pool[i] == 0:
+                continue
+            selection_share = selected[i] / selected_total if selected_total else 0.0
+            pool_share = in_pool[i] / len(pool)
+            rows.append({
+                'name': name,
+                'pool_questions': int(in_pool[i]),
+                'pool_share': pool_share,
+                'selection_share': selection_share,
+                'exposure_ratio': selection_share / pool_share if pool_share else 0.0,
+            })
+        return sorted(rows, key=lambda row: row['selection_share'], reverse=True)
+
+    per_question = question_counts / battles
+    return {
+        'battles': battles,
+        'questions_selected': selected_total,
+        'elapsed_s': elapsed,
+        'battles_per_second': battles / elapsed if elapsed else None,
+        'books': share_rows(pool.book_keys, book_selected, book_pool),
+        'sources': share_rows(pool.source_names, source_selected, source_pool),
+        'question_exposure': {
+            'never_selected': int((question_counts == 0).sum()),
+            'min_per_battle': float(per_question.min()),
+            'max_per_battle': float(per_question.max()),
+            'mean_per_battle': float(per_question.mean()),
+            'coefficient_of_variation': float(per_question.std() / per_question.mean()) if per_question.mean() else 0.0,
+        },
+        'session_repeat_rate': repeats / considered if considered else 0.0,
+    }
+
+
+def simulate(pool, count, question_type, battles, battles_per_session=10, batch_size=100_000, seed=None):
+    """Sample `battles` battles in batches and return the exposure summary."""
+    rng = np.random.default_rng(seed)
+    sampler = BattleSampler(pool, count, question_type)
+    batch_size = max(battles_per_session, batch_size - batch_size % battles_per_session)
+
+    question_counts = np.zeros(len(pool), dtype=np.int64)
+    repeats = considered = 0
+    start_time = time.perf_counter()
+    remaining = battles
+    while remaining > 0:
+        n = min(batch_size, remaining)
+        selected = sampler.sample(n, rng)
+        picked = selected[selected >= 0]
+        question_counts += np.bincount(picked, minlength=len(pool))
+        batch_repeats, batch_considered = repeat_counts(selected, battles_per_session)
+        repeats += batch_repeats
+        considered += batch_considered
+        remaining -= n
+    elapsed = time.perf_counter() - start_time
+    return summarize(pool, question_counts, battles, repeats, considered, elapsed)
+
+
+def cost_curve(pool, count, question_type, scales, repetitions=20, seed=None):
+    """Time the reference (TS-equivalent) selection against growing pools."""
+    rnd = random.Random(seed)
+    rows = []
+    for factor in scales:
+        scaled = pool.scaled(factor)
+        repetitions_for_scale = max(3, repetitions // factor)
+        start_time = time.perf_counter()
+        for _ in range(repetitions_for_scale):
+            reference_select_questions(scaled, count, question_type, rnd)
+        per_battle = (time.perf_counter() - start_time) / repetitions_for_scale
+        rows.append({'scale': factor, 'pool_questions': len(scaled), 'ms_per_battle': per_battle * 1000})
+    return rows
+
+
+def check_against_reference(pool, count, question_type, battles, seed=None):
+    """Compare how often the vectorized and reference samplers pick each question.
+
+    Per book, the share of picks going to one book barely varies between
+    battles, so it can't tell the samplers apart. Instead each question's
+    two pick counts are compared: if both samplers pick it with the same
+    probability p, (v - r)^2 / ((v + r)(1 - p)) averages 1 over the
+    questions, whatever their frequency. The mean is turned into an
+    approximate z-score (Wilson-Hilferty), so a large one means the
+    samplers differ. Also returns the largest difference in the share of
+    a book's picks that are in-which-book questions, and a z-score for the
+    difference in how many content questions per battle share a book with
+    that battle's in-which-book questions, which the frequencies alone
+    don't see.
+    """
+    sampler = BattleSampler(pool, count, question_type)
+    rnd = random.Random(seed)
+    reference = np.full((battles, sampler.width), -1, dtype=np.int64)
+    for i in range(battles):
+        selected = reference_select_questions(pool, count, question_type, rnd)
+        reference[i, :len(selected)] = selected
+    vectorized = sampler.sample(battles, np.random.default_rng(seed))
+    reference_counts = np.bincount(reference[reference >= 0], minlength=len(pool))
+    vectorized_counts = np.bincount(vectorized[vectorized >= 0], minlength=len(pool))
+
+    total = vectorized_counts + reference_counts
+    # Binomial variance of each count, with p estimated from both samplers
+    variance = total * (1 - total / (2 * battles))
+    seen = variance > 0
+    terms = (vectorized_counts[seen] - reference_counts[seen]) ** 2 / variance[seen]
+    dof = int(seen.sum())
+    mean = float(terms.mean()) if dof else 1.0
+    spread = 2 / (9 * dof) if dof else 1.0
+    z = (mean ** (1 / 3) - (1 - spread)) / math.sqrt(spread)
+
+    def iwb_share(counts):
+        iwb = np.bincount(pool.book, weights=counts * (pool.type == IWB), minlength=len(pool.book_keys))
+        picks = np.bincount(pool.book, weights=counts, minlength=len(pool.book_keys))
+        return np.divide(iwb, picks, out=np.zeros_like(iwb), where=picks > 0)
+
+    type_mix = float(np.abs(iwb_share(vectorized_counts) - iwb_share(reference_counts)).max())
+
+    shared_vectorized, shared_reference = shared_books(pool, vectorized), shared_books(pool, reference)
+    spread = math.sqrt((shared_vectorized.var() + shared_reference.var()) / battles)
+    shared_difference = shared_vectorized.mean() - shared_reference.mean()
+    if spread:
+        shared_z = shared_difference / spread
+    else:
+        shared_z = math.copysign(math.inf, shared_difference) if shared_difference else 0.0
+    return {'questions': dof, 'mean_statistic': mean, 'z': z, 'type_mix_difference': type_mix,
+            'shared_books': float(shared_reference.mean()), 'shared_z': float(shared_z)}
+
+
+def shared_books(pool, battles):
+    """Per battle, how many content questions are from a book with an in-which-book question."""
+    n = len(battles)
+    picked = battles >= 0
+    rows = np.nonzero(picked)[0]
+    books = pool.book[battles[picked]]
+    iwb = pool.type[battles[picked]] == IWB
+    used = np.zeros((n, len(pool.book_keys)), dtype=bool)
+    used[rows[iwb], books[iwb]] = True
+    return np.bincount(rows[~iwb], weights=used[rows[~iwb], books[~iwb]], minlength=n)
+
+
+# --- CLI --------------------------------------------------------------------
+
+def print_report(year, division, count, question_type, summary, curve):
+    print("=" * 80)
+    print(f"BATTLE SELECTION SIMULATION: {year}/{division}, {count} questions, type={question_type}")
+    print("=" * 80)
+    print(f"\nSimulated {summary['battles']:,} battles in {summary['elapsed_s']:.2f}s "
+          f"({summary['battles_per_second']:,.0f} battles/s)")
+
+    print(f"\n📚 EXPOSURE BY BOOK (selection share vs. share of pool)")
+    print(f"{'Book':<40} {'Pool':>7} {'Pool %':>8} {'Picked %':>9} {'Ratio':>7}")
+    for row in summary['books']:
+        name = row['name'][:37] + "..." if len(row['name']) > 40 else row['name']
+        print(f"{name:<40} {row['pool_questions']:>7,} {row['pool_share']*100:>7.1f}% "
+              f"{row['selection_share']*100:>8.1f}% {row['exposure_ratio']:>7.2f}")
+
+    print(f"\n🏫 EXPOSURE BY SOURCE")
+    for row in summary['sources']:
+        print(f"  {row['name']:<38} {row['pool_share']*100:>7.1f}% of pool, "
+              f"{row['selection_share']*100:>5.1f}% of picks (ratio {row['exposure_ratio']:.2f})")
+
+    exposure = summary['question_exposure']
+    print(f"\n🎯 PER-QUESTION EXPOSURE")
+    print(f"  Picked per battle: min {exposure['min_per_battle']:.5f}, mean {exposure['mean_per_battle']:.5f}, "
+          f"max {exposure['max_per_battle']:.5f}")
+    print(f"  Coefficient of variation: {exposure['coefficient_of_variation']:.2f}")
+    print(f"  Never selected: {exposure['never_selected']:,}")
+    print(f"  Repeat rate within a practice session: {summary['session_repeat_rate']*100:.2f}%")
+
+    if curve:
+        print(f"\n⏱️  SELECTION COST (reference implementation, per battle)")
+        for row in curve:
+            print(f"  {row['scale']:>4}x  {row['pool_questions']:>9,} questions  {row['ms_per_battle']:>9.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate battle question selection and measure fairness and cost.")
+    parser.add_argument('year', help="e.g. 2025-2026")
+    parser.add_argument('division', help="e.g. 3-5")
+    parser.add_argument('--books', help="comma-separated book keys to select (default: every book)")
+    parser.add_argument('--count', type=int, default=16, help="questions per battle (default: 16)")
+    parser.add_argument('--type', dest='question_type', choices=('both', 'in-which-book', 'content'), default='both')
+    parser.add_argument('--battles', type=int, default=1_000_000, help="battles to simulate (default: 1,000,000)")
+    parser.add_argument('--session', type=int, default=10, help="battles per practice session for the repeat rate (default: 10)")
+    parser.add_argument('--scale', type=int, default=1, help="simulate a synthetic pool with every question repeated N times")
+    parser.add_argument('--cost-scales', default='1,10,100', help="pool scales for the cost curve (default: 1,10,100; empty to skip)")
+    parser.add_argument('--check', type=int, metavar='BATTLES', help="compare against the reference implementation over N battles")
+    parser.add_argument('--seed', type=int, help="random seed")
+    parser.add_argument('--json', action='store_true', help="print the results as JSON")
+    args = parser.parse_args()
+
+    corpus = load_corpus(year_divisions=[(args.year, args.division)])
+    entry = corpus[0]
+    book_keys = args.books.split(',') if args.books else None
+    if book_keys:
+        unknown = [key for key in book_keys if key not in entry['books']]
+        if unknown:
+            print(f"Unknown book key(s) for {args.year}/{args.division}: {', '.join(unknown)}")
+            sys.exit(1)
+
+    question_type = args.question_type
+    num_books = len(book_keys) if book_keys else len(entry['books'])
+    if num_books < 4 and question_type != 'content':
+        # Same rule as the battle route
+        print("Fewer than 4 books selected: the battle route only uses content questions")
+        question_type = 'content'
+
+    real_pool = QuestionPool.from_corpus(entry, book_keys)
+    pool = real_pool.scaled(args.scale) if args.scale > 1 else real_pool
+
+    if args.check:
+        started = time.perf_counter()
+        check = check_against_reference(pool, args.count, question_type, args.check, seed=args.seed)
+        print(f"Compared with the reference over {args.check:,} battles in {time.perf_counter() - started:.1f}s")
+        print(f"  Per-question pick counts: mean (v - r)²/((v + r)(1 - p)) {check['mean_statistic']:.3f} over "
+              f"{check['questions']:,} questions (1 if they agree), z = {check['z']:.1f}")
+        print(f"  Largest difference in a book's in-which-book share of picks: {check['type_mix_difference']*100:.2f} points")
+        print(f"  Content questions sharing a book with an in-which-book question: {check['shared_books']:.3f} "
+              f"per battle in the reference, z = {check['shared_z']:.1f}")
+        if check['z'] > 4 or abs(check['shared_z']) > 4:
+            print("❌ The vectorized sampler doesn't pick questions like the reference")
+            sys.exit(1)
+        print("✅ The vectorized sampler matches the reference")
+        return
+
+    summary = simulate(pool, args.count, question_type, args.battles, args.session, seed=args.seed)
+    scales = [int(s) for s in args.cost_scales.split(',') if s.strip()]
+    curve = cost_curve(real_pool, args.count, question_type, scales, seed=args.seed) if scales else []
+
+    if args.json:
+        print(json.dumps({'year': args.year, 'division': args.division, 'count': args.count,
+                          'type': question_type, 'summary': summary, 'cost_curve': curve}, indent=2))
+    else:
+        print_report(args.year, args.division, args.count, question_type, summary, curve)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Columnar reader for the content.csv / iwb.csv source layout.
+
+Glencoe, Tabor and other community drops come as one folder per book with
+a content.csv (question, Page #, Answer) and an iwb.csv (question, Page #,
+Title, Author). The question column's header varies ("Content Questions",
+"In Which Book Questions"), so it is found once per file from the header,
+as are the other columns. Rows are read as plain lists by csv.reader and
+returned as column lists, with the text columns stripped in bulk, instead
+of building a dict per row and searching its keys.
+
+Page cells can cite more than one page ("31-32", "235, 239, 256",
+"18 & 23"). parse_pages reads the reference as a tuple of (first, last)
+ranges. first_page is what goes in a question's page field: the first
+page cited, or 0 when there is none. A reference citing more than one
+page is also kept whole in the optional pages field, in the compact form
+format_pages writes ("31-32", "235,239,256").
+
+The parser scripts import this module, so they are run with `obob
+ingest`, which puts scripts/ on the path.
+"""
+
+import csv
+import re
+from functools import lru_cache
+from itertools import compress, zip_longest
+
+PAGE_RANGE_PATTERN = re.compile(r'(\d+)(?:\s*[-\u2013\u2014]\s*(\d+))?')
+
+
+def find_column(header, name, contains=False):
+    """Index of the first header cell equal to (or containing) name, or None."""
+    for index, cell in enumerate(header):
+        cell = cell.strip()
+        if cell == name or (contains and name in cell):
+            return index
+    return None
+
+
+def read_question_csv(path, extra_columns=()):
+    """Read a question CSV into columns.
+
+    Returns a dict with 'question', 'page_text' (the page cell), 'pages'
+    (parsed with parse_pages) and 'answer', plus one list per name in
+    extra_columns (e.g. 'Title'). Text columns are stripped; missing
+    columns come back as empty strings. Rows with no values are skipped.
+    Returns None if the file has no question column.
+    """
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        rows = list(reader)
+
+    positions = {
+        'question': find_column(header, 'Question', contains=True),
+        'page_text': find_column(header, 'Page #'),
+        'answer': find_column(header, 'Answer'),
+    }
+    for name in extra_columns:
+        positions[name] = find_column(header, name)
+    if positions['question'] is None:
+        return None
+
+    # Drop empty rows and transpose the rest into columns, padding short rows
+    mask = list(map(any, rows))
+    kept = list(compress(rows, mask))
+    transposed = list(zip_longest(*kept, fillvalue='')) if kept else []
+    columns = {}
+    for name, index in positions.items():
+        if index is None or index >= len(transposed):
+            columns[name] = [''] * len(kept)
+        else:
+            columns[name] = list(map(str.strip, transposed[index]))
+    columns['pages'] = list(map(parse_pages, columns['page_text']))
+    return columns
+
+
+@lru_cache(maxsize=4096)
+def parse_pages(cell):
+    """A page cell as a tuple of (first, last) ranges; () if it cites no page number.
+
+    An abbreviated range end takes the start's leading digits ("192-5" is 192-195).
+    """
+    ranges = []
+    for start, end in PAGE_RANGE_PATTERN.findall(cell):
+        if end and len(end) < len(start) and int(start[:-len(end)] + end) >= int(start):
+            end = start[:-len(end)] + end
+        ranges.append((int(start), int(end) if end else int(start)))
+    return tuple(ranges)
+
+
+def format_pages(pages):
+    """The compact form of a parsed page reference: "31-32", "235,239,256"."""
+    return ','.join(str(start) if start == end else f'{start}-{end}' for start, end in pages)
+
+
+def first_page(pages):
+    return pages[0][0] if pages else 0
+
+
+def page_reference(pages):
+    """A question's pages field: the compact reference if it cites more than one page, else None."""
+    if len(pages) > 1 or (pages and pages[0][0] != pages[0][1]):
+        return format_pages(pages)
+    return None
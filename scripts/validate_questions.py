@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+
+"""Validate every question file against the question schema and its division's books.
+
+Each questions.json listed in a division's sources.json is checked in a
+process pool, and all problems are collected into a single diagnostics
+report with the file, line, record index and rule that failed.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from canonical import match_key
+from obob_corpus import (
+    DIVISIONS,
+    OBOB_DIR,
+    QUESTION_TYPES,
+    REPO_ROOT,
+    YEAR_PATTERN,
+    division_dir,
+    find_year_divisions,
+    iter_question_records,
+    load_json,
+)
+
+ERROR = 'error'
+WARNING = 'warning'
+
+# Field specs for a single question record. Type-specific requirements live
+# in TYPE_FIELD_RULES below.
+QUESTION_SCHEMA = {
+    'type': {'required': True, 'types': (str,), 'enum': QUESTION_TYPES},
+    'text': {'required': True, 'types': (str,), 'non_empty': True},
+    'book_key': {'required': True, 'types': (str,), 'non_empty': True},
+    'page': {'types': (int,), 'minimum': 0, 'nullable': True},
+    'pages': {'types': (str,), 'non_empty': True},
+    'answer': {'types': (str,), 'non_empty': True},
+    'two_part': {'types': (bool,)},
+    'contributor': {'types': (str,)},
+    'revisionHistory': {'types': (list,)},
+}
+
+TYPE_FIELD_RULES = {
+    'content': {'answer': 'required'},
+    'in-which-book': {'answer': 'forbidden'},
+}
+
+BOOK_REQUIRED_FIELDS = ('book_key', 'title', 'author', 'cover', 'obob_division', 'obob_year')
+
+
+def _type_matches(value, types):
+    # bool is a subclass of int, but a page of `true` is never valid
+    if isinstance(value, bool) and bool not in types:
+        return False
+    return isinstance(value, types)
+
+
+def compile_schema(schema, type_rules):
+    """Compile field specs into a flat list of check functions.
+
+    Each check takes a question dict and returns (rule, message) or None.
+    Compiling once per process keeps the per-record loop to plain calls.
+    """
+    checks = []
+
+    for field, spec in schema.items():
+        types = spec.get('types')
+        type_names = '/'.join(t.__name__ for t in types) if types else ''
+
+        if spec.get('required'):
+            def check_required(q, field=field):
+                if field not in q or q[field] is None:
+                    return 'schema.required', f"missing required field '{field}'"
+            checks.append(check_required)
+
+        def check_value(q, field=field, spec=spec, types=types, type_names=type_names):
+            if field not in q:
+                return None
+            value = q[field]
+            if value is None:
+                if spec.get('nullable') or spec.get('required'):
+                    return None
+                return 'schema.type', f"'{field}' should be {type_names}, got null"
+            if types and not _type_matches(value, types):
+                return 'schema.type', f"'{field}' should be {type_names}, got {type(value).__name__}"
+            if 'enum' in spec and value not in spec['enum']:
+                return 'schema.enum', f"'{field}' should be one of {', '.join(spec['enum'])}, got {value!r}"
+            if spec.get('non_empty') and isinstance(value, str) and not value.strip():
+                return 'schema.empty', f"'{field}' should not be empty"
+            if 'minimum' in spec and value < spec['minimum']:
+                return 'schema.minimum', f"'{field}' should be >= {spec['minimum']}, got {value}"
+            return None
+        checks.append(check_value)
+
+    def check_unknown(q):
+        unknown = [field for field in q if field not in schema]
+        if unknown:
+            return 'schema.unknown-field', f"unexpected field(s): {', '.join(sorted(unknown))}"
+    checks.append(check_unknown)
+
+    for q_type, rules in type_rules.items():
+        for field, rule in rules.items():
+            if rule == 'required':
+                def check_type_required(q, q_type=q_type, field=field):
+                    if q.get('type') == q_type and field not in q:
+                        return f'{q_type}.{field}-missing', f"{q_type} question is missing '{field}'"
+                checks.append(check_type_required)
+            elif rule == 'forbidden':
+                def check_type_forbidden(q, q_type=q_type, field=field):
+                    if q.get('type') == q_type and field in q:
+                        return f'{q_type}.{field}-forbidden', f"{q_type} question should not have '{field}'"
+                checks.append(check_type_forbidden)
+
+    return checks
+
+
+# Rules that are reported but don't fail validation
+WARNING_RULES = {'schema.unknown-field', 'duplicate-question'}
+
+_compiled_checks = None
+
+
+def _get_checks():
+    global _compiled_checks
+    if _compiled_checks is None:
+        _compiled_checks = compile_schema(QUESTION_SCHEMA, TYPE_FIELD_RULES)
+    return _compiled_checks
+
+
+def _relative(path):
+    try:
+        return str(Path(path).resolve().relative_to(REPO_ROOT))
+    except ValueError:
+        return str(path)
+
+
+def _diagnostic(rule, message, file, line=None, index=None, severity=None):
+    return {
+        'severity': severity or (WARNING if rule in WARNING_RULES else ERROR),
+        'rule': rule,
+        'file': file,
+        'line': line,
+        'index': index,
+        'message': message,
+    }
+
+
+def validate_questions_file(task):
+    """Validate one questions.json. Runs inside a worker process.
+
+    Returns a dict with the file's diagnostics, its question count and the
+    duplicate-detection keys so the parent can check across sources.
+    """
+    file_path, book_keys = task
+    rel_path = _relative(file_path)
+    checks = _get_checks()
+    diagnostics = []
+    dedup_keys = []
+    count = 0
+
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            text = f.read()
+    except FileNotFoundError:
+        diagnostics.append(_diagnostic('source.missing-file', 'question file listed in sources.json does not exist', rel_path))
+        return {'file': rel_path, 'count': 0, 'diagnostics': diagnostics, 'dedup_keys': dedup_keys}
+
+    try:
+        for index, line, question in iter_question_records(text):
+            count += 1
+            if not isinstance(question, dict):
+                diagnostics.append(_diagnostic('schema.type', 'question should be an object', rel_path, line, index))
+                continue
+
+            for check in checks:
+                result = check(question)
+                if result:
+                    diagnostics.append(_diagnostic(result[0], result[1], rel_path, line, index))
+
+            book_key = question.get('book_key')
+            if isinstance(book_key, str) and book_key not in book_keys:
+                diagnostics.append(_diagnostic('book-key.unknown', f"book_key '{book_key}' is not in books.json", rel_path, line, index))
+
+            text_value = question.get('text')
+            if isinstance(text_value, str) and isinstance(book_key, str):
+                dedup_keys.append((f"{book_key}::{match_key(text_value)}", index, line))
+    except json.JSONDecodeError as e:
+        diagnostics.append(_diagnostic('json.invalid', e.msg, rel_path, e.lineno))
+
+    return {'file': rel_path, 'count': count, 'diagnostics': diagnostics, 'dedup_keys': dedup_keys}
+
+
+def validate_books(year, division, obob_dir):
+    """Validate books.json for one division. Returns (book_keys, diagnostics)."""
+    books_path = division_dir(year, division, obob_dir) / 'books.json'
+    rel_path = _relative(books_path)
+    try:
+        books = load_json(books_path).get('books')
+    except FileNotFoundError:
+        return set(), [_diagnostic('books.missing-file', 'books.json does not exist', rel_path)]
+    except json.JSONDecodeError as e:
+        return set(), [_diagnostic('json.invalid', e.msg, rel_path, e.lineno)]
+
+    if not isinstance(books, dict) or not books:
+        return set(), [_diagnostic('books.empty', 'books.json should have a non-empty "books" object', rel_path)]
+
+    diagnostics = []
+    for key, book in books.items():
+        missing = [field for field in BOOK_REQUIRED_FIELDS if field not in book]
+        if missing:
+            diagnostics.append(_diagnostic('books.required', f"{key}: missing {', '.join(missing)}", rel_path))
+        if book.get('book_key') != key:
+            diagnostics.append(_diagnostic('books.key-mismatch', f"{key}: book_key is {book.get('book_key')!r}", rel_path))
+        if 'obob_division' in book and book['obob_division'] != division:
+            diagnostics.append(_diagnostic('books.division-mismatch', f"{key}: obob_division is {book['obob_division']!r}", rel_path))
+        if isinstance(book.get('cover'), str) and not book['cover'].startswith('/'):
+            diagnostics.append(_diagnostic('books.cover-path', f"{key}: cover should start with /", rel_path))
+    return set(books), diagnostics
+
+
+def validate_sources(year, division, obob_dir):
+    """Validate sources.json for one division. Returns (question_paths, diagnostics)."""
+    base = division_dir(year, division, obob_dir)
+    rel_path = _relative(base / 'sources.json')
+    try:
+        sources = load_json(base / 'sources.json').get('sources')
+    except FileNotFoundError:
+        return [], [_diagnostic('sources.missing-file', 'sources.json does not exist', rel_path)]
+    except json.JSONDecodeError as e:
+        return [], [_diagnostic('json.invalid', e.msg, rel_path, e.lineno)]
+
+    if not isinstance(sources, list):
+        return [], [_diagnostic('sources.invalid', 'sources.json should have a "sources" array', rel_path)]
+
+    diagnostics = []
+    paths = []
+    for index, source in enumerate(sources):
+        for field in ('path', 'name'):
+            if not isinstance(source.get(field), str):
+                diagnostics.append(_diagnostic('sources.required', f"source {index}: '{field}' should be a string", rel_path, index=index))
+        if 'link' not in source or not (source['link'] is None or isinstance(source['link'], str)):
+            diagnostics.append(_diagnostic('sources.required', f"source {index}: 'link' should be a string or null", rel_path, index=index))
+        if isinstance(source.get('path'), str):
+            paths.append(base / source['path'])
+    return paths, diagnostics
+
+
+def validate_corpus(obob_dir=OBOB_DIR, year_divisions=None, jobs=None):
+    """Validate the whole corpus and return the aggregated report dict."""
+    start_time = time.perf_counter()
+    if year_divisions is None:
+        year_divisions = find_year_divisions(obob_dir)
+
+    diagnostics = []
+    tasks = []
+    task_divisions = []
+
+    for year, division in year_divisions:
+        rel_dir = _relative(division_dir(year, division, obob_dir))
+        if not YEAR_PATTERN.match(year):
+            diagnostics.append(_diagnostic('layout.year', f"year directory {year!r} should look like YYYY-YYYY", rel_dir))
+        if division not in DIVISIONS:
+            diagnostics.append(_diagnostic('layout.division', f"division directory {division!r} should be one of {', '.join(DIVISIONS)}", rel_dir))
+
+        book_keys, book_diagnostics = validate_books(year, division, obob_dir)
+        question_paths, source_diagnostics = validate_sources(year, division, obob_dir)
+        diagnostics.extend(book_diagnostics)
+        diagnostics.extend(source_diagnostics)
+
+        for path in question_paths:
+            tasks.append((str(path), book_keys))
+            task_divisions.append((year, division))
+
+    if jobs is None:
+        jobs = min(len(tasks), os.cpu_count() or 1)
+    if jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(validate_questions_file, tasks))
+    else:
+        results = [validate_questions_file(task) for task in tasks]
+
+    # Duplicates can span sources, so they are resolved per division here
+    seen_by_division = {}
+    question_count = 0
+    for (year, division), result in zip(task_divisions, results):
+        question_count += result['count']
+        diagnostics.extend(result['diagnostics'])
+        seen = seen_by_division.setdefault((year, division), {})
+        for key, index, line in result['dedup_keys']:
+            first = seen.get(key)
+            if first is None:
+                seen[key] = (result['file'], line)
+            else:
+                diagnostics.append(_diagnostic(
+                    'duplicate-question',
+                    f"same text and book_key as {first[0]}:{first[1]}",
+                    result['file'], line, index,
+                ))
+
+    errors = sum(1 for d in diagnostics if d['severity'] == ERROR)
+    return {
+        'summary': {
+            'divisions': len(year_divisions),
+            'files': len(tasks),
+            'questions': question_count,
+            'errors': errors,
+            'warnings': len(diagnostics) - errors,
+            'elapsed_ms': round((time.perf_counter() - start_time) * 1000, 1),
+        },
+        'diagnostics': diagnostics,
+    }
+
+
+def print_report(report, show_warnings=True):
+    summary = report['summary']
+    for d in report['diagnostics']:
+        if d['severity'] == WARNING and not show_warnings:
+            continue
+        location = d['file']
+        if d['line'] is not None:
+            location += f":{d['line']}"
+        if d['index'] is not None:
+            location += f" [{d['index']}]"
+        print(f"{d['severity']}: {location}: {d['rule']}: {d['message']}")
+
+    print(f"\nValidated {summary['questions']:,} questions in {summary['files']} files "
+          f"across {summary['divisions']} divisions in {summary['elapsed_ms']:.0f} ms")
+    print(f"{summary['errors']} error(s), {summary['warnings']} warning(s)")
+
+
+def parse_year_division(value):
+    year, _, division = value.partition('/')
+    if not year or not division:
+        raise argparse.ArgumentTypeError(f"expected YEAR/DIVISION, got {value!r}")
+    return year, division
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate OBOB question data against the schema and books.json.")
+    parser.add_argument('divisions', nargs='*', type=parse_year_division, metavar='YEAR/DIVISION',
+                        help="limit validation to these divisions (default: all)")
+    parser.add_argument('--format', choices=('text', 'json'), default='text', help="report format (default: text)")
+    parser.add_argument('--output', '-o', help="write the report to this file instead of stdout")
+    parser.add_argument('--jobs', '-j', type=int, help="worker processes (default: one per file, up to CPU count)")
+    parser.add_argument('--strict', action='store_true', help="exit non-zero on warnings as well as errors")
+    parser.add_argument('--quiet', '-q', action='store_true', help="hide warnings in text output")
+    args = parser.parse_args()
+
+    report = validate_corpus(year_divisions=args.divisions or None, jobs=args.jobs)
+
+    if args.format == 'json':
+        output = json.dumps(report, indent=2, ensure_ascii=False)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                f.write(output + '\n')
+        else:
+            print(output)
+    elif args.output:
+        with open(args.output, 'w', encoding='utf-8') as f, redirect_stdout(f):
+            print_report(report, show_warnings=not args.quiet)
+    else:
+        print_report(report, show_warnings=not args.quiet)
+
+    summary = report['summary']
+    if summary['errors'] or (args.strict and summary['warnings']):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+import { describe, it, expect } from 'vitest';
+import fs from 'fs';
+import path from 'path';
+
+// Written by scripts/build_test_fixtures.py from the fixture corpus
+const FIXTURE_ROOT = path.join(process.cwd(), 'tests', 'fixtures', 'corpus');
+
+interface AnswerKeys {
+  version: number;
+  maxSpan: number;
+  answers: Record<string, { t: string[]; p: string[]; parts?: { t: string[]; p: string[] }[]; need?: number }>;
+}
+
+const keys = JSON.parse(
+  fs.readFileSync(path.join(FIXTURE_ROOT, 'public', 'answer-keys', '2025-2026', '3-5.json'), 'utf8')
+) as AnswerKeys;
+
+// Question ID 5 is "What does Theo's dog dig up?", answered "Bone (a brass key)"
+describe('answer keys', () => {
+  it('accepts an answer with and without its parenthetical', () => {
+    expect(keys.answers['5'].t).toEqual(['bone', 'boneabrasskey']);
+  });
+
+  it('does not accept the parenthetical on its own', () => {
+    expect(keys.answers['5'].t).not.toContain('brasskey');
+    expect(keys.answers['5'].t).not.toContain('abrasskey');
+  });
+
+  it('accepts a reply without the leading article', () => {
+    expect(keys.answers['6'].t).toEqual(['hersister', 'sister']);
+  });
+});
@@ -0,0 +1,104 @@
+import { describe, it, expect } from 'vitest';
+import fs from 'fs';
+import path from 'path';
+import {
+  COVER_MANIFEST_URL,
+  coverManifestUrl,
+  coverSrcSet,
+  getCoverEntry,
+  pickCoverVariant,
+  type CoverManifest,
+} from '@/lib/cover-images';
+
+// Manifest in the shape scripts/cover_images.py writes
+const manifest: CoverManifest = {
+  version: 1,
+  covers: {
+    '/covers/2025-2026/3-5/hatchet.jpg': {
+      width: 300,
+      height: 450,
+      placeholder: 'data:image/webp;base64,AAAA',
+      variants: {
+        avif: [
+          { src: '/cover-variants/2025-2026/3-5/hatchet-abc-128.avif', width: 128, height: 192 },
+          { src: '/cover-variants/2025-2026/3-5/hatchet-abc-256.avif', width: 256, height: 384 },
+          { src: '/cover-variants/2025-2026/3-5/hatchet-abc-300.avif', width: 300, height: 450 },
+        ],
+        webp: [
+          { src: '/cover-variants/2025-2026/3-5/hatchet-abc-128.webp', width: 128, height: 192 },
+          { src: '/cover-variants/2025-2026/3-5/hatchet-abc-256.webp', width: 256, height: 384 },
+          { src: '/cover-variants/2025-2026/3-5/hatchet-abc-300.webp', width: 300, height: 450 },
+        ],
+      },
+    },
+  },
+};
+
+const entry = manifest.covers['/covers/2025-2026/3-5/hatchet.jpg'];
+
+describe('getCoverEntry', () => {
+  it('looks covers up by their books.json path', () => {
+    expect(getCoverEntry(manifest, '/covers/2025-2026/3-5/hatchet.jpg')).toBe(entry);
+    expect(getCoverEntry(manifest, '/covers/2025-2026/3-5/unknown.jpg')).toBeUndefined();
+    expect(getCoverEntry(null, '/covers/2025-2026/3-5/hatchet.jpg')).toBeUndefined();
+  });
+});
+
+describe('pickCoverVariant', () => {
+  it('picks the smallest variant at least as wide as asked', () => {
+    expect(pickCoverVariant(entry, 128)?.width).toBe(128);
+    expect(pickCoverVariant(entry, 200)?.width).toBe(256);
+    expect(pickCoverVariant(entry, 200, 'avif')?.src).toBe('/cover-variants/2025-2026/3-5/hatchet-abc-256.avif');
+  });
+
+  it('falls back to the largest variant', () => {
+    expect(pickCoverVariant(entry, 1000)?.width).toBe(300);
+  });
+});
+
+describe('coverSrcSet', () => {
+  it('lists every variant with its width', () => {
+    expect(coverSrcSet(entry, 'webp')).toBe(
+      '/cover-variants/2025-2026/3-5/hatchet-abc-128.webp 128w, ' +
+        '/cover-variants/2025-2026/3-5/hatchet-abc-256.webp 256w, ' +
+        '/cover-variants/2025-2026/3-5/hatchet-abc-300.webp 300w'
+    );
+  });
+});
+
+describe('coverManifestUrl', () => {
+  it("points a division's cover at that division's manifest", () => {
+    expect(coverManifestUrl('/covers/2025-2026/3-5/hatchet.jpg')).toBe('/cover-variants/2025-2026/3-5.json');
+  });
+
+  it('falls back to the full manifest for other paths', () => {
+    expect(coverManifestUrl('/covers/hatchet.jpg')).toBe(COVER_MANIFEST_URL);
+  });
+});
+
+describe('a division manifest cover_images.py wrote', () => {
+  // Built by scripts/build_test_fixtures.py from the fixture corpus's covers
+  const publicDir = path.join(process.cwd(), 'tests', 'fixtures', 'corpus', 'public');
+  const { books } = JSON.parse(fs.readFileSync(path.join(publicDir, 'obob', '2025-2026', '3-5', 'books.json'), 'utf8'));
+  const covers = Object.values(books as Record<string, { cover: string }>).map((book) => book.cover);
+  const readManifest = (url: string) => JSON.parse(fs.readFileSync(path.join(publicDir, url), 'utf8')) as CoverManifest;
+
+  it("has an entry for every cover in the division's books.json", () => {
+    for (const cover of covers) {
+      expect(getCoverEntry(readManifest(coverManifestUrl(cover)), cover)).toBeDefined();
+    }
+  });
+
+  it('lists variants that exist, never wider than the original', () => {
+    const fixtureEntry = getCoverEntry(
+      readManifest(coverManifestUrl('/covers/2025-2026/3-5/lantern-keeper.jpg')),
+      '/covers/2025-2026/3-5/lantern-keeper.jpg'
+    )!;
+    expect([fixtureEntry.width, fixtureEntry.height]).toEqual([200, 300]);
+    expect(pickCoverVariant(fixtureEntry, 128)?.width).toBe(128);
+    expect(pickCoverVariant(fixtureEntry, 640)?.width).toBe(200);
+    for (const variant of fixtureEntry.variants.webp ?? []) {
+      expect(fs.existsSync(path.join(publicDir, variant.src))).toBe(true);
+    }
+  });
+});
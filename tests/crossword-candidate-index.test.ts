@@ -0,0 +1,102 @@
+import { describe, it, expect } from 'vitest';
+import fs from 'fs';
+import path from 'path';
+import {
+  corpusFingerprint,
+  loadCandidateIndex,
+  toCrosswordQuestions,
+  findCandidatesByPattern,
+  countCandidatesPerBook,
+  type CrosswordCandidate,
+  type CrosswordCandidateIndex,
+} from '@/lib/crossword/candidate-index';
+
+// Helper to build an index the way scripts/crossword_candidates.py does
+function createMockIndex(entries: Array<[string, string]>): CrosswordCandidateIndex {
+  const candidates: CrosswordCandidate[] = [];
+  const byLength: Record<string, number[]> = {};
+  const byLetter: Record<string, number[]> = {};
+
+  entries.forEach(([bookKey, answer], position) => {
+    candidates.push({
+      id: position * 2,
+      answer,
+      length: answer.length,
+      letters: '',
+      bookKey,
+      bookTitle: `Book ${bookKey}`,
+      text: `Question ${position} for ${bookKey}`,
+      page: position + 1,
+    });
+    byLength[answer.length] = [...(byLength[answer.length] || []), position];
+    answer.split('').forEach((letter, i) => {
+      const key = `${i}${letter}`;
+      byLetter[key] = [...(byLetter[key] || []), position];
+    });
+  });
+
+  return {
+    version: 2,
+    year: '2025-2026',
+    division: '3-5',
+    candidates,
+    byLength,
+    byLetter,
+    corpus: { questions: entries.length * 2, sha256: '' },
+  };
+}
+
+describe('crossword candidate index', () => {
+  const index = createMockIndex([
+    ['book-a', 'MAPLE'],
+    ['book-b', 'TABLE'],
+    ['book-a', 'CAT'],
+    ['book-b', 'MAPLES'],
+  ]);
+
+  it('converts candidates to crossword questions in order', () => {
+    const questions = toCrosswordQuestions(index);
+    expect(questions.map((q) => q.answer)).toEqual(['MAPLE', 'TABLE', 'CAT', 'MAPLES']);
+    expect(questions[0]).toEqual({
+      text: 'Question 0 for book-a',
+      answer: 'MAPLE',
+      bookKey: 'book-a',
+      bookTitle: 'Book book-a',
+      page: 1,
+    });
+  });
+
+  it('filters to selected books', () => {
+    const questions = toCrosswordQuestions(index, ['book-b']);
+    expect(questions.map((q) => q.answer)).toEqual(['TABLE', 'MAPLES']);
+  });
+
+  it('finds answers fitting a pattern', () => {
+    expect(findCandidatesByPattern(index, '?A?LE').map((c) => c.answer)).toEqual(['MAPLE', 'TABLE']);
+    expect(findCandidatesByPattern(index, 'm????').map((c) => c.answer)).toEqual(['MAPLE']);
+    expect(findCandidatesByPattern(index, '???????')).toEqual([]);
+  });
+
+  it('counts candidates per book', () => {
+    const counts = countCandidatesPerBook(index);
+    expect(counts.get('book-a')).toBe(2);
+    expect(counts.get('book-b')).toBe(2);
+  });
+});
+
+describe('candidate index freshness', () => {
+  it('fingerprints the division files like division_fingerprint', async () => {
+    // Index written by scripts/build_test_fixtures.py from the fixture corpus
+    const fixtureRoot = path.join(process.cwd(), 'tests', 'fixtures', 'corpus');
+    const built = JSON.parse(
+      fs.readFileSync(path.join(fixtureRoot, 'public', 'crossword-candidates', '2025-2026', '3-5.json'), 'utf8')
+    ) as CrosswordCandidateIndex;
+    expect(await corpusFingerprint('2025-2026', '3-5', path.join(fixtureRoot, 'public', 'obob'))).toBe(
+      built.corpus.sha256
+    );
+  });
+
+  it('returns null for a division without question data', async () => {
+    expect(await loadCandidateIndex('1999-2000', '3-5')).toBeNull();
+  });
+});
@@ -0,0 +1,114 @@
+import { describe, it, expect } from 'vitest';
+import fs from 'fs';
+import path from 'path';
+import {
+  getArchivedDates,
+  hasArchivedPuzzle,
+  readArchivedPuzzle,
+  unpackPuzzle,
+  type ArchiveIndex,
+  type PackedPuzzle,
+} from '@/lib/daily-crossword/archive';
+
+// Index in the shape scripts/crossword_archive.py writes
+const index: ArchiveIndex = {
+  version: 1,
+  year: '2025-2026',
+  division: '3-5',
+  strings: ['1-across', 'across', 'What does Lina find?', 'BOX', 'city-of-ember', 'City of Ember', '1-down', 'down', 'Who is her friend?', 'BUG'],
+  dates: ['2026-01-06'],
+  offsets: [8],
+  lengths: [0],
+};
+
+const packed: PackedPuzzle = [
+  1767000000000,
+  2,
+  3,
+  3,
+  ['BOX', 'U..', 'G..'],
+  [0, 0, 1],
+  [
+    [0, 1, 1, 2, 3, 0, 0, 3, 4, 5, 12],
+    [6, 1, 7, 8, 9, 0, 0, 3, 4, 5],
+  ],
+];
+
+describe('unpackPuzzle', () => {
+  const puzzle = unpackPuzzle(packed, index, '2026-01-06');
+
+  it('rebuilds the puzzle identity from the index', () => {
+    expect(puzzle.id).toBe('2025-2026:3-5:2026-01-06');
+    expect(puzzle.generatedAt).toBe(1767000000000);
+    expect(puzzle.clueCount).toBe(2);
+  });
+
+  it('rebuilds the grid with null for empty cells', () => {
+    expect(puzzle.puzzle.grid).toEqual([
+      ['B', 'O', 'X'],
+      ['U', null, null],
+      ['G', null, null],
+    ]);
+    expect(puzzle.puzzle.cellNumbers).toEqual({ '0,0': 1 });
+  });
+
+  it('resolves clue strings and keeps page only when stored', () => {
+    expect(puzzle.puzzle.clues[0]).toEqual({
+      id: '1-across',
+      number: 1,
+      direction: 'across',
+      text: 'What does Lina find?',
+      answer: 'BOX',
+      startRow: 0,
+      startCol: 0,
+      length: 3,
+      bookKey: 'city-of-ember',
+      bookTitle: 'City of Ember',
+      page: 12,
+    });
+    expect(puzzle.puzzle.clues[1]).not.toHaveProperty('page');
+  });
+});
+
+describe('a packed fixture archive', () => {
+  // Packed by scripts/build_test_fixtures.py from the crossword JSON beside it
+  const archiveDir = path.join(process.cwd(), 'tests', 'fixtures', 'corpus', 'content', 'daily-crosswords');
+  const divisionDir = path.join(archiveDir, '2025-2026', '3-5');
+
+  it('gives back each puzzle exactly as it was packed', async () => {
+    expect(await getArchivedDates('2025-2026', '3-5', archiveDir)).toEqual(['2026-01-06', '2026-01-07']);
+    for (const dateString of ['2026-01-06', '2026-01-07']) {
+      const original = JSON.parse(fs.readFileSync(path.join(divisionDir, `crossword-${dateString}.json`), 'utf8'));
+      expect(await hasArchivedPuzzle('2025-2026', '3-5', dateString, archiveDir)).toBe(true);
+      expect(await readArchivedPuzzle('2025-2026', '3-5', dateString, archiveDir)).toEqual(original);
+    }
+  });
+});
+
+describe('season archives', () => {
+  it('reads every packed puzzle consistently with its grid', async () => {
+    const dates = await getArchivedDates('2025-2026', '3-5');
+    expect(dates.length).toBeGreaterThan(0);
+    expect([...dates].sort()).toEqual(dates);
+
+    for (const dateString of [dates[0], dates[dates.length - 1]]) {
+      expect(await hasArchivedPuzzle('2025-2026', '3-5', dateString)).toBe(true);
+      const puzzle = await readArchivedPuzzle('2025-2026', '3-5', dateString);
+      expect(puzzle?.dateString).toBe(dateString);
+      for (const clue of puzzle!.puzzle.clues) {
+        const letters = Array.from(clue.answer, (_, i) =>
+          clue.direction === 'across'
+            ? puzzle!.puzzle.grid[clue.startRow][clue.startCol + i]
+            : puzzle!.puzzle.grid[clue.startRow + i][clue.startCol]
+        ).join('');
+        expect(letters).toBe(clue.answer);
+      }
+    }
+  });
+
+  it('returns null for dates and divisions that are not packed', async () => {
+    expect(await readArchivedPuzzle('2025-2026', '3-5', '1999-01-01')).toBeNull();
+    expect(await readArchivedPuzzle('1999-2000', '3-5', '1999-01-01')).toBeNull();
+    expect(await hasArchivedPuzzle('1999-2000', '3-5', '1999-01-01')).toBe(false);
+  });
+});
@@ -0,0 +1,79 @@
+import { describe, it, expect } from 'vitest';
+import fs from 'fs';
+import path from 'path';
+import { questionIdsUpToPage, type PageIndex } from '@/lib/page-index';
+
+// Index in the shape scripts/page_index.py writes
+const index: PageIndex = {
+  version: 1,
+  year: '2025-2026',
+  division: '3-5',
+  books: {
+    'book-a': {
+      'in-which-book': { ids: [4, 1, 7, 2], pages: [3, 10, 25], ends: [1, 3, 4], unpaged: [9] },
+      content: { ids: [0, 5], pages: [12, 40], ends: [1, 2], unpaged: [] },
+    },
+    'book-b': {
+      content: { ids: [3, 6, 8], pages: [1, 2], ends: [2, 3], unpaged: [10] },
+    },
+  },
+};
+
+describe('questionIdsUpToPage', () => {
+  it('returns questions up to and including the page', () => {
+    expect(questionIdsUpToPage(index, ['book-a'], 10, 'in-which-book')).toEqual([4, 1, 7]);
+    expect(questionIdsUpToPage(index, ['book-a'], 24, 'in-which-book')).toEqual([4, 1, 7]);
+    expect(questionIdsUpToPage(index, ['book-a'], 25, 'in-which-book')).toEqual([4, 1, 7, 2]);
+  });
+
+  it('returns nothing before the first cited page', () => {
+    expect(questionIdsUpToPage(index, ['book-a'], 2, 'in-which-book')).toEqual([]);
+  });
+
+  it('combines types and books', () => {
+    expect(questionIdsUpToPage(index, ['book-a', 'book-b'], 12)).toEqual([4, 1, 7, 0, 3, 6, 8]);
+  });
+
+  it('only includes unpaged questions when asked', () => {
+    expect(questionIdsUpToPage(index, ['book-b'], 1, 'content')).toEqual([3, 6]);
+    expect(questionIdsUpToPage(index, ['book-b'], 1, 'content', true)).toEqual([3, 6, 10]);
+  });
+
+  it('ignores unknown books', () => {
+    expect(questionIdsUpToPage(index, ['missing'], 100)).toEqual([]);
+  });
+});
+
+describe('questionIdsUpToPage on a built index', () => {
+  // Written by scripts/build_test_fixtures.py from the fixture corpus
+  const fixtureRoot = path.join(process.cwd(), 'tests', 'fixtures', 'corpus');
+  const divisionDir = path.join(fixtureRoot, 'public', 'obob', '2025-2026', '3-5');
+  const built = JSON.parse(
+    fs.readFileSync(path.join(fixtureRoot, 'public', 'page-index', '2025-2026', '3-5.json'), 'utf8')
+  ) as PageIndex;
+
+  // Question IDs number the questions of every source in sources.json order
+  const { sources } = JSON.parse(fs.readFileSync(path.join(divisionDir, 'sources.json'), 'utf8'));
+  const questions: { text: string }[] = sources.flatMap(
+    (source: { path: string }) => JSON.parse(fs.readFileSync(path.join(divisionDir, source.path), 'utf8')).questions
+  );
+  const texts = (ids: number[]) => ids.map((id) => questions[id].text);
+
+  it("selects a book's questions across sources up to the page", () => {
+    expect(texts(questionIdsUpToPage(built, ['lantern-keeper'], 11, 'content'))).toEqual([
+      "What is the name of Lina's younger sister?",
+    ]);
+    expect(texts(questionIdsUpToPage(built, ['lantern-keeper'], 12, 'content'))).toEqual([
+      "What is the name of Lina's younger sister?",
+      "What does Lina's father keep in the shed?",
+      'Who helps Lina fix the lantern?',
+    ]);
+  });
+
+  it('includes the unpaged question when asked', () => {
+    expect(texts(questionIdsUpToPage(built, ['lantern-keeper'], 8, 'content', true))).toEqual([
+      "What is the name of Lina's younger sister?",
+      "What is Lina's last name?",
+    ]);
+  });
+});
@@ -0,0 +1,61 @@
+import { describe, it, expect } from 'vitest';
+import fs from 'fs';
+import path from 'path';
+
+// Written by scripts/build_test_fixtures.py from the fixture corpus
+const FIXTURE_ROOT = path.join(process.cwd(), 'tests', 'fixtures', 'corpus');
+const DIVISION_DIR = path.join(FIXTURE_ROOT, 'public', 'obob', '2025-2026', '3-5');
+
+interface SearchIndex {
+  version: number;
+  sources: string[];
+  docs: { source: number[]; index: number[]; book: number[]; type: number[] };
+  terms: string[];
+  postings: number[][];
+}
+
+const index = JSON.parse(
+  fs.readFileSync(path.join(FIXTURE_ROOT, 'public', 'search', '2025-2026', '3-5.json'), 'utf8')
+) as SearchIndex;
+
+// Question IDs for one term, decoding its delta-encoded postings
+function postings(term: string): number[] {
+  const i = index.terms.indexOf(term);
+  if (i < 0) return [];
+  let total = 0;
+  return index.postings[i].map((delta) => (total += delta));
+}
+
+// AND of the query's words, as search_questions.py does by default
+function search(query: string): number[] {
+  const [first, ...rest] = query.split(/\s+/).map(postings);
+  return rest.reduce((ids, next) => ids.filter((id) => next.includes(id)), first);
+}
+
+function questionText(id: number): string {
+  const source = index.sources[index.docs.source[id]];
+  const { questions } = JSON.parse(fs.readFileSync(path.join(DIVISION_DIR, source), 'utf8'));
+  return questions[index.docs.index[id]].text;
+}
+
+describe('search index', () => {
+  it('finds a possessive by the word before it', () => {
+    expect(search('lina sister').map(questionText)).toEqual([
+      "What is the name of Lina's younger sister?",
+      'Who helps Lina fix the lantern?',
+    ]);
+    expect(search('lina father').map(questionText)).toEqual(["What does Lina's father keep in the shed?"]);
+  });
+
+  it('still finds a possessive by its match key', () => {
+    expect(search('linas').map(questionText)).toEqual([
+      "What is the name of Lina's younger sister?",
+      "What does Lina's father keep in the shed?",
+      "What is Lina's last name?",
+    ]);
+  });
+
+  it('indexes answers', () => {
+    expect(search('poppy').map(questionText)).toEqual(["What is the name of Lina's younger sister?"]);
+  });
+});
@@ -23,6 +23,7 @@ export type BaseQuestion = {
   text: string;
   book_key: string;
   page?: number;
+  pages?: string; // Every page cited, when more than one ("31-32", "235,239,256")
   source?: QuestionSource;
   contributor?: string;
 };